@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Extraction benchmark
+Replays recorded fixtures through the real scraper classes and reports, per
+extraction strategy, tweets/sec, WebDriver round trips per tweet and wall time
+per page, plus the cost of building the YAP search query
+
+Usage:
+    python benchmark_extraction.py [repeat] [strategy,strategy...]
+"""
+
+import logging
+import sys
+import time
+from typing import Dict, List
+
+from driver_instrumentation import DriverTracer
+from fixture_replay import FIXTURES_DIR, KIND_SEARCH, KIND_USER, ReplayBackend, list_fixtures
+from logging_setup import configure_logging
+from network_capture import TimelineCapture, SEARCH_TIMELINE_OPERATIONS, USER_TIMELINE_OPERATIONS
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ('network', 'batch', 'element')
+
+
+class StrategyResult:
+    """Totals for one strategy across every page it extracted"""
+    
+    def __init__(self, kind: str, strategy: str):
+        self.kind = kind
+        self.strategy = strategy
+        self.pages = 0
+        self.tweets = 0
+        self.round_trips = 0
+        self.extract_seconds = 0.0
+        self.page_seconds = 0.0
+        self.hot_spot = ''
+    
+    def add(self, tweets: int, round_trips: int, extract_seconds: float, page_seconds: float):
+        self.pages += 1
+        self.tweets += tweets
+        self.round_trips += round_trips
+        self.extract_seconds += extract_seconds
+        self.page_seconds += page_seconds
+    
+    def as_dict(self) -> Dict:
+        return {
+            'kind': self.kind,
+            'strategy': self.strategy,
+            'pages': self.pages,
+            'tweets': self.tweets,
+            'tweets_per_sec': round(self.tweets / self.extract_seconds, 1) if self.extract_seconds else 0.0,
+            'round_trips_per_tweet': round(self.round_trips / self.tweets, 2) if self.tweets else 0.0,
+            'seconds_per_page': round(self.page_seconds / self.pages, 3) if self.pages else 0.0,
+            'hot_spot': self.hot_spot
+        }
+
+
+def _extract_user(scraper, strategy: str, capture, username: str) -> List:
+    if strategy == 'network':
+        return scraper._extract_tweets_network(capture, username)
+    if strategy == 'batch':
+        return scraper._extract_tweets_batch(username)
+    return scraper._extract_tweets_per_element(username)
+
+
+def _extract_search(scraper, strategy: str, capture, username=None) -> List:
+    if strategy == 'network':
+        return scraper._extract_urls_from_network(capture)
+    if strategy == 'batch':
+        return scraper._extract_urls_batch() or []
+    return scraper._extract_urls_per_element()
+
+
+def benchmark_fixtures(backend: ReplayBackend, kind: str, strategies=STRATEGIES, repeat: int = 3) -> List[Dict]:
+    """Run each strategy ``repeat`` times over every fixture of ``kind``"""
+    fixtures = list_fixtures(backend.server.directory, kind)
+    if not fixtures:
+        return []
+    
+    if kind == KIND_USER:
+        scraper, extract, operations = backend.user_scraper(), _extract_user, USER_TIMELINE_OPERATIONS
+    else:
+        scraper, extract, operations = backend.search_scraper(), _extract_search, SEARCH_TIMELINE_OPERATIONS
+    
+    # A private tracer counts only the extraction calls, whatever DRIVER_TRACE says
+    tracer = DriverTracer(enabled=True, trace_file=None)
+    tracer.instrument(scraper.driver)
+    results = []
+    try:
+        for strategy in strategies:
+            result = StrategyResult(kind, strategy)
+            for fixture in fixtures:
+                if strategy == 'network' and not fixture.payload_count:
+                    continue
+                for _ in range(repeat):
+                    # A fresh load per run resets incremental stamps and the captured responses
+                    capture = TimelineCapture(scraper.driver, operations)
+                    capture.drain()
+                    load_seconds = backend.load(scraper.driver, fixture)
+                    round_trips = tracer.command_count()
+                    started = time.monotonic()
+                    items = extract(scraper, strategy, capture, fixture.username)
+                    extract_seconds = time.monotonic() - started
+                    result.add(len(items), tracer.command_count() - round_trips, extract_seconds, load_seconds + extract_seconds)
+            hot_spots = tracer.summary(scraper.TRACE_OWNER, top=1)
+            if hot_spots:
+                result.hot_spot = f"{hot_spots[0]['caller']} → {hot_spots[0]['command']}"
+            tracer.reset()
+            if result.pages:
+                results.append(result.as_dict())
+    finally:
+        scraper.cleanup()
+    return results
+
+
+def benchmark_query_builder(iterations: int = 10000) -> Dict:
+    """Time build_yap_search_query, which needs no browser or scraper instance"""
+    from yap_scraper import build_yap_search_query
+    
+    started = time.perf_counter()
+    for _ in range(iterations):
+        build_yap_search_query()
+    elapsed = time.perf_counter() - started
+    return {'iterations': iterations, 'microseconds_per_call': round(elapsed / iterations * 1e6, 2)}
+
+
+def main():
+    """Benchmark every extraction strategy against the recorded fixtures"""
+    configure_logging('benchmark', level='WARNING')
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    strategies = sys.argv[2].split(',') if len(sys.argv) > 2 else list(STRATEGIES)
+    
+    query = benchmark_query_builder()
+    print(f"🔎 YAP query builder: {query['microseconds_per_call']}µs per call ({query['iterations']} calls)")
+    
+    if not list_fixtures(FIXTURES_DIR):
+        print(f"No fixtures in {FIXTURES_DIR}; record some with 'python fixture_replay.py record ...'")
+        return
+    
+    with ReplayBackend() as backend:
+        results = []
+        for kind in (KIND_USER, KIND_SEARCH):
+            results.extend(benchmark_fixtures(backend, kind, strategies, repeat))
+    
+    print(f"\n{'kind':<7} {'strategy':<9} {'pages':>5} {'tweets':>6} {'tweets/s':>9} {'trips/tweet':>11} {'s/page':>7}  hot spot")
+    for row in results:
+        print(f"{row['kind']:<7} {row['strategy']:<9} {row['pages']:>5} {row['tweets']:>6} "
+              f"{row['tweets_per_sec']:>9} {row['round_trips_per_tweet']:>11} {row['seconds_per_page']:>7}  {row['hot_spot']}")
+
+
+if __name__ == "__main__":
+    main()
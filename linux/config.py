@@ -4,7 +4,6 @@ Configuration settings for Twitter Monitor
 """
 
 import os
-import logging
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -17,25 +16,110 @@ TWITTER_PASSWORD = os.getenv('TWITTER_PASSWORD')
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
+# Telegram delivery - 'digest' packs new tweets into as few 4096-char messages as possible, 'single' sends one each.
+# Sends share a token bucket of TELEGRAM_MESSAGES_PER_MINUTE with bursts of up to TELEGRAM_BURST messages.
+NOTIFICATION_MODE = os.getenv('NOTIFICATION_MODE', 'digest').lower()
+TELEGRAM_MESSAGES_PER_MINUTE = int(os.getenv('TELEGRAM_MESSAGES_PER_MINUTE', 20))
+TELEGRAM_BURST = int(os.getenv('TELEGRAM_BURST', 3))
+
 # Check intervals (in minutes)
 CHECK_INTERVAL_MINUTES = int(os.getenv('CHECK_INTERVAL_MINUTES', 5))
 YAP_CHECK_INTERVAL_MINUTES = int(os.getenv('YAP_CHECK_INTERVAL_MINUTES', 3))
 
+# Scheduling - 'fixed_rate' keeps checks on a fixed grid, 'fixed_delay' waits the interval after each check.
+# Missed runs: 'coalesce' (run once, then back on the grid), 'skip' or 'catch_up'.
+# COUNTDOWN_DISPLAY_SECONDS refreshes the on-screen countdown at that cadence (0 = just log the next run time).
+SCHEDULE_MODE = os.getenv('SCHEDULE_MODE', 'fixed_rate').lower()
+SCHEDULE_JITTER_SECONDS = float(os.getenv('SCHEDULE_JITTER_SECONDS', 0))
+SCHEDULE_MISSED_RUNS = os.getenv('SCHEDULE_MISSED_RUNS', 'coalesce').lower()
+COUNTDOWN_DISPLAY_SECONDS = float(os.getenv('COUNTDOWN_DISPLAY_SECONDS', 60))
+
+# Supervisor (main_supervisor.py) - jobs to run in one process, and whether they share one browser pool
+# (off by default: the user and YAP jobs are logged in on separate Chrome profiles)
+SUPERVISOR_JOBS = [job.strip() for job in os.getenv('SUPERVISOR_JOBS', 'user,yap').split(',') if job.strip()]
+SUPERVISOR_SHARED_POOL = os.getenv('SUPERVISOR_SHARED_POOL', 'false').lower() == 'true'
+
 # Chrome profiles - Use proper names
 CHROME_PROFILE_USER = 'chrome_profile_user'
 CHROME_PROFILE_YAP = 'chrome_profile_yap'
 
+# Profile clones - when enabled, each browser runs on a copy-on-write clone of the logged-in profile above
+# (keep CHROME_PROFILE_CLONE_DIR on the same filesystem as the profiles so reflinks work)
+CHROME_PROFILE_CLONES = os.getenv('CHROME_PROFILE_CLONES', 'false').lower() == 'true'
+CHROME_PROFILE_CLONE_DIR = os.getenv('CHROME_PROFILE_CLONE_DIR', 'profile_clones')
+
+# Chrome launch presets (chrome_launch.py) - 'standard' (headed), 'persistent' (headed, session-keeping flags)
+# or opt-in 'low_memory' (headless=new, tuned for a small VPS)
+USER_CHROME_PRESET = os.getenv('USER_CHROME_PRESET', 'standard')
+YAP_CHROME_PRESET = os.getenv('YAP_CHROME_PRESET', 'persistent')
+
 # Chrome binary path
 CHROME_BINARY_PATH = '/usr/bin/google-chrome'
 
 # Scraping configuration
 MAX_TWEETS_TO_SCRAPE = int(os.getenv('MAX_TWEETS_TO_SCRAPE', 10))
 
+# Incremental profile checks - read the timeline top-down and stop after a run of already-seen
+# (or too old) tweets, scrolling only while everything visible is new; pinned tweets never stop it
+USER_INCREMENTAL = os.getenv('USER_INCREMENTAL', 'true').lower() == 'true'
+USER_SEEN_RUN_TO_STOP = int(os.getenv('USER_SEEN_RUN_TO_STOP', 3))
+USER_MAX_SCROLLS = int(os.getenv('USER_MAX_SCROLLS', 3))
+
+# URL output - links are streamed to per-run files under URL_SINK_RUNS_DIR (newest URL_SINK_KEEP_RUNS kept, 0 = all),
+# published to yap_links.txt / users_tweetlinks.txt by atomic rename and merged into a deduplicated *.all.txt
+URL_SINK_RUNS_DIR = os.getenv('URL_SINK_RUNS_DIR', 'runs')
+URL_SINK_KEEP_RUNS = int(os.getenv('URL_SINK_KEEP_RUNS', 48))
+URL_SINK_CUMULATIVE = os.getenv('URL_SINK_CUMULATIVE', 'true').lower() == 'true'
+
+# Resource blocking - page resources scraping browsers never download (images, media, fonts, analytics; empty = none)
+BLOCKED_RESOURCES = [category.strip().lower() for category in os.getenv('BLOCKED_RESOURCES', 'images,media,fonts,analytics').split(',') if category.strip()]
+
+# Driver pool - keep Chrome warm across checks, recycle after N checks or an RSS ceiling
+DRIVER_MAX_CHECKS = int(os.getenv('DRIVER_MAX_CHECKS', 20))
+DRIVER_MAX_RSS_MB = int(os.getenv('DRIVER_MAX_RSS_MB', 1500))
+
+# Concurrent user checks - browsers checking users in parallel (above 1 needs CHROME_PROFILE_CLONES=true), and max simultaneous page loads per host
+USER_CHECK_CONCURRENCY = int(os.getenv('USER_CHECK_CONCURRENCY', 1))
+PER_HOST_CONCURRENCY = int(os.getenv('PER_HOST_CONCURRENCY', 2))
+
+# Tweet extraction mode: 'network' (timeline JSON from DevTools), 'batch' (one injected script per page)
+# or 'element' (per-element lookups). Each mode falls back to the next one.
+EXTRACTION_MODE = os.getenv('EXTRACTION_MODE', 'batch').lower()
+
+# WebDriver command instrumentation - per-cycle round-trip summary by calling method, optional JSON-lines trace file
+DRIVER_TRACE = os.getenv('DRIVER_TRACE', 'true').lower() == 'true'
+DRIVER_TRACE_FILE = os.getenv('DRIVER_TRACE_FILE', '')
+
+# Selector strategies - fallback CSS selectors are tried best-first by recorded hit rate, never-matching ones
+# are skipped, and the original order is re-probed every SELECTOR_REPROBE_EVERY lookups (stats file, empty = not kept)
+SELECTOR_STATS_FILE = os.getenv('SELECTOR_STATS_FILE', 'selector_stats.json')
+SELECTOR_REPROBE_EVERY = int(os.getenv('SELECTOR_REPROBE_EVERY', 500))
+SELECTOR_PRUNE_AFTER = int(os.getenv('SELECTOR_PRUNE_AFTER', 25))
+
+# Prometheus metrics endpoint - /metrics port for the user monitor (and supervisor) and for the YAP scraper (0 = off)
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', 0))
+YAP_METRICS_PORT = int(os.getenv('YAP_METRICS_PORT', 0))
+
+# Seen-tweet store: 'sqlite' (WAL, batched appends, retention) or 'json' (legacy whole-file rewrite)
+SEEN_STORE_BACKEND = os.getenv('SEEN_STORE_BACKEND', 'sqlite').lower()
+SEEN_STORE_DB = os.getenv('SEEN_STORE_DB', 'seen_tweets.db')
+SEEN_RETENTION_DAYS = int(os.getenv('SEEN_RETENTION_DAYS', 30))
+
+# User polling: 'fixed' checks every user every CHECK_INTERVAL_MINUTES; 'adaptive' checks each user at a rate
+# matched to how often they post (seen-store history), between the min/max intervals and within a page-load budget
+USER_POLLING = os.getenv('USER_POLLING', 'fixed').lower()
+POLL_MIN_INTERVAL_MINUTES = float(os.getenv('POLL_MIN_INTERVAL_MINUTES', 5))
+POLL_MAX_INTERVAL_MINUTES = float(os.getenv('POLL_MAX_INTERVAL_MINUTES', 60))
+POLL_PAGE_BUDGET_PER_HOUR = int(os.getenv('POLL_PAGE_BUDGET_PER_HOUR', 120))  # 0 = unlimited
+POLL_RATE_WINDOW_DAYS = float(os.getenv('POLL_RATE_WINDOW_DAYS', 7))
+POLL_TARGET_POSTS_PER_CHECK = float(os.getenv('POLL_TARGET_POSTS_PER_CHECK', 0.5))
+
 # Users to monitor (comma-separated list)
 USERS_TO_MONITOR = os.getenv('USERS_TO_MONITOR', 'elonmusk,OpenAI,AnthropicAI').split(',')
 
 # YAP Search Configuration
-YAP_SEARCH_KEYWORDS = os.getenv('YAP_SEARCH_KEYWORDS', 'AI,artificial intelligence,machine learning').split(',')
+YAP_SEARCH_KEYWORDS = os.getenv('YAP_SEARCH_KEYWORDS', '(AI OR "artificial intelligence" OR "machine learning")')  # Raw X search query
 YAP_FILTER_VERIFIED = os.getenv('YAP_FILTER_VERIFIED', 'true').lower() == 'true'
 YAP_FILTER_NATIVE_RETWEETS = os.getenv('YAP_FILTER_NATIVE_RETWEETS', 'false').lower() == 'true'
 YAP_FILTER_RETWEETS = os.getenv('YAP_FILTER_RETWEETS', 'false').lower() == 'true'
@@ -44,23 +128,30 @@ YAP_MIN_REPLIES = int(os.getenv('YAP_MIN_REPLIES', 0))
 YAP_MIN_LIKES = int(os.getenv('YAP_MIN_LIKES', 0))
 YAP_MIN_RETWEETS = int(os.getenv('YAP_MIN_RETWEETS', 0))
 YAP_LANGUAGE = os.getenv('YAP_LANGUAGE', 'en')
-YAP_TIME_WINDOW = os.getenv('YAP_TIME_WINDOW', '7d')  # 7d, 1d, 1h, etc.
+YAP_TIME_WINDOW = int(os.getenv('YAP_TIME_WINDOW', 1440))  # Minutes (1440 = 24 hours, 0 = no limit)
 YAP_FILTER_LINKS = os.getenv('YAP_FILTER_LINKS', 'false').lower() == 'true'
 YAP_FILTER_MEDIA = os.getenv('YAP_FILTER_MEDIA', 'false').lower() == 'true'
 YAP_FILTER_IMAGES = os.getenv('YAP_FILTER_IMAGES', 'false').lower() == 'true'
 YAP_FILTER_VIDEOS = os.getenv('YAP_FILTER_VIDEOS', 'false').lower() == 'true'
 YAP_SEARCH_SOURCE = os.getenv('YAP_SEARCH_SOURCE', 'twitter')  # twitter, news, etc.
 
-# Logging configuration
+# YAP scroll waits (seconds) - bounds for the adaptive wait after each scroll
+YAP_SCROLL_MIN_WAIT_SECONDS = float(os.getenv('YAP_SCROLL_MIN_WAIT_SECONDS', 1.5))
+YAP_SCROLL_MAX_WAIT_SECONDS = float(os.getenv('YAP_SCROLL_MAX_WAIT_SECONDS', 8))
+
+# YAP cross-run dedup - tweet ids already delivered to Telegram (SQLite, bounded by age and size) are not sent
+# again, and a search stops after YAP_DELIVERED_STOP_ITERATIONS scrolls that only turned up delivered tweets
+YAP_DEDUP = os.getenv('YAP_DEDUP', 'true').lower() == 'true'
+YAP_DELIVERED_DB = os.getenv('YAP_DELIVERED_DB', 'yap_delivered.db')
+YAP_DELIVERED_MAX_ENTRIES = int(os.getenv('YAP_DELIVERED_MAX_ENTRIES', 100000))
+YAP_DELIVERED_RETENTION_DAYS = int(os.getenv('YAP_DELIVERED_RETENTION_DAYS', 30))
+YAP_DELIVERED_STOP_ITERATIONS = int(os.getenv('YAP_DELIVERED_STOP_ITERATIONS', 2))
+
+# Logging configuration - each service logs to its own file (tweet_monitor.user.log, ...) through a background queue
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-LOG_FILE = 'tweet_monitor.log'
-
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
\ No newline at end of file
+LOG_FILE = os.getenv('LOG_FILE', 'tweet_monitor.log')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()  # 'text' or 'json' (one JSON object per line)
+LOG_ROTATION = os.getenv('LOG_ROTATION', 'size').lower()  # 'size', 'time' or 'none'
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 5))
+LOG_ROTATE_WHEN = os.getenv('LOG_ROTATE_WHEN', 'midnight')  # TimedRotatingFileHandler 'when' for time rotation
\ No newline at end of file
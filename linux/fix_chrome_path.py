@@ -9,7 +9,6 @@ import sys
 import subprocess
 import logging
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -60,22 +59,11 @@ def test_chrome_driver():
         logger.info(f"Testing Chrome driver with binary: {chrome_binary}")
         
         # Setup Chrome options with explicit binary path
-        chrome_options = Options()
-        chrome_options.binary_location = chrome_binary
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--headless')  # Run in headless mode for testing
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--disable-extensions')
-        chrome_options.add_argument('--disable-plugins')
-        chrome_options.add_argument('--disable-logging')
-        chrome_options.add_argument('--log-level=3')
-        chrome_options.add_argument('--silent')
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
+        from chrome_launch import build_chrome_options, launch_chrome, PRESET_LOW_MEMORY
+        chrome_options = build_chrome_options(preset=PRESET_LOW_MEMORY, binary_location=chrome_binary)
         
         # Initialize Chrome driver
-        driver = webdriver.Chrome(options=chrome_options)
+        driver = launch_chrome(chrome_options, PRESET_LOW_MEMORY)
         
         # Test navigation
         driver.get("https://www.google.com")
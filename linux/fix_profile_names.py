@@ -7,8 +7,8 @@ import os
 import shutil
 import time
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from config import CHROME_BINARY_PATH, CHROME_PROFILE_USER, CHROME_PROFILE_YAP
+from chrome_launch import build_chrome_options, launch_chrome, PRESET_LOW_MEMORY
+from config import CHROME_PROFILE_USER, CHROME_PROFILE_YAP
 
 def cleanup_old_profiles():
     """Remove all old profile directories"""
@@ -78,21 +78,10 @@ def create_profile(profile_name, profile_type):
         os.makedirs(profile_path, exist_ok=True)
         
         # Setup Chrome options
-        options = Options()
-        options.binary_location = CHROME_BINARY_PATH
-        options.add_argument(f'--user-data-dir={profile_path}')
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--disable-plugins')
-        options.add_argument('--disable-logging')
-        options.add_argument('--log-level=3')
-        options.add_argument('--silent')
+        options = build_chrome_options(profile_path, PRESET_LOW_MEMORY)
         
         # Test the profile
-        driver = webdriver.Chrome(options=options)
+        driver = launch_chrome(options, PRESET_LOW_MEMORY)
         driver.get('https://www.google.com')
         print(f"✅ {profile_type} profile created successfully: {profile_path}")
         driver.quit()
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Offline page fixtures
+Records profile and search pages (rendered DOM plus the timeline JSON the page
+fetched) to disk, and replays them from a local HTTP stand-in so the real
+scraper classes can run their extraction code without touching live X
+
+Usage:
+    python fixture_replay.py record user <username> [name]
+    python fixture_replay.py record search [name]
+    python fixture_replay.py list
+"""
+
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, quote, urlparse
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from batch_extractor import SEEN_ATTRIBUTE
+from chrome_launch import build_chrome_options, launch_chrome, PRESET_LOW_MEMORY
+from driver_pool import DriverPool
+from logging_setup import configure_logging
+from network_capture import TimelineCapture, USER_TIMELINE_OPERATIONS, SEARCH_TIMELINE_OPERATIONS, enable_performance_logging
+from resource_blocking import RESOURCE_PATTERNS, apply_content_settings, enable_resource_blocking
+from scroll_engine import ScrollEngine
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+KIND_USER = 'user'
+KIND_SEARCH = 'search'
+
+# Rendered DOM without scripts, so the replayed page is static and the X app
+# never boots against the stand-in server
+SNAPSHOT_JS = """
+const root = document.documentElement.cloneNode(true);
+root.querySelectorAll('script, noscript, iframe, link[rel="preload"], link[rel="modulepreload"], link[rel="stylesheet"]')
+    .forEach(el => el.remove());
+root.querySelectorAll('[%s]').forEach(el => el.removeAttribute('%s'));
+return '<!DOCTYPE html>\\n' + root.outerHTML;
+""" % (SEEN_ATTRIBUTE, SEEN_ATTRIBUTE)
+
+
+class Fixture:
+    """One recorded page: page.html, timeline_<n>.json and meta.json in a directory"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+    
+    @property
+    def kind(self) -> str:
+        return self.meta['kind']
+    
+    @property
+    def username(self) -> Optional[str]:
+        return self.meta.get('username')
+    
+    @property
+    def operation(self) -> str:
+        return self.meta['operation']
+    
+    @property
+    def payload_count(self) -> int:
+        return self.meta.get('payloads', 0)
+    
+    def html(self) -> str:
+        with open(os.path.join(self.path, 'page.html'), 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    def payload(self, index: int) -> bytes:
+        with open(os.path.join(self.path, f'timeline_{index}.json'), 'rb') as f:
+            return f.read()
+
+
+def list_fixtures(directory: str = FIXTURES_DIR, kind: Optional[str] = None) -> List[Fixture]:
+    """Every fixture under ``directory``, optionally only one kind"""
+    fixtures = []
+    if not os.path.isdir(directory):
+        return fixtures
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if not os.path.isfile(os.path.join(path, 'meta.json')):
+            continue
+        try:
+            fixture = Fixture(path)
+        except Exception as e:
+            logger.warning(f"Skipping unreadable fixture {name}: {e}")
+            continue
+        if kind is None or fixture.kind == kind:
+            fixtures.append(fixture)
+    return fixtures
+
+
+class FixtureRecorder:
+    """Saves what a logged-in scraper browser sees on a page"""
+    
+    def __init__(self, directory: str = FIXTURES_DIR):
+        self.directory = directory
+    
+    def save(self, driver, name: str, kind: str, url: str, operation: str,
+             payloads: List[Dict], username: Optional[str] = None) -> Fixture:
+        """Snapshot the page ``driver`` is on, together with its timeline payloads"""
+        path = os.path.join(self.directory, name)
+        os.makedirs(path, exist_ok=True)
+        
+        with open(os.path.join(path, 'page.html'), 'w', encoding='utf-8') as f:
+            f.write(driver.execute_script(SNAPSHOT_JS))
+        for index, payload in enumerate(payloads):
+            with open(os.path.join(path, f'timeline_{index}.json'), 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+        
+        articles = driver.execute_script("return document.querySelectorAll('[data-testid=\"tweet\"]').length")
+        meta = {
+            'kind': kind,
+            'url': url,
+            'username': username,
+            'operation': operation,
+            'payloads': len(payloads),
+            'articles': articles,
+            'recorded_at': datetime.now().isoformat(timespec='seconds')
+        }
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        
+        logger.info(f"💾 Recorded fixture {name}: {articles} tweet articles, {len(payloads)} {operation} payloads")
+        return Fixture(path)
+    
+    def record_user(self, username: str, name: Optional[str] = None) -> Fixture:
+        """Record @username's profile page with the user monitoring browser"""
+        from scraper_monitor import TwitterScraperMonitor
+        
+        pool = DriverPool('record', partial(TwitterScraperMonitor.create_driver, performance_log=True))
+        try:
+            scraper = TwitterScraperMonitor(driver_pool=pool)
+            scraper.acquire_driver()
+            url = f"https://x.com/{username}"
+            payloads = self._capture(scraper.driver, url, USER_TIMELINE_OPERATIONS)
+            name = name or f"user_{username}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            return self.save(scraper.driver, name, KIND_USER, url, USER_TIMELINE_OPERATIONS[0], payloads, username)
+        finally:
+            pool.close()
+    
+    def record_search(self, name: Optional[str] = None) -> Fixture:
+        """Record the configured YAP search page with the YAP browser"""
+        from yap_scraper import YapSearchScraper
+        
+        pool = DriverPool('record', partial(YapSearchScraper.create_driver, performance_log=True))
+        try:
+            scraper = YapSearchScraper(driver_pool=pool)
+            scraper.acquire_driver()
+            url = scraper._build_search_url()
+            payloads = self._capture(scraper.driver, url, SEARCH_TIMELINE_OPERATIONS)
+            name = name or f"search_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            return self.save(scraper.driver, name, KIND_SEARCH, url, SEARCH_TIMELINE_OPERATIONS[0], payloads)
+        finally:
+            pool.close()
+    
+    @staticmethod
+    def _capture(driver, url: str, operations) -> List[Dict]:
+        capture = TimelineCapture(driver, operations)
+        capture.drain()
+        driver.get(url)
+        WebDriverWait(driver, 30).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="tweet"]'))
+        )
+        ScrollEngine(driver).settle()
+        return capture.collect()
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    """Serves fixture pages and their timeline responses"""
+    
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        parts = [part for part in parsed.path.split('/') if part]
+        try:
+            if len(parts) == 2 and parts[0] == 'fixtures':
+                self._send(200, 'text/html; charset=utf-8', self.server.page(parts[1]).encode('utf-8'))
+            elif len(parts) >= 3 and parts[:2] == ['i', 'api'] and 'graphql' in parts:
+                query = parse_qs(parsed.query)
+                fixture = self.server.fixture(query['fixture'][0])
+                self._send(200, 'application/json', fixture.payload(int(query['index'][0])))
+            else:
+                self._send(404, 'text/plain', b'not found')
+        except (KeyError, IndexError, OSError, ValueError):
+            self._send(404, 'text/plain', b'not found')
+    
+    def _send(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        logger.debug(f"replay: {format % args}")
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Local HTTP stand-in for x.com that serves recorded fixtures
+    
+    A fixture page is served with a ``<base>`` pointing at x.com, so links
+    resolve exactly as they did live, and a small script that re-fetches the
+    recorded timeline JSON from a /graphql/<operation> path for network
+    capture to pick up.
+    """
+    
+    daemon_threads = True
+    
+    def __init__(self, directory: str = FIXTURES_DIR):
+        super().__init__(('127.0.0.1', 0), _ReplayHandler)
+        self.directory = directory
+        self._fixtures: Dict[str, Fixture] = {}
+        self._thread = None
+    
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+    
+    def url_for(self, fixture: Fixture) -> str:
+        self._fixtures[fixture.name] = fixture
+        return f"{self.base_url}/fixtures/{quote(fixture.name)}"
+    
+    def fixture(self, name: str) -> Fixture:
+        if name not in self._fixtures:
+            self._fixtures[name] = Fixture(os.path.join(self.directory, name))
+        return self._fixtures[name]
+    
+    def page(self, name: str) -> str:
+        fixture = self.fixture(name)
+        urls = [
+            f"{self.base_url}/i/api/graphql/replay/{fixture.operation}?fixture={quote(fixture.name)}&index={index}"
+            for index in range(fixture.payload_count)
+        ]
+        html = fixture.html()
+        html = html.replace('<head>', '<head><base href="https://x.com/">', 1)
+        bootstrap = f"<script>for (const url of {json.dumps(urls)}) fetch(url).catch(() => null);</script>"
+        if '</body>' in html:
+            return html.replace('</body>', bootstrap + '</body>', 1)
+        return html + bootstrap
+    
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name='fixture-replay', daemon=True)
+        self._thread.start()
+        logger.info(f"Replaying fixtures from {self.directory} at {self.base_url}")
+        return self
+    
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class ReplayBackend:
+    """Replay server plus a pool of throwaway headless browsers for the scraper classes
+    
+    The browsers record their performance log (for network capture) and
+    block every external resource category, so nothing reaches the internet.
+    """
+    
+    def __init__(self, directory: str = FIXTURES_DIR):
+        self.server = ReplayServer(directory)
+        self.pool = DriverPool('replay', self._create_driver)
+        self._profiles: List[str] = []
+        # Seen-tweet stores and link files of the replay scrapers, so real service state is never touched
+        self.data_dir = tempfile.mkdtemp(prefix='replay_data_')
+    
+    def __enter__(self):
+        self.server.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        self.pool.close()
+        self.server.stop()
+        for path in self._profiles + [self.data_dir]:
+            shutil.rmtree(path, ignore_errors=True)
+    
+    def _create_driver(self):
+        profile_dir = tempfile.mkdtemp(prefix='chrome_replay_')
+        self._profiles.append(profile_dir)
+        categories = list(RESOURCE_PATTERNS)
+        chrome_options = build_chrome_options(profile_dir, PRESET_LOW_MEMORY)
+        enable_performance_logging(chrome_options)
+        apply_content_settings(chrome_options, categories)
+        driver = launch_chrome(chrome_options, PRESET_LOW_MEMORY)
+        enable_resource_blocking(driver, categories)
+        return driver
+    
+    def user_scraper(self):
+        """A TwitterScraperMonitor driving a replay browser"""
+        from scraper_monitor import TwitterScraperMonitor
+        scraper = TwitterScraperMonitor(driver_pool=self.pool, data_dir=self.data_dir)
+        scraper.acquire_driver()
+        return scraper
+    
+    def search_scraper(self):
+        """A YapSearchScraper driving a replay browser"""
+        from yap_scraper import YapSearchScraper
+        scraper = YapSearchScraper(driver_pool=self.pool, data_dir=self.data_dir)
+        scraper.acquire_driver()
+        return scraper
+    
+    def load(self, driver, fixture: Fixture) -> float:
+        """Open ``fixture`` in ``driver``; returns seconds until the first tweet is present"""
+        started = time.monotonic()
+        driver.get(self.server.url_for(fixture))
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="tweet"]'))
+        )
+        return time.monotonic() - started
+
+
+def main():
+    """Record or list fixtures"""
+    configure_logging('fixture_replay')
+    args = sys.argv[1:]
+    recorder = FixtureRecorder()
+    
+    if args[:2] == ['record', KIND_USER] and len(args) >= 3:
+        fixture = recorder.record_user(args[2], args[3] if len(args) > 3 else None)
+    elif args[:2] == ['record', KIND_SEARCH]:
+        fixture = recorder.record_search(args[2] if len(args) > 2 else None)
+    elif args[:1] == ['list']:
+        for fixture in list_fixtures():
+            print(f"  {fixture.name}: {fixture.kind}, {fixture.meta.get('articles')} articles, "
+                  f"{fixture.payload_count} payloads, recorded {fixture.meta.get('recorded_at')}")
+        return
+    else:
+        print(__doc__)
+        return
+    print(f"✅ Saved fixture to {fixture.path}")
+
+
+if __name__ == "__main__":
+    main()
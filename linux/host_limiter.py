@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Per-host concurrency limiter
+Caps how many page loads run against the same host at once when several browsers work in parallel
+"""
+
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+
+class HostLimiter:
+    """One bounded semaphore per host"""
+
+    def __init__(self, per_host: int = 2):
+        self.per_host = max(1, per_host)
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def _semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).hostname or url
+        # twitter.com redirects to x.com; treat them as the same host
+        if host.endswith('twitter.com'):
+            host = 'x.com'
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self._semaphores[host]
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold a slot for ``url``'s host for the duration of the block"""
+        semaphore = self._semaphore(url)
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
@@ -8,21 +8,15 @@ import os
 import shutil
 import logging
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from config import CHROME_PROFILE_YAP, CHROME_PROFILE_USER, LOG_LEVEL, LOG_FILE
+from chrome_launch import build_chrome_options, launch_chrome, PRESET_PERSISTENT
+from config import CHROME_PROFILE_YAP, CHROME_PROFILE_USER
+from logging_setup import configure_logging
 
 # Setup logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 def backup_profile(profile_path, backup_name):
@@ -76,43 +70,7 @@ def clean_profile_data(profile_path):
 def create_improved_chrome_options(profile_path):
     """Create Chrome options optimized for session persistence"""
     try:
-        chrome_options = Options()
-        chrome_options.add_argument(f'--user-data-dir={profile_path}')
-        
-        # Essential options for stability
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        
-        # Options to improve session persistence
-        chrome_options.add_argument('--disable-background-timer-throttling')
-        chrome_options.add_argument('--disable-backgrounding-occluded-windows')
-        chrome_options.add_argument('--disable-renderer-backgrounding')
-        chrome_options.add_argument('--disable-features=TranslateUI')
-        chrome_options.add_argument('--disable-ipc-flooding-protection')
-        
-        # Disable features that can cause session issues
-        chrome_options.add_argument('--disable-extensions')
-        chrome_options.add_argument('--disable-plugins')
-        chrome_options.add_argument('--disable-logging')
-        chrome_options.add_argument('--log-level=3')
-        chrome_options.add_argument('--silent')
-        chrome_options.add_argument('--disable-remote-fonts')
-        chrome_options.add_argument('--disable-web-security')
-        chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-        
-        # Experimental options for better persistence
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_experimental_option('detach', True)
-        
-        # Additional options for session stability
-        chrome_options.add_argument('--disable-session-crashed-bubble')
-        chrome_options.add_argument('--disable-infobars')
-        chrome_options.add_argument('--disable-notifications')
-        chrome_options.add_argument('--disable-popup-blocking')
-        
-        return chrome_options
+        return build_chrome_options(profile_path, PRESET_PERSISTENT)
         
     except Exception as e:
         logger.error(f"Error creating Chrome options: {e}")
@@ -128,7 +86,7 @@ def test_profile_persistence(profile_path, profile_name):
         chrome_options = create_improved_chrome_options(profile_path)
         
         # Initialize driver
-        driver = webdriver.Chrome(options=chrome_options)
+        driver = launch_chrome(chrome_options, PRESET_PERSISTENT)
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         
         # Navigate to Twitter
@@ -1,71 +1,54 @@
 #!/usr/bin/env python3
 """
-Chrome Process Killer - Kills all Chrome and ChromeDriver processes
+Chrome Process Killer - Reaps Chrome and ChromeDriver processes
+By default only the orphaned browsers recorded by this project's process
+registry are reaped; pass --all to kill every Chrome on the machine
 """
 
+import sys
 import psutil
-import subprocess
 import time
 import logging
+from process_registry import get_registry, reap_processes
+from logging_setup import configure_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+def kill_project_chrome_processes():
+    """Reap the Chrome process trees recorded by crashed runs of this project
+    
+    Browsers owned by a service that is still running are left alone.
+    """
+    try:
+        logger.info("🔪 Reaping orphaned Chrome processes from the process registry...")
+        start = time.monotonic()
+        reaped = get_registry().reap_orphans()
+        logger.info(f"🎯 Cleanup Summary: Reaped {reaped} processes in {(time.monotonic() - start) * 1000:.0f}ms")
+        return True
+    
+    except Exception as e:
+        logger.error(f"❌ Error during Chrome cleanup: {e}")
+        return False
+
 def kill_all_chrome_processes():
-    """Kill ALL Chrome and ChromeDriver processes"""
+    """Kill ALL Chrome and ChromeDriver processes on the machine, including other services'"""
     try:
         logger.info("🔪 Starting Chrome process cleanup...")
+        start = time.monotonic()
         
-        killed_count = 0
-        
-        # Method 1: Kill using psutil
         logger.info("📋 Scanning for Chrome processes...")
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+        chrome_processes = []
+        for proc in psutil.process_iter(['pid', 'name']):
             try:
                 proc_name = proc.info['name']
                 if proc_name and ('chrome' in proc_name.lower() or 'chromedriver' in proc_name.lower()):
                     logger.info(f"Found Chrome process: {proc.pid} ({proc_name})")
-                    proc.terminate()
-                    proc.wait(timeout=3)
-                    killed_count += 1
-                    logger.info(f"✅ Terminated process: {proc.pid}")
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.TimeoutExpired):
-                try:
-                    # Force kill if terminate fails
-                    proc.kill()
-                    killed_count += 1
-                    logger.info(f"✅ Force killed process: {proc.pid}")
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-            except Exception as e:
-                logger.warning(f"Error killing process {proc.pid}: {e}")
-        
-        # Method 2: Kill using system commands
-        logger.info("🔧 Using system commands for additional cleanup...")
-        system_commands = [
-            ['pkill', '-f', 'chrome'],
-            ['pkill', '-f', 'chromedriver'],
-            ['pkill', '-f', 'google-chrome'],
-            ['pkill', '-f', 'chromium'],
-            ['killall', 'chrome'],
-            ['killall', 'chromedriver'],
-            ['killall', 'google-chrome']
-        ]
-        
-        for cmd in system_commands:
-            try:
-                result = subprocess.run(cmd, capture_output=True, timeout=5)
-                if result.returncode == 0:
-                    logger.info(f"✅ System command successful: {' '.join(cmd)}")
-            except Exception as e:
-                logger.debug(f"System command failed: {' '.join(cmd)} - {e}")
+                    chrome_processes.append(proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
         
-        # Wait for processes to fully terminate
-        time.sleep(3)
+        # Terminate everything at once, then wait on the whole set
+        killed_count = reap_processes(chrome_processes)
         
         # Final check
         remaining_chrome = []
@@ -82,19 +65,23 @@ def kill_all_chrome_processes():
         else:
             logger.info("✅ All Chrome processes successfully killed!")
         
-        logger.info(f"🎯 Cleanup Summary: Killed {killed_count} processes via psutil")
+        logger.info(f"🎯 Cleanup Summary: Killed {killed_count} processes in {(time.monotonic() - start) * 1000:.0f}ms")
         return True
-        
+    
     except Exception as e:
         logger.error(f"❌ Error during Chrome cleanup: {e}")
         return False
 
 def main():
     """Main function"""
+    configure_logging('kill_chrome')
     print("🧹 Chrome Process Cleanup Tool")
     print("=" * 40)
     
-    success = kill_all_chrome_processes()
+    if '--all' in sys.argv[1:]:
+        success = kill_all_chrome_processes()
+    else:
+        success = kill_project_chrome_processes()
     
     if success:
         print("\n✅ Chrome cleanup completed successfully!")
@@ -9,32 +9,49 @@ import sys
 import signal
 import os
 from datetime import datetime
-from config import CHECK_INTERVAL_MINUTES, LOG_LEVEL, LOG_FILE, MAX_TWEETS_TO_SCRAPE
-from scraper_monitor import TwitterScraperMonitor
-from robust_notifier import RobustTelegramNotifier
-from countdown_timer import show_countdown
-
-# Configure logging for locked PC (more verbose)
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler(sys.stdout)
-    ]
+from functools import partial
+from config import (
+    USER_POLLING,
+    MAX_TWEETS_TO_SCRAPE,
+    DRIVER_MAX_CHECKS,
+    DRIVER_MAX_RSS_MB,
+    NOTIFICATION_MODE,
+    SCHEDULE_MODE,
+    SCHEDULE_JITTER_SECONDS,
+    SCHEDULE_MISSED_RUNS,
+    COUNTDOWN_DISPLAY_SECONDS,
+    METRICS_PORT
 )
-
-# Suppress verbose logging
-logging.getLogger('httpx').setLevel(logging.ERROR)
-logging.getLogger('urllib3').setLevel(logging.ERROR)
-logging.getLogger('selenium').setLevel(logging.ERROR)
+from scraper_monitor import TwitterScraperMonitor, user_check_concurrency
+from robust_notifier import get_notifier
+from driver_pool import DriverPool
+from logging_setup import configure_logging
+from scheduler import Scheduler
+from metrics import start_metrics_server
+from adaptive_polling import user_check_interval
 
 logger = logging.getLogger(__name__)
 
 class LockedPCMonitorService:
-    def __init__(self):
+    def __init__(self, driver_pool=None):
         self.twitter_monitor = None
-        self.telegram_notifier = RobustTelegramNotifier()
+        self.telegram_notifier = get_notifier()
+        # The supervisor passes in the pool it shares with the YAP job
+        self.driver_pool = driver_pool or DriverPool(
+            'user',
+            TwitterScraperMonitor.create_driver,
+            size=user_check_concurrency(),
+            max_checks=DRIVER_MAX_CHECKS,
+            max_rss_mb=DRIVER_MAX_RSS_MB
+        )
+        self.scheduler = Scheduler(
+            user_check_interval(),
+            mode=SCHEDULE_MODE,
+            jitter=SCHEDULE_JITTER_SECONDS,
+            missed_policy=SCHEDULE_MISSED_RUNS,
+            progress_interval=COUNTDOWN_DISPLAY_SECONDS,
+            name="tweet check"
+        )
         self.check_count = 0
         logger.info("Locked PC monitor service initialized")
     
@@ -42,7 +59,7 @@ class LockedPCMonitorService:
         """Initialize the Twitter monitor with locked PC optimizations"""
         if self.twitter_monitor is None:
             try:
-                self.twitter_monitor = TwitterScraperMonitor()
+                self.twitter_monitor = TwitterScraperMonitor(driver_pool=self.driver_pool)
                 logger.info("Twitter monitor initialized for locked PC mode")
             except Exception as e:
                 logger.error(f"Failed to initialize monitor: {e}")
@@ -61,36 +78,49 @@ class LockedPCMonitorService:
             if not self.initialize_monitor():
                 return
             
+            # Take a warm browser from the pool (launches Chrome only on a cold start)
+            self.twitter_monitor.acquire_driver()
+            
             logger.info("Checking for tweets...")
             new_tweets = self.twitter_monitor.check_new_tweets()
             
             if new_tweets:
                 logger.info(f"Tweet found: {len(new_tweets)} new tweets")
-                for i, tweet in enumerate(new_tweets, 1):
-                    try:
-                        self.send_tweet_notification(tweet)
-                        # Longer delay for locked PC
-                        if i < len(new_tweets):
-                            time.sleep(5)  # 5 second delay between notifications
-                    except Exception as e:
-                        logger.error(f"Error sending notification for tweet {i}: {e}")
-                        continue
+                # Queued for the delivery worker; the next check does not wait on Telegram
+                self.send_tweet_notifications(new_tweets)
             else:
                 logger.info("No new tweets found")
             
-            # Quit Chrome after task completion
-            self.twitter_monitor.quit_chrome_after_task()
-            self.twitter_monitor = None  # Reset for next check
+            # Return Chrome to the pool so the next check starts warm
+            self.twitter_monitor.release_driver()
                 
         except Exception as e:
             logger.error(f"Error during tweet check: {e}")
-            # Ensure Chrome is quit even on error
+            # Discard the browser on error so the next check gets a fresh one
             if self.twitter_monitor:
-                self.twitter_monitor.quit_chrome_after_task()
-                self.twitter_monitor = None
+                self.twitter_monitor.release_driver(failed=True)
+    
+    def send_tweet_notifications(self, tweets):
+        """Queue notifications for new tweets, packed into digests unless NOTIFICATION_MODE is 'single'"""
+        sent_tweets = []
+        payloads = []
+        for tweet in tweets:
+            message = self.format_tweet_notification(tweet)
+            if message:
+                sent_tweets.append(tweet)
+                payloads.append(message)
+        
+        if NOTIFICATION_MODE == 'single':
+            deliveries = [(self.telegram_notifier.send_notification(message), [i]) for i, message in enumerate(payloads)]
+        else:
+            deliveries = self.telegram_notifier.send_digest(payloads)
+        
+        logger.info(f"Queued {len(payloads)} tweets in {len(deliveries)} Telegram messages")
+        for future, indices in deliveries:
+            future.add_done_callback(partial(self._log_delivery, [sent_tweets[i] for i in indices]))
     
-    def send_tweet_notification(self, tweet):
-        """Send notification for a single tweet"""
+    def format_tweet_notification(self, tweet):
+        """Format the Telegram message for a single tweet"""
         try:
             username = tweet['username']
             tweet_text = tweet['text']
@@ -106,70 +136,78 @@ class LockedPCMonitorService:
             # Get tweet type
             tweet_type = tweet.get('type', 'original')
             
-            # Create and send notification
-            message = self.telegram_notifier.format_tweet_message(
+            return self.telegram_notifier.format_tweet_message(
                 username, tweet_text, tweet_url, formatted_time, tweet_type
             )
-            
-            self.telegram_notifier.send_notification_sync(message)
-            logger.info("Notification sent")
-            
+        
         except Exception as e:
-            logger.error(f"Error sending notification for tweet: {e}")
+            logger.error(f"Error formatting notification for tweet: {e}")
+            return None
+    
+    def _log_delivery(self, tweets, future):
+        """Log the detection-to-delivery latency of the tweets carried by one message"""
+        try:
+            delivered = future.result()
+        except Exception:
+            delivered = False
+        
+        now = time.time()
+        latencies = [now - tweet['detected_at'] for tweet in tweets if 'detected_at' in tweet]
+        latency = f"{max(latencies):.1f}s" if latencies else "unknown"
+        if delivered:
+            logger.info(f"Notification sent: {len(tweets)} tweets, detection-to-delivery {latency}")
+        else:
+            logger.error(f"Failed to deliver notification for {len(tweets)} tweets after {latency}")
     
     def run_continuous_locked_pc(self):
         """Run the monitor continuously optimized for locked PC"""
         logger.info("Starting Twitter monitor (Locked PC Mode)...")
-        logger.info(f"Check interval: {CHECK_INTERVAL_MINUTES} minutes")
+        logger.info(f"Check interval: {user_check_interval() / 60:g} minutes ({USER_POLLING} polling)")
         logger.info("This will continue running when PC is locked")
         
         # Setup signal handler for graceful shutdown
         def signal_handler(sig, frame):
             logger.info("Stopping monitor...")
-            try:
-                if self.twitter_monitor:
-                    self.twitter_monitor.cleanup()
-            except Exception as e:
-                logger.error(f"Error during cleanup: {e}")
+            self.cleanup()
             sys.exit(0)
         
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
         
-        # Run initial check
-        self.check_and_notify()
+        # Validate the bot once and keep the delivery worker warm
+        self.telegram_notifier.start()
+        start_metrics_server(METRICS_PORT)
         
-        # Main loop with countdown timer (simplified for locked PC)
-        while True:
-            try:
-                # Show countdown timer
-                if not show_countdown(CHECK_INTERVAL_MINUTES, "Next tweet check"):
-                    break  # User interrupted
-                
-                # Run the check
-                self.check_and_notify()
-                
-            except KeyboardInterrupt:
-                logger.info("Monitor stopped by user")
-                break
-            except Exception as e:
-                logger.error(f"Error in main loop: {e}")
-                time.sleep(60)  # Wait before retrying
+        # Initial check runs immediately, then on a fixed schedule
+        try:
+            self.scheduler.run(self.check_and_notify)
+        except KeyboardInterrupt:
+            logger.info("Monitor stopped by user")
         
         # Final cleanup
-        if self.twitter_monitor:
-            self.twitter_monitor.cleanup()
+        self.cleanup()
+    
+    def cleanup(self):
+        """Release the monitor and quit every pooled browser"""
+        try:
+            self.driver_pool.close()
+            if self.twitter_monitor:
+                self.twitter_monitor.cleanup()
+            self.telegram_notifier.stop()
+        except Exception as e:
+            logger.error(f"Error during cleanup: {e}")
 
 def main():
     """Main function"""
+    configure_logging('user')
     print("🚀 Starting Twitter Monitor (Locked PC Mode)")
     print("=" * 50)
     
-    # Kill any existing Chrome processes before starting
+    # Reap Chrome left behind by a crashed earlier run (a running sibling service is left alone)
     try:
-        from kill_chrome import kill_all_chrome_processes
-        print("🧹 Cleaning up any existing Chrome processes...")
-        kill_all_chrome_processes()
+        from kill_chrome import kill_project_chrome_processes
+        print("🧹 Cleaning up orphaned Chrome processes...")
+        kill_project_chrome_processes()
         print("✅ Chrome cleanup completed")
     except Exception as e:
         print(f"⚠️ Chrome cleanup warning: {e}")
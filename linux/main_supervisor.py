@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Supervisor running user monitoring and YAP scraping in one process
+Both jobs share one scheduler, one browser pool and one Telegram notifier
+"""
+
+import logging
+import sys
+import signal
+from config import (
+    USER_POLLING,
+    YAP_CHECK_INTERVAL_MINUTES,
+    DRIVER_MAX_CHECKS,
+    DRIVER_MAX_RSS_MB,
+    SCHEDULE_MODE,
+    SCHEDULE_JITTER_SECONDS,
+    SCHEDULE_MISSED_RUNS,
+    COUNTDOWN_DISPLAY_SECONDS,
+    SUPERVISOR_JOBS,
+    SUPERVISOR_SHARED_POOL,
+    METRICS_PORT
+)
+from scraper_monitor import TwitterScraperMonitor, user_check_concurrency
+from yap_scraper import YapSearchScraper
+from robust_notifier import get_notifier
+from driver_pool import DriverPool
+from process_registry import get_registry
+from chrome_launch import get_launch_stats
+from logging_setup import configure_logging
+from scheduler import JobScheduler
+from metrics import start_metrics_server
+from adaptive_polling import user_check_interval
+from main_scraper_locked_pc import LockedPCMonitorService
+from main_yap_scraper import YapScraperService
+
+logger = logging.getLogger(__name__)
+
+class SupervisorService:
+    def __init__(self, jobs=SUPERVISOR_JOBS):
+        self.jobs = jobs
+        self.telegram_notifier = get_notifier()
+        self.pools = []
+        self.user_service = None
+        self.yap_service = None
+        
+        # Jobs never overlap, so one warm browser can serve both when their launch options match
+        shared_pool = None
+        if SUPERVISOR_SHARED_POOL:
+            shared_pool = self._create_pool('shared', TwitterScraperMonitor.create_driver, user_check_concurrency())
+        
+        if 'user' in jobs:
+            user_pool = shared_pool or self._create_pool('user', TwitterScraperMonitor.create_driver, user_check_concurrency())
+            self.user_service = LockedPCMonitorService(driver_pool=user_pool)
+        if 'yap' in jobs:
+            yap_pool = shared_pool or self._create_pool('yap', YapSearchScraper.create_driver, 1)
+            self.yap_service = YapScraperService(driver_pool=yap_pool)
+        
+        self.scheduler = JobScheduler()
+        schedule_options = {
+            'mode': SCHEDULE_MODE,
+            'jitter': SCHEDULE_JITTER_SECONDS,
+            'missed_policy': SCHEDULE_MISSED_RUNS,
+            'progress_interval': COUNTDOWN_DISPLAY_SECONDS
+        }
+        if self.user_service:
+            self.scheduler.add_job('tweet check', self.user_service.check_and_notify, user_check_interval(), **schedule_options)
+        if self.yap_service:
+            self.scheduler.add_job('YAP scraping', self.yap_service.run_yap_scraping, YAP_CHECK_INTERVAL_MINUTES * 60, **schedule_options)
+        
+        logger.info(f"Supervisor initialized with jobs: {', '.join(jobs)} ({len(self.pools)} driver pool(s))")
+    
+    def _create_pool(self, name, factory, size):
+        pool = DriverPool(
+            name,
+            factory,
+            size=max(1, size),
+            max_checks=DRIVER_MAX_CHECKS,
+            max_rss_mb=DRIVER_MAX_RSS_MB
+        )
+        self.pools.append(pool)
+        return pool
+    
+    def log_metrics(self):
+        """Log per-job timing metrics"""
+        for name, metrics in self.scheduler.metrics().items():
+            logger.info(f"📊 {name}: {metrics}")
+        logger.info(f"📊 telegram: {self.telegram_notifier.stats()}")
+        for preset, stats in get_launch_stats().summary().items():
+            logger.info(f"📊 chrome {preset}: {stats}")
+    
+    def run(self):
+        """Run both jobs until stopped"""
+        logger.info(f"Tweet check every {user_check_interval() / 60:g} minutes ({USER_POLLING} polling), YAP scraping every {YAP_CHECK_INTERVAL_MINUTES} minutes")
+        
+        def signal_handler(sig, frame):
+            logger.info("Shutdown signal received, cleaning up...")
+            self.cleanup()
+            sys.exit(0)
+        
+        signal.signal(signal.SIGINT, signal_handler)
+        signal.signal(signal.SIGTERM, signal_handler)
+        
+        # Validate the bot once and keep the delivery worker warm
+        self.telegram_notifier.start()
+        start_metrics_server(METRICS_PORT)
+        
+        try:
+            self.scheduler.run()
+        except KeyboardInterrupt:
+            logger.info("Supervisor stopped by user")
+        
+        self.cleanup()
+    
+    def cleanup(self):
+        """Stop both jobs and quit every pooled browser"""
+        self.scheduler.stop()
+        self.log_metrics()
+        for service in (self.user_service, self.yap_service):
+            if service:
+                service.cleanup()
+        for pool in self.pools:
+            pool.close()
+        self.telegram_notifier.stop()
+
+def main():
+    """Main function"""
+    configure_logging('supervisor')
+    print("🚀 Starting Twitter Monitor Supervisor (user monitoring + YAP scraping)")
+    print("=" * 50)
+    
+    # Reap Chrome left behind by a crashed earlier run; browsers owned by live processes are left alone
+    try:
+        print("🧹 Cleaning up orphaned Chrome processes...")
+        get_registry().reap_orphans()
+        print("✅ Chrome cleanup completed")
+    except Exception as e:
+        print(f"⚠️ Chrome cleanup warning: {e}")
+    
+    supervisor = SupervisorService()
+    
+    try:
+        supervisor.run()
+    except Exception as e:
+        print(f"\n❌ Error running supervisor: {e}")
+        supervisor.cleanup()
+
+if __name__ == "__main__":
+    main()
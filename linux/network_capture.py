@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Timeline network capture
+Reads the UserTweets/SearchTimeline GraphQL responses the page already fetches
+(via Chrome performance logging and CDP Network.getResponseBody) and parses
+tweets straight from the JSON instead of querying the rendered DOM
+"""
+
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Set
+
+from snowflake import resolve_created_at
+
+logger = logging.getLogger(__name__)
+
+USER_TIMELINE_OPERATIONS = ('UserTweets',)
+SEARCH_TIMELINE_OPERATIONS = ('SearchTimeline',)
+
+
+def enable_performance_logging(chrome_options):
+    """Ask chromedriver to buffer DevTools network events for get_log('performance')"""
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return chrome_options
+
+
+def parse_twitter_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse the legacy created_at format, e.g. 'Wed Oct 10 20:19:24 +0000 2018'"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%a %b %d %H:%M:%S %z %Y').astimezone(timezone.utc)
+    except ValueError:
+        return None
+
+
+class TimelineCapture:
+    """Collects timeline GraphQL payloads from a driver's performance log"""
+
+    def __init__(self, driver, operations=USER_TIMELINE_OPERATIONS):
+        self.driver = driver
+        self.operations = tuple(operations)
+        self._pending = {}
+
+    def drain(self):
+        """Discard buffered events, e.g. before navigating to a new page"""
+        try:
+            self.driver.get_log('performance')
+        except Exception as e:
+            logger.debug(f"Could not drain performance log: {e}")
+        self._pending.clear()
+
+    def collect(self) -> List[Dict]:
+        """Return the JSON bodies of every matching response finished since the last call"""
+        finished = set()
+        for entry in self.driver.get_log('performance'):
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError, TypeError):
+                continue
+
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.responseReceived':
+                url = params.get('response', {}).get('url', '')
+                if self._matches(url):
+                    self._pending[params.get('requestId')] = url
+            elif method == 'Network.loadingFinished':
+                finished.add(params.get('requestId'))
+
+        payloads = []
+        for request_id in [rid for rid in self._pending if rid in finished]:
+            url = self._pending.pop(request_id)
+            try:
+                body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+                payloads.append(json.loads(body.get('body', '')))
+            except Exception as e:
+                logger.debug("Could not read timeline response %s: %s", url, e)
+
+        if payloads:
+            logger.debug(f"Captured {len(payloads)} timeline payloads ({', '.join(self.operations)})")
+        return payloads
+
+    def _matches(self, url: str) -> bool:
+        return '/graphql/' in url and any(f"/{op}" in url for op in self.operations)
+
+
+def _iter_tweet_results(node) -> Iterator[Dict]:
+    """Yield every tweet_results.result object in document order"""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == 'tweet_results' and isinstance(value, dict):
+                result = value.get('result')
+                if isinstance(result, dict):
+                    yield result
+                continue
+            yield from _iter_tweet_results(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _iter_tweet_results(item)
+
+
+def _unwrap(result: Dict) -> Dict:
+    # Tweets with visibility restrictions nest the real tweet one level deeper
+    if result.get('__typename') == 'TweetWithVisibilityResults':
+        return result.get('tweet', {})
+    return result
+
+
+def _screen_name(result: Dict) -> Optional[str]:
+    user = result.get('core', {}).get('user_results', {}).get('result', {})
+    return user.get('core', {}).get('screen_name') or user.get('legacy', {}).get('screen_name')
+
+
+def _pinned_ids(node) -> Set[str]:
+    """Ids of tweets in TimelinePinEntry instructions (the profile's pinned tweet)"""
+    pinned = set()
+    if isinstance(node, dict):
+        if node.get('type') == 'TimelinePinEntry':
+            for result in _iter_tweet_results(node):
+                result = _unwrap(result)
+                tweet_id = result.get('rest_id') or result.get('legacy', {}).get('id_str')
+                if tweet_id:
+                    pinned.add(tweet_id)
+            return pinned
+        for value in node.values():
+            pinned |= _pinned_ids(value)
+    elif isinstance(node, list):
+        for item in node:
+            pinned |= _pinned_ids(item)
+    return pinned
+
+
+def parse_timeline_tweets(payload: Dict, username: Optional[str] = None) -> List[Dict]:
+    """Parse tweets from a timeline payload into the dict shape extract_tweet_data returns
+
+    ``username`` overrides the author handle (the monitored account on profile
+    timelines); search results keep each tweet's own author.
+    """
+    tweets = []
+    seen = set()
+    pinned = _pinned_ids(payload)
+    for raw in _iter_tweet_results(payload):
+        result = _unwrap(raw)
+        legacy = result.get('legacy')
+        tweet_id = result.get('rest_id') or (legacy or {}).get('id_str')
+        if not legacy or not tweet_id or tweet_id in seen:
+            continue
+        seen.add(tweet_id)
+
+        if legacy.get('retweeted_status_result'):
+            tweet_type = 'retweet'
+        elif legacy.get('is_quote_status'):
+            tweet_type = 'quote'
+        else:
+            tweet_type = 'original'
+
+        note = result.get('note_tweet', {}).get('note_tweet_results', {}).get('result', {})
+        text = note.get('text') or legacy.get('full_text') or "[Media tweet - text not available]"
+
+        tweets.append({
+            'id': tweet_id,
+            'text': text,
+            'username': username or _screen_name(result),
+            'created_at': resolve_created_at(tweet_id, parse_twitter_datetime(legacy.get('created_at')), 'api'),
+            'type': tweet_type,
+            'pinned': tweet_id in pinned,
+            'metrics': {
+                'replies': legacy.get('reply_count', 0),
+                'retweets': legacy.get('retweet_count', 0),
+                'likes': legacy.get('favorite_count', 0),
+                'quotes': legacy.get('quote_count', 0),
+                'views': int(result.get('views', {}).get('count', 0) or 0)
+            }
+        })
+    return tweets
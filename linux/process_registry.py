@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Chrome process registry
+Records the chromedriver/Chrome PID tree each driver spawns so teardown reaps
+only this project's browsers instead of sweeping every Chrome on the machine
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'chrome_pids')
+
+
+def reap_processes(procs: Iterable[psutil.Process], timeout: float = 3.0) -> int:
+    """Terminate processes in parallel, then kill whatever outlives ``timeout``
+
+    Returns the number of processes that are gone afterwards.
+    """
+    procs = list(procs)
+    if not procs:
+        return 0
+
+    for proc in procs:
+        try:
+            proc.terminate()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    gone, alive = psutil.wait_procs(procs, timeout=timeout)
+
+    if alive:
+        for proc in alive:
+            try:
+                proc.kill()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        more_gone, alive = psutil.wait_procs(alive, timeout=timeout)
+        gone += more_gone
+
+    if alive:
+        logger.warning(f"Could not reap Chrome processes: {', '.join(str(proc.pid) for proc in alive)}")
+    return len(gone)
+
+
+def _process_tree(pid: int) -> List[psutil.Process]:
+    try:
+        root = psutil.Process(pid)
+        return [root] + root.children(recursive=True)
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return []
+
+
+def _create_time(proc: psutil.Process) -> Optional[float]:
+    try:
+        return proc.create_time()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+
+class ProcessRegistry:
+    """PID trees of the browsers this process launched
+
+    Each entry keeps PIDs with their create times so a recycled PID is never
+    mistaken for one of our browsers. Entries are mirrored to one JSON file
+    per Python process under ``directory``; ``reap_orphans()`` uses those
+    files to clean up after a run that crashed, without touching browsers
+    owned by a sibling service that is still alive.
+    """
+
+    def __init__(self, directory: str = REGISTRY_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._entries: Dict[int, Dict] = {}
+        self._owner = psutil.Process()
+        self._path = os.path.join(directory, f"{self._owner.pid}.json")
+
+    def register(self, driver, owner: str = '') -> List[int]:
+        """Record the PID tree behind ``driver``"""
+        root_pid = self._root_pid(driver)
+        if root_pid is None:
+            return []
+        pids = self._snapshot(root_pid)
+        with self._lock:
+            self._entries[id(driver)] = {'owner': owner, 'root': root_pid, 'pids': pids}
+            self._persist()
+        logger.debug(f"Registered {owner or 'chrome'} process tree rooted at {root_pid} ({len(pids)} processes)")
+        return [int(pid) for pid in pids]
+
+    def refresh(self, driver):
+        """Pick up processes Chrome spawned since the driver was registered"""
+        with self._lock:
+            entry = self._entries.get(id(driver))
+            if entry is None:
+                return
+            entry['pids'].update(self._snapshot(entry['root']))
+            self._persist()
+
+    def unregister(self, driver):
+        with self._lock:
+            if self._entries.pop(id(driver), None) is not None:
+                self._persist()
+
+    def reap(self, driver, timeout: float = 3.0) -> int:
+        """Terminate whatever is left of ``driver``'s process tree"""
+        with self._lock:
+            entry = self._entries.pop(id(driver), None)
+            self._persist()
+        if entry is None:
+            root_pid = self._root_pid(driver)
+            if root_pid is None:
+                return 0
+            entry = {'root': root_pid, 'pids': self._snapshot(root_pid)}
+        return self._reap_entry(entry, timeout)
+
+    def reap_all(self, timeout: float = 3.0) -> int:
+        """Terminate every browser this process registered"""
+        with self._lock:
+            entries, self._entries = list(self._entries.values()), {}
+            self._persist()
+        return sum(self._reap_entry(entry, timeout) for entry in entries)
+
+    def reap_orphans(self, timeout: float = 3.0) -> int:
+        """Reap browsers recorded by earlier runs of this project that are no longer alive"""
+        if not os.path.isdir(self.directory):
+            return 0
+
+        reaped = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if path == self._path or not name.endswith('.json'):
+                continue
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except Exception as e:
+                logger.debug(f"Skipping unreadable process registry {path}: {e}")
+                continue
+
+            if self._is_alive(data.get('owner_pid'), data.get('owner_created')):
+                continue  # a sibling service still owns these browsers
+
+            for entry in data.get('entries', []):
+                reaped += self._reap_entry(entry, timeout)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+        if reaped:
+            logger.info(f"Reaped {reaped} orphaned Chrome processes from a previous run")
+        return reaped
+
+    def _reap_entry(self, entry: Dict, timeout: float) -> int:
+        started = time.monotonic()
+        procs = {}
+        for pid, created in entry.get('pids', {}).items():
+            try:
+                proc = psutil.Process(int(pid))
+            except (psutil.NoSuchProcess, ValueError):
+                continue
+            # Skip PIDs the OS has since handed to an unrelated process
+            if created is not None and _create_time(proc) == created:
+                procs[proc.pid] = proc
+
+        # Children spawned after the last snapshot, as long as the root is still ours
+        if entry.get('root') in procs:
+            for proc in _process_tree(entry['root']):
+                procs[proc.pid] = proc
+
+        reaped = reap_processes(procs.values(), timeout)
+        if procs:
+            logger.debug(f"Reaped {reaped}/{len(procs)} Chrome processes in {(time.monotonic() - started) * 1000:.0f}ms")
+        return reaped
+
+    @staticmethod
+    def _root_pid(driver) -> Optional[int]:
+        try:
+            process = driver.service.process
+            return process.pid if process is not None else None
+        except AttributeError:
+            return None
+
+    @staticmethod
+    def _snapshot(root_pid: int) -> Dict[str, float]:
+        return {str(proc.pid): _create_time(proc) for proc in _process_tree(root_pid)}
+
+    @staticmethod
+    def _is_alive(pid, created) -> bool:
+        if not pid:
+            return False
+        try:
+            return psutil.Process(pid).create_time() == created
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+
+    def _persist(self):
+        try:
+            if not self._entries:
+                if os.path.exists(self._path):
+                    os.remove(self._path)
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            data = {
+                'owner_pid': self._owner.pid,
+                'owner_created': self._owner.create_time(),
+                'entries': list(self._entries.values())
+            }
+            with open(self._path, 'w') as f:
+                json.dump(data, f)
+        except Exception as e:
+            logger.debug(f"Could not persist process registry: {e}")
+
+
+_shared_registry: Optional[ProcessRegistry] = None
+_shared_lock = threading.Lock()
+
+
+def get_registry() -> ProcessRegistry:
+    """Process-wide registry shared by every driver factory and pool"""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = ProcessRegistry()
+        return _shared_registry
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Chrome profile manager
+Keeps one logged-in golden profile per service (CHROME_PROFILE_USER/YAP) and
+hands each browser a fast clone of it, so the X session (and, on filesystems
+with reflinks, the HTTP cache) carries over instead of every launch starting
+from an empty profile
+"""
+
+import errno
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import psutil
+
+from config import CHROME_PROFILE_CLONES, CHROME_PROFILE_CLONE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Linux FICLONE ioctl: copy-on-write clone on btrfs, XFS (reflink=1), bcachefs...
+FICLONE = 0x40049409
+
+# Runtime state Chrome recreates, or that must not be shared between instances
+SKIP_NAMES = {
+    'SingletonLock', 'SingletonSocket', 'SingletonCookie', 'lockfile', 'LOCK',
+    'DevToolsActivePort', 'Crashpad', 'Crash Reports', 'BrowserMetrics',
+    'ShaderCache', 'GrShaderCache', 'GraphiteDawnCache', 'component_crx_cache'
+}
+
+# Cache directories are only carried over as reflinks. Chrome rewrites cache
+# entries in place, so a hardlinked entry would be shared with the golden
+# profile and every other clone; without reflinks the cache is left out and
+# Chrome rebuilds it. Everything else is reflinked or copied, so the golden
+# profile is never modified through a clone.
+CACHE_DIRS = {'Cache', 'Code Cache'}
+
+
+class CloneStats:
+    """How one clone was produced"""
+    
+    def __init__(self, service: str, path: str):
+        self.service = service
+        self.path = path
+        self.files = 0
+        self.bytes = 0
+        self.reflinked = 0
+        self.skipped = 0
+        self.copied = 0
+        self.seconds = 0.0
+    
+    def as_dict(self) -> Dict:
+        return {
+            'service': self.service,
+            'files': self.files,
+            'size_mb': round(self.bytes / (1024 * 1024), 1),
+            'reflinked': self.reflinked,
+            'skipped': self.skipped,
+            'copied': self.copied,
+            'seconds': round(self.seconds, 3)
+        }
+
+
+class ProfileManager:
+    """Hands out per-browser clones of each service's golden profile
+    
+    Clones live under ``clone_dir`` (keep it on the golden profiles'
+    filesystem so reflinks work) and are named
+    ``chrome_profile_<service>_<pid>_<id>``; clones left by a dead process are
+    removed the first time this process clones.
+    """
+    
+    def __init__(self, clone_dir: str = CHROME_PROFILE_CLONE_DIR, enabled: bool = CHROME_PROFILE_CLONES):
+        self.clone_dir = os.path.abspath(clone_dir)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._clones: Dict[str, CloneStats] = {}
+        self._by_driver: Dict[int, str] = {}
+        self._reflink_ok = sys.platform.startswith('linux')
+        self._pruned = False
+        self.history: List[Dict] = []
+    
+    def checkout(self, service: str, golden: str) -> str:
+        """Return the profile directory a new browser for ``service`` should use"""
+        golden = os.path.abspath(golden)
+        if not self.enabled:
+            os.makedirs(golden, exist_ok=True)
+            return golden
+        
+        self._prune_stale()
+        path = os.path.join(self.clone_dir, f"chrome_profile_{service}_{os.getpid()}_{uuid.uuid4().hex[:8]}")
+        stats = CloneStats(service, path)
+        started = time.monotonic()
+        
+        if os.path.isdir(golden) and os.listdir(golden):
+            self._clone_tree(golden, path, stats, cache=False)
+        else:
+            os.makedirs(path, exist_ok=True)
+            logger.warning(f"No golden {service} profile at {golden}; run setup_twitter_login_{service}.py to log in once")
+        
+        stats.seconds = time.monotonic() - started
+        with self._lock:
+            self._clones[path] = stats
+            self.history.append(stats.as_dict())
+        logger.info(
+            f"📁 Cloned {service} profile in {stats.seconds:.2f}s: {stats.files} files, "
+            f"{stats.bytes / (1024 * 1024):.1f}MB ({stats.reflinked} reflinked, "
+            f"{stats.copied} copied, {stats.skipped} cache files left out)"
+        )
+        return path
+    
+    def attach(self, driver, path: str):
+        """Remember which clone ``driver`` runs on so release() can remove it"""
+        with self._lock:
+            if path in self._clones:
+                self._by_driver[id(driver)] = path
+    
+    def release(self, driver):
+        """Remove the clone behind a driver that has quit"""
+        with self._lock:
+            path = self._by_driver.pop(id(driver), None)
+        if path:
+            self._remove(path)
+    
+    def remove_all(self, service: Optional[str] = None):
+        """Remove every clone this process made (for ``service`` only, if given)"""
+        with self._lock:
+            paths = [path for path, stats in self._clones.items() if service is None or stats.service == service]
+            self._by_driver = {key: path for key, path in self._by_driver.items() if path not in paths}
+        for path in paths:
+            self._remove(path)
+    
+    def _remove(self, path: str):
+        with self._lock:
+            self._clones.pop(path, None)
+        try:
+            shutil.rmtree(path, ignore_errors=True)
+            logger.debug(f"Removed profile clone {path}")
+        except Exception as e:
+            logger.warning(f"Failed to remove profile clone {path}: {e}")
+    
+    def _prune_stale(self):
+        if self._pruned:
+            return
+        self._pruned = True
+        if not os.path.isdir(self.clone_dir):
+            return
+        for name in os.listdir(self.clone_dir):
+            parts = name.split('_')
+            # chrome_profile_<service>_<pid>_<id>
+            if not name.startswith('chrome_profile_') or len(parts) < 5 or not parts[-2].isdigit():
+                continue
+            if int(parts[-2]) != os.getpid() and psutil.pid_exists(int(parts[-2])):
+                continue
+            shutil.rmtree(os.path.join(self.clone_dir, name), ignore_errors=True)
+            logger.info(f"Removed stale profile clone {name}")
+    
+    def _clone_tree(self, source: str, target: str, stats: CloneStats, cache: bool):
+        os.makedirs(target, exist_ok=True)
+        for entry in os.scandir(source):
+            if entry.name in SKIP_NAMES or entry.name.endswith('.tmp'):
+                continue
+            if entry.name in CACHE_DIRS and not self._reflink_ok:
+                continue
+            destination = os.path.join(target, entry.name)
+            try:
+                if entry.is_symlink():
+                    continue
+                if entry.is_dir():
+                    self._clone_tree(entry.path, destination, stats, cache or entry.name in CACHE_DIRS)
+                else:
+                    self._clone_file(entry.path, destination, stats, cache)
+            except OSError as e:
+                logger.debug(f"Skipping {entry.path} while cloning profile: {e}")
+    
+    def _clone_file(self, source: str, destination: str, stats: CloneStats, cache: bool):
+        size = os.path.getsize(source)
+        if self._reflink(source, destination):
+            stats.reflinked += 1
+        elif cache:
+            stats.skipped += 1
+            return
+        else:
+            shutil.copy2(source, destination)
+            stats.copied += 1
+        stats.files += 1
+        stats.bytes += size
+    
+    def _reflink(self, source: str, destination: str) -> bool:
+        if not self._reflink_ok:
+            return False
+        import fcntl
+        try:
+            with open(source, 'rb') as src, open(destination, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            shutil.copystat(source, destination)
+            return True
+        except OSError as e:
+            if e.errno in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS):
+                # The filesystem cannot clone; stop trying for the rest of this process
+                self._reflink_ok = False
+            try:
+                os.remove(destination)
+            except OSError:
+                pass
+            return False
+    
+
+_shared_manager: Optional[ProfileManager] = None
+_shared_lock = threading.Lock()
+
+
+def get_profile_manager() -> ProfileManager:
+    """Process-wide profile manager shared by every driver factory and pool"""
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = ProfileManager()
+        return _shared_manager
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Event-driven scroll engine
+Waits on a MutationObserver inside the page instead of fixed sleeps after each scroll
+"""
+
+import logging
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+TWEET_SELECTOR = '[data-testid="tweet"]'
+
+# Installs (once per page) an observer counting every tweet article ever added.
+# X virtualizes the timeline, so the live article count stays roughly flat while
+# scrolling; a monotonic "added" counter is the reliable growth signal.
+INSTALL_OBSERVER_JS = """
+const selector = arguments[0];
+if (!window.__xsScroll) {
+    const state = {added: document.querySelectorAll(selector).length, lastMutation: performance.now()};
+    const observer = new MutationObserver((mutations) => {
+        state.lastMutation = performance.now();
+        for (const mutation of mutations) {
+            for (const node of mutation.addedNodes) {
+                if (node.nodeType !== 1) {
+                    continue;
+                }
+                state.added += node.matches(selector) ? 1 : node.querySelectorAll(selector).length;
+            }
+        }
+    });
+    observer.observe(document.body, {childList: true, subtree: true});
+    window.__xsScroll = state;
+}
+return window.__xsScroll.added;
+"""
+
+# Resolves when new articles appeared and the DOM went quiet, when nothing changed
+# for idleMs (nothing left to load), or on timeout.
+WAIT_FOR_GROWTH_JS = """
+const [previous, timeoutMs, quietMs, idleMs] = arguments;
+const done = arguments[arguments.length - 1];
+const state = window.__xsScroll;
+if (!state) {
+    done({added: -1, reason: 'missing', waited_ms: 0});
+    return;
+}
+const start = performance.now();
+const timer = setInterval(() => {
+    const now = performance.now();
+    const quietFor = now - state.lastMutation;
+    let reason = null;
+    if (state.added > previous && quietFor >= quietMs) {
+        reason = 'grew';
+    } else if (state.added <= previous && now - start >= idleMs && quietFor >= idleMs) {
+        reason = 'idle';
+    } else if (now - start >= timeoutMs) {
+        reason = 'timeout';
+    }
+    if (reason) {
+        clearInterval(timer);
+        done({added: state.added, reason: reason, waited_ms: now - start});
+    }
+}, 50);
+"""
+
+
+class ScrollResult:
+    """Outcome of one scroll-and-wait step"""
+
+    def __init__(self, grew: bool, added: int, waited: float, reason: str):
+        self.grew = grew
+        self.added = added
+        self.waited = waited
+        self.reason = reason
+
+
+class ScrollEngine:
+    """Scrolls a timeline and waits only as long as new content keeps arriving
+
+    The wait timeout adapts to how quickly earlier scrolls produced new
+    articles (an EWMA of observed latencies, clamped to ``min_timeout`` and
+    ``max_timeout``). ``plateaued`` turns true once ``plateau_limit``
+    consecutive scrolls added nothing.
+    """
+
+    def __init__(self, driver, min_timeout: float = 1.5, max_timeout: float = 8.0,
+                 quiet_ms: int = 400, idle_ms: int = 1500, plateau_limit: int = 2):
+        self.driver = driver
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.quiet_ms = quiet_ms
+        self.idle_ms = idle_ms
+        self.plateau_limit = plateau_limit
+        self.added = 0
+        self.stalls = 0
+        self.total_wait = 0.0
+        self._latency = None
+
+    @property
+    def timeout(self) -> float:
+        """Current adaptive wait timeout in seconds"""
+        if self._latency is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, self._latency * 3))
+
+    @property
+    def plateaued(self) -> bool:
+        return self.stalls >= self.plateau_limit
+
+    def start(self) -> int:
+        """Install the page observer and return the number of articles seen so far"""
+        self.added = self.driver.execute_script(INSTALL_OBSERVER_JS, TWEET_SELECTOR) or 0
+        return self.added
+
+    def settle(self) -> ScrollResult:
+        """Wait for the initial render to go quiet instead of a fixed sleep"""
+        return self._wait(self.max_timeout, track=False)
+
+    def scroll_and_wait(self) -> ScrollResult:
+        """Scroll to the bottom and wait for new articles, idle or the adaptive timeout"""
+        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        return self._wait(self.timeout, track=True)
+
+    def summary(self) -> Dict:
+        return {'articles_added': self.added, 'wait_seconds': round(self.total_wait, 2), 'timeout': round(self.timeout, 2)}
+
+    def _wait(self, timeout: float, track: bool) -> ScrollResult:
+        started = time.monotonic()
+        result = self._run_wait(timeout)
+        if result.get('reason') == 'missing':
+            # Page navigated or re-rendered; reinstall and try once more
+            self.start()
+            result = self._run_wait(timeout)
+
+        waited = time.monotonic() - started
+        self.total_wait += waited
+        added = result.get('added', self.added)
+        grew = added > self.added
+        self.added = max(self.added, added)
+
+        if track:
+            if grew:
+                self.stalls = 0
+                latency = result.get('waited_ms', waited * 1000) / 1000
+                self._latency = latency if self._latency is None else 0.7 * self._latency + 0.3 * latency
+            else:
+                self.stalls += 1
+
+        return ScrollResult(grew, self.added, waited, result.get('reason', 'unknown'))
+
+    def _run_wait(self, timeout: float) -> Dict:
+        try:
+            self.driver.set_script_timeout(timeout + 5)
+            return self.driver.execute_async_script(
+                WAIT_FOR_GROWTH_JS, self.added, int(timeout * 1000), self.quiet_ms, self.idle_ms
+            ) or {}
+        except Exception as e:
+            logger.debug("Scroll wait failed: %s", e)
+            time.sleep(min(timeout, 1))
+            return {'added': self.added, 'reason': 'error'}
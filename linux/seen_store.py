@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Seen-tweet store
+Pluggable persistence for tweet IDs that have already been processed.
+The SQLite backend appends in batches and prunes by age instead of
+rewriting one ever-growing JSON file.
+"""
+
+import abc
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SeenStore(abc.ABC):
+    """Set-like store of seen tweet IDs
+
+    ``add()`` buffers IDs in memory; ``flush()`` persists everything added
+    since the last flush in one batch. Safe to share between threads: an ID
+    is visible to ``in`` from the moment it is added.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, Optional[str]] = {}
+        self._pending_lock = threading.Lock()
+
+    def __contains__(self, tweet_id) -> bool:
+        with self._pending_lock:
+            return tweet_id in self._pending or self._contains(tweet_id)
+
+    def __len__(self) -> int:
+        with self._pending_lock:
+            # Pending ids can already be stored (re-added after a restart); count those once
+            return self._count() + sum(1 for tweet_id in self._pending if not self._contains(tweet_id))
+
+    def add(self, tweet_id: str, username: Optional[str] = None):
+        with self._pending_lock:
+            self._pending[tweet_id] = username
+
+    def flush(self):
+        # Held through the write so a flushed ID never drops out of sight between buffer and backend
+        with self._pending_lock:
+            if not self._pending:
+                return
+            self._write(self._pending)
+            self._pending = {}
+
+    def prune(self, retention_days: int) -> int:
+        """Drop entries first seen more than ``retention_days`` ago"""
+        return 0
+
+    def post_counts(self, since: float) -> Dict[str, int]:
+        """Tweets first seen per username since ``since`` (epoch seconds); empty without timestamps"""
+        return {}
+
+    def trim(self, max_entries: int) -> int:
+        """Keep only the ``max_entries`` most recently seen entries"""
+        return 0
+
+    def close(self):
+        self.flush()
+
+    @abc.abstractmethod
+    def _contains(self, tweet_id) -> bool:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _count(self) -> int:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _write(self, entries: Dict[str, Optional[str]]):
+        raise NotImplementedError
+
+
+class JsonSeenStore(SeenStore):
+    """Legacy backend: the whole set lives in memory and is rewritten to a JSON file"""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._ids = set()
+        try:
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    self._ids = set(json.load(f).get('seen_tweets', []))
+        except Exception as e:
+            logger.error(f"Error loading seen tweets: {e}")
+
+    def _contains(self, tweet_id) -> bool:
+        return tweet_id in self._ids
+
+    def _count(self) -> int:
+        return len(self._ids)
+
+    def _write(self, entries):
+        self._ids.update(entries)
+        try:
+            data = {
+                'seen_tweets': list(self._ids),
+                'last_updated': datetime.now().isoformat()
+            }
+            with open(self.path, 'w') as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            logger.error(f"Error saving seen tweets: {e}")
+
+
+class SqliteSeenStore(SeenStore):
+    """SQLite (WAL) backend keyed by tweet ID with first-seen time and username"""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS seen_tweets (
+                tweet_id TEXT PRIMARY KEY,
+                username TEXT,
+                first_seen REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_seen_tweets_first_seen ON seen_tweets(first_seen);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        self._conn.commit()
+
+    def _contains(self, tweet_id) -> bool:
+        with self._lock:
+            row = self._conn.execute('SELECT 1 FROM seen_tweets WHERE tweet_id = ?', (str(tweet_id),)).fetchone()
+        return row is not None
+
+    def _count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM seen_tweets').fetchone()[0]
+
+    def _write(self, entries):
+        now = time.time()
+        self._insert((str(tweet_id), username, now) for tweet_id, username in entries.items())
+
+    def _insert(self, rows: Iterable):
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO seen_tweets (tweet_id, username, first_seen) VALUES (?, ?, ?)',
+                rows
+            )
+            self._conn.commit()
+
+    def prune(self, retention_days: int) -> int:
+        if not retention_days or retention_days <= 0:
+            return 0
+        cutoff = time.time() - retention_days * 86400
+        with self._lock:
+            deleted = self._conn.execute('DELETE FROM seen_tweets WHERE first_seen < ?', (cutoff,)).rowcount
+            self._conn.commit()
+        if deleted:
+            logger.info(f"Pruned {deleted} seen tweets older than {retention_days} days")
+        return deleted
+
+    def trim(self, max_entries: int) -> int:
+        if not max_entries or max_entries <= 0:
+            return 0
+        with self._lock:
+            deleted = self._conn.execute(
+                'DELETE FROM seen_tweets WHERE tweet_id IN '
+                '(SELECT tweet_id FROM seen_tweets ORDER BY first_seen DESC LIMIT -1 OFFSET ?)',
+                (max_entries,)
+            ).rowcount
+            self._conn.commit()
+        if deleted:
+            logger.info(f"Trimmed {deleted} seen tweets beyond the newest {max_entries}")
+        return deleted
+
+    def post_counts(self, since: float) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT username, COUNT(*) FROM seen_tweets WHERE first_seen >= ? AND username IS NOT NULL GROUP BY username',
+                (since,)
+            ).fetchall()
+        return dict(rows)
+
+    def import_json(self, json_path: str) -> int:
+        """One-time import of the legacy seen_tweets JSON file"""
+        with self._lock:
+            done = self._conn.execute("SELECT value FROM meta WHERE key = 'json_imported'").fetchone()
+        if done or not os.path.exists(json_path):
+            return 0
+
+        try:
+            with open(json_path, 'r') as f:
+                ids = json.load(f).get('seen_tweets', [])
+            imported_at = os.path.getmtime(json_path)
+        except Exception as e:
+            logger.error(f"Error importing seen tweets from {json_path}: {e}")
+            return 0
+
+        self._insert((str(tweet_id), None, imported_at) for tweet_id in ids)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', ?)",
+                (datetime.now().isoformat(),)
+            )
+            self._conn.commit()
+        logger.info(f"Imported {len(ids)} seen tweets from {json_path}")
+        return len(ids)
+
+    def close(self):
+        super().close()
+        with self._lock:
+            self._conn.close()
+
+
+def open_seen_store(backend: str, sqlite_path: str, json_path: str) -> SeenStore:
+    """Open the configured seen-tweet backend ('sqlite' or 'json')"""
+    if backend == 'json':
+        return JsonSeenStore(json_path)
+
+    store = SqliteSeenStore(sqlite_path)
+    store.import_json(json_path)
+    return store
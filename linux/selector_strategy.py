@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Adaptive selector strategies
+Each lookup that used to walk a fixed list of CSS selectors keeps hit counts per
+selector and skips selectors that never match. Lists of interchangeable
+selectors are also tried best-first; lists ordered by meaning keep their
+declared order. The original order is re-probed periodically in case X changes
+its markup, and the statistics persist across runs in a small JSON file
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import SELECTOR_STATS_FILE, SELECTOR_REPROBE_EVERY, SELECTOR_PRUNE_AFTER
+
+logger = logging.getLogger(__name__)
+
+# Counts are halved past this many attempts so old markup fades out of the ranking
+MAX_ATTEMPTS = 1000
+
+# Seconds between automatic saves of the statistics file
+SAVE_INTERVAL = 300
+
+
+class SelectorStrategy:
+    """Hit statistics and current order for one list of candidate selectors
+    
+    By default selectors keep their declared order, which usually runs from
+    precise to broad: a broad selector that matched when the precise one
+    could not must never jump ahead of it. Only ``ranked`` lists, whose
+    selectors all find the same element, are tried by hit rate (ties in
+    declared order). Either way a selector attempted ``prune_after`` times
+    without a single hit is skipped, except that the first selector is always
+    kept. Every ``reprobe_every`` lookups the full declared order is tried.
+    """
+    
+    def __init__(self, name: str, selectors: Iterable[str], ranked: bool = False,
+                 reprobe_every: int = SELECTOR_REPROBE_EVERY, prune_after: int = SELECTOR_PRUNE_AFTER):
+        self.name = name
+        self.selectors = tuple(selectors)
+        self.ranked = ranked
+        self.reprobe_every = reprobe_every
+        self.prune_after = prune_after
+        self.hits = {selector: 0 for selector in self.selectors}
+        self.attempts = {selector: 0 for selector in self.selectors}
+        self.lookups = 0
+        self._lock = threading.Lock()
+    
+    def _rate(self, selector: str) -> float:
+        attempts = self.attempts[selector]
+        return self.hits[selector] / attempts if attempts else 0.0
+    
+    def _candidates(self) -> List[str]:
+        if not self.ranked:
+            return list(self.selectors)
+        position = {selector: index for index, selector in enumerate(self.selectors)}
+        return sorted(self.selectors, key=lambda selector: (-self._rate(selector), position[selector]))
+    
+    def order(self) -> List[str]:
+        """Selectors to try for the next lookup"""
+        with self._lock:
+            self.lookups += 1
+            if self.reprobe_every and self.lookups % self.reprobe_every == 0:
+                return list(self.selectors)
+            candidates = self._candidates()
+            return candidates[:1] + [
+                selector for selector in candidates[1:]
+                if self.hits[selector] or self.attempts[selector] < self.prune_after
+            ]
+    
+    def record(self, selector: str, hit: bool):
+        with self._lock:
+            self.attempts[selector] += 1
+            if hit:
+                self.hits[selector] += 1
+            if self.attempts[selector] > MAX_ATTEMPTS:
+                self.attempts[selector] //= 2
+                self.hits[selector] //= 2
+    
+    def pruned(self) -> List[str]:
+        with self._lock:
+            active = set(self._candidates()[:1])
+            return [selector for selector in self.selectors
+                    if selector not in active and not self.hits[selector] and self.attempts[selector] >= self.prune_after]
+    
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                'selectors': list(self.selectors),
+                'hits': dict(self.hits),
+                'attempts': dict(self.attempts),
+                'lookups': self.lookups
+            }
+    
+    def load(self, data: Dict):
+        """Restore saved statistics, ignoring them if the selector list has since changed"""
+        if list(self.selectors) != data.get('selectors'):
+            logger.info(f"Selector list for {self.name} changed; starting its statistics over")
+            return
+        with self._lock:
+            for selector in self.selectors:
+                self.hits[selector] = int(data.get('hits', {}).get(selector, 0))
+                self.attempts[selector] = int(data.get('attempts', {}).get(selector, 0))
+            self.lookups = int(data.get('lookups', 0))
+
+
+class SelectorRegistry:
+    """Every SelectorStrategy in the process, persisted to ``path``"""
+    
+    def __init__(self, path: Optional[str] = SELECTOR_STATS_FILE):
+        self.path = path or None
+        self._lock = threading.Lock()
+        self._strategies: Dict[str, SelectorStrategy] = {}
+        self._saved: Dict[str, Dict] = self._read()
+        self._last_save = time.monotonic()
+    
+    def _read(self) -> Dict[str, Dict]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read selector statistics from {self.path}: {e}")
+            return {}
+    
+    def strategy(self, name: str, selectors: Iterable[str], ranked: bool = False) -> SelectorStrategy:
+        """The strategy called ``name``, created (and restored from disk) on first use"""
+        with self._lock:
+            strategy = self._strategies.get(name)
+            if strategy is None:
+                strategy = self._strategies[name] = SelectorStrategy(name, selectors, ranked)
+                if name in self._saved:
+                    strategy.load(self._saved[name])
+            return strategy
+    
+    def find(self, name: str, selectors: Iterable[str], search: Callable[[str], Any],
+             accept: Callable[[Any], bool] = bool, ranked: bool = False) -> Tuple[Optional[str], Any]:
+        """Run ``search(selector)`` in strategy order until ``accept`` likes a result
+        
+        Pass ``ranked`` only when every selector finds the same thing.
+        Exceptions count as misses. Returns (selector, result), or (None, None)
+        when no selector produced an accepted result.
+        """
+        strategy = self.strategy(name, selectors, ranked)
+        for selector in strategy.order():
+            try:
+                result = search(selector)
+            except Exception as e:
+                logger.debug("Selector %s (%s) failed: %s", selector, name, e)
+                result = None
+            hit = result is not None and accept(result)
+            strategy.record(selector, hit)
+            if hit:
+                return selector, result
+        return None, None
+    
+    def save(self, force: bool = False):
+        """Write the statistics, at most every SAVE_INTERVAL seconds unless ``force``"""
+        if not self.path:
+            return
+        with self._lock:
+            if not force and time.monotonic() - self._last_save < SAVE_INTERVAL:
+                return
+            self._last_save = time.monotonic()
+            strategies = list(self._strategies.values())
+        
+        # Both services share the file; keep the strategies this process never used
+        data = self._read()
+        for strategy in strategies:
+            data[strategy.name] = strategy.to_dict()
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not save selector statistics to {self.path}: {e}")
+            return
+        for strategy in strategies:
+            pruned = strategy.pruned()
+            if pruned:
+                logger.debug("Selector strategy %s skips %s", strategy.name, ', '.join(pruned))
+
+
+_shared_registry: Optional[SelectorRegistry] = None
+_shared_lock = threading.Lock()
+
+
+def get_selector_registry() -> SelectorRegistry:
+    """Process-wide registry shared by every scraper"""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = SelectorRegistry()
+        return _shared_registry
@@ -8,21 +8,15 @@ import os
 import sys
 import logging
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from config import CHROME_PROFILE_USER, CHROME_PROFILE_YAP, LOG_LEVEL, LOG_FILE
+from chrome_launch import build_chrome_options, launch_chrome, PRESET_STANDARD
+from config import CHROME_PROFILE_USER, CHROME_PROFILE_YAP
+from logging_setup import configure_logging
 
 # Setup logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 def create_profile_directory(profile_path, profile_name):
@@ -33,34 +27,11 @@ def create_profile_directory(profile_path, profile_name):
         logger.info(f"Created {profile_name} profile directory: {profile_path}")
         
         # Setup Chrome options for this profile
-        chrome_options = Options()
-        
-        # Set Chrome binary path if available
-        try:
-            from config import CHROME_BINARY_PATH
-            chrome_options.binary_location = CHROME_BINARY_PATH
-        except ImportError:
-            # Fallback to default Chrome path
-            chrome_options.binary_location = '/usr/bin/google-chrome'
-        
-        chrome_options.add_argument(f'--user-data-dir={profile_path}')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_argument('--disable-extensions')
-        chrome_options.add_argument('--disable-plugins')
-        chrome_options.add_argument('--disable-logging')
-        chrome_options.add_argument('--log-level=3')
-        chrome_options.add_argument('--silent')
-        chrome_options.add_argument('--disable-remote-fonts')
-        chrome_options.add_argument('--disable-web-security')
-        chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
+        chrome_options = build_chrome_options(profile_path, PRESET_STANDARD)
         
         # Initialize Chrome driver to create profile
         logger.info(f"Initializing {profile_name} Chrome profile...")
-        driver = webdriver.Chrome(options=chrome_options)
+        driver = launch_chrome(chrome_options, PRESET_STANDARD)
         
         # Navigate to Twitter to initialize the profile
         driver.get("https://twitter.com")
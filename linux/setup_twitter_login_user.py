@@ -9,22 +9,17 @@ import sys
 import time
 import logging
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from config import CHROME_PROFILE_USER, TWITTER_USERNAME, TWITTER_PASSWORD, LOG_LEVEL, LOG_FILE
+from chrome_launch import build_chrome_options, launch_chrome, PRESET_STANDARD
+from resource_blocking import apply_content_settings
+from config import CHROME_PROFILE_USER, TWITTER_USERNAME, TWITTER_PASSWORD
+from logging_setup import configure_logging
 
 # Setup logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 def setup_user_chrome_driver():
@@ -33,28 +28,17 @@ def setup_user_chrome_driver():
         # Ensure the profile directory exists
         os.makedirs(CHROME_PROFILE_USER, exist_ok=True)
         
-        chrome_options = Options()
-        chrome_options.add_argument(f'--user-data-dir={CHROME_PROFILE_USER}')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_argument('--disable-extensions')
-        chrome_options.add_argument('--disable-plugins')
-        chrome_options.add_argument('--disable-logging')
-        chrome_options.add_argument('--log-level=3')
-        chrome_options.add_argument('--silent')
-        chrome_options.add_argument('--disable-remote-fonts')
-        chrome_options.add_argument('--disable-web-security')
-        chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
+        # Headed, so a verification prompt can be answered by hand
+        chrome_options = build_chrome_options(CHROME_PROFILE_USER, PRESET_STANDARD)
+        # Show images again in case a scraping session left them blocked in this profile
+        apply_content_settings(chrome_options, [])
         
         # Suppress verbose logging
         logging.getLogger('selenium').setLevel(logging.ERROR)
         logging.getLogger('urllib3').setLevel(logging.ERROR)
         logging.getLogger('httpx').setLevel(logging.ERROR)
         
-        driver = webdriver.Chrome(options=chrome_options)
+        driver = launch_chrome(chrome_options, PRESET_STANDARD)
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         
         logger.info("Chrome driver initialized successfully for user monitoring profile")
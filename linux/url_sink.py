@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Streaming URL output
+URLs are appended to a per-run file as they are discovered, so a crash mid-scroll
+keeps what was found. Publishing renames the finished run into place atomically
+and appends its new URLs to a deduplicated cumulative file
+"""
+
+import glob
+import itertools
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Iterable, Optional, Set
+
+from config import URL_SINK_RUNS_DIR, URL_SINK_KEEP_RUNS, URL_SINK_CUMULATIVE
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PARTIAL_SUFFIX = '.partial'
+
+# Written lines reach the OS at least this often, so a killed process loses at most this much
+FLUSH_SECONDS = 2.0
+
+# Keeps run file names unique when runs start within the same second
+_run_numbers = itertools.count(1)
+
+
+class UrlSink:
+    """One output file fed run by run
+    
+    ``start_run`` (or the first ``add``) opens
+    ``<runs_dir>/<name>.<timestamp>.txt.partial``; ``add`` appends to it
+    through a buffered writer. ``publish`` renames it to
+    ``.txt``, atomically replaces ``path`` with a copy and appends URLs not
+    seen before to ``<name>.all.txt``. Only the newest ``keep_runs`` run files
+    are kept.
+    """
+    
+    def __init__(self, path: str, runs_dir: str = URL_SINK_RUNS_DIR, keep_runs: int = URL_SINK_KEEP_RUNS,
+                 cumulative: bool = URL_SINK_CUMULATIVE):
+        self.path = path if os.path.isabs(path) else os.path.join(PROJECT_DIR, path)
+        stem, extension = os.path.splitext(os.path.basename(self.path))
+        self.stem = stem
+        self.extension = extension or '.txt'
+        runs_dir = runs_dir or '.'
+        self.runs_dir = runs_dir if os.path.isabs(runs_dir) else os.path.join(os.path.dirname(self.path), runs_dir)
+        self.keep_runs = keep_runs
+        self.cumulative_path = os.path.join(os.path.dirname(self.path), f"{stem}.all{self.extension}") if cumulative else None
+        self._lock = threading.Lock()
+        self._file = None
+        self._run_path: Optional[str] = None
+        self._run_urls: Set[str] = set()
+        self._last_flush = 0.0
+        self.recover()
+    
+    @property
+    def count(self) -> int:
+        """URLs written in the current run"""
+        return len(self._run_urls)
+    
+    def start_run(self) -> str:
+        """Open a fresh run file, publishing any run still open"""
+        with self._lock:
+            if self._file is not None:
+                self._publish_locked()
+            return self._start_locked()
+    
+    def _start_locked(self) -> str:
+        os.makedirs(self.runs_dir, exist_ok=True)
+        stamp = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_run_numbers)}"
+        self._run_path = os.path.join(self.runs_dir, f"{self.stem}.{stamp}{self.extension}{PARTIAL_SUFFIX}")
+        self._file = open(self._run_path, 'a', encoding='utf-8', buffering=64 * 1024)
+        self._run_urls = set()
+        self._last_flush = time.monotonic()
+        return self._run_path
+    
+    def add(self, urls: Iterable[str]) -> int:
+        """Append URLs not yet in this run (opening one if needed); returns how many were new"""
+        with self._lock:
+            if self._file is None:
+                self._start_locked()
+            added = 0
+            for url in urls:
+                if url and url not in self._run_urls:
+                    self._run_urls.add(url)
+                    self._file.write(f"{url}\n")
+                    added += 1
+            if added and time.monotonic() - self._last_flush >= FLUSH_SECONDS:
+                self._file.flush()
+                self._last_flush = time.monotonic()
+            return added
+    
+    def publish(self) -> int:
+        """Finish the run and put it in place; returns the number of URLs it holds"""
+        with self._lock:
+            return self._publish_locked()
+    
+    def _publish_locked(self) -> int:
+        if self._file is None:
+            return 0
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        count = len(self._run_urls)
+        
+        run_path = self._run_path[:-len(PARTIAL_SUFFIX)]
+        os.replace(self._run_path, run_path)
+        # Copy then rename so readers never see a half-written output file; an empty run
+        # is published too, so the previous run's links never pass for current ones
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        shutil.copyfile(run_path, tmp_path)
+        os.replace(tmp_path, self.path)
+        if count:
+            self._append_cumulative(self._run_urls)
+        self._prune_runs()
+        logger.debug("Published %d URLs to %s (run file %s)", count, self.path, run_path)
+        return count
+    
+    def recover(self):
+        """Fold run files left by a process that died mid-run into the cumulative file"""
+        for partial in sorted(glob.glob(os.path.join(self.runs_dir, f"{self.stem}.*{self.extension}{PARTIAL_SUFFIX}"))):
+            try:
+                with open(partial, 'r', encoding='utf-8') as f:
+                    urls = [line.strip() for line in f if line.strip()]
+                run_path = partial[:-len(PARTIAL_SUFFIX)]
+                if os.path.exists(run_path):
+                    # Never overwrite a finished run; keep both sets of URLs in it
+                    with open(run_path, 'a', encoding='utf-8') as f:
+                        f.writelines(f"{url}\n" for url in urls)
+                    os.remove(partial)
+                else:
+                    os.replace(partial, run_path)
+                with self._lock:
+                    self._append_cumulative(urls)
+                logger.info(f"Recovered {len(urls)} URLs from interrupted run {os.path.basename(partial)}")
+            except Exception as e:
+                logger.warning(f"Could not recover interrupted run {partial}: {e}")
+    
+    def _append_cumulative(self, urls: Iterable[str]):
+        if not self.cumulative_path:
+            return
+        # Stream the file against this run's URLs instead of holding every URL ever seen in memory
+        new_urls = dict.fromkeys(url for url in urls if url)
+        if os.path.exists(self.cumulative_path):
+            with open(self.cumulative_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    new_urls.pop(line.strip(), None)
+                    if not new_urls:
+                        return
+        if not new_urls:
+            return
+        with open(self.cumulative_path, 'a', encoding='utf-8') as f:
+            f.writelines(f"{url}\n" for url in new_urls)
+    
+    def _prune_runs(self):
+        if not self.keep_runs:
+            return
+        runs = sorted(run for run in glob.glob(os.path.join(self.runs_dir, f"{self.stem}.*{self.extension}"))
+                      if run != self.cumulative_path)
+        for old_run in runs[:-self.keep_runs]:
+            try:
+                os.remove(old_run)
+            except OSError as e:
+                logger.debug("Could not remove old run file %s: %s", old_run, e)
+    
+    def close(self):
+        """Publish whatever the open run holds"""
+        try:
+            self.publish()
+        except Exception as e:
+            logger.error(f"Error publishing {self.path}: {e}")
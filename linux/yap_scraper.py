@@ -9,6 +9,8 @@ import os
 import time
 import sys
 import re
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError, wait as wait_futures
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Set, Optional
 from selenium import webdriver
@@ -24,6 +26,8 @@ from selenium.common.exceptions import (
 )
 from config import (
     MAX_TWEETS_TO_SCRAPE,
+    EXTRACTION_MODE,
+    BLOCKED_RESOURCES,
     YAP_SEARCH_KEYWORDS,
     YAP_FILTER_VERIFIED,
     YAP_FILTER_NATIVE_RETWEETS,
@@ -39,228 +43,366 @@ from config import (
     YAP_FILTER_IMAGES,
     YAP_FILTER_VIDEOS,
     YAP_SEARCH_SOURCE,
+    YAP_SCROLL_MIN_WAIT_SECONDS,
+    YAP_SCROLL_MAX_WAIT_SECONDS,
     CHROME_PROFILE_YAP,
-    CHROME_BINARY_PATH
+    YAP_CHROME_PRESET,
+    YAP_DEDUP,
+    YAP_DELIVERED_DB,
+    YAP_DELIVERED_MAX_ENTRIES,
+    YAP_DELIVERED_RETENTION_DAYS,
+    YAP_DELIVERED_STOP_ITERATIONS
 )
 import psutil
 import subprocess
-from robust_notifier import RobustTelegramNotifier
+from robust_notifier import get_notifier
+from profile_manager import get_profile_manager
+from chrome_launch import build_chrome_options, launch_chrome
+from resource_blocking import PageLoadStats, apply_content_settings, enable_resource_blocking
+from process_registry import get_registry
+from driver_instrumentation import get_tracer
+from metrics import get_metrics
+from batch_extractor import extract_page_tweets, mark_elements_seen, SEEN_ATTRIBUTE
+from scroll_engine import ScrollEngine
+from selector_strategy import get_selector_registry
+from url_sink import UrlSink
+from seen_store import SqliteSeenStore
+from network_capture import TimelineCapture, SEARCH_TIMELINE_OPERATIONS, enable_performance_logging, parse_timeline_tweets
 
 logger = logging.getLogger(__name__)
 
+YAP_URLS = get_metrics().counter('xscraper_yap_urls_total', 'Tweet URLs collected from the YAP search')
+YAP_REPEAT_URLS = get_metrics().counter('xscraper_yap_repeat_urls_total', 'YAP search results skipped because an earlier run delivered them')
+
+STATUS_ID_PATTERN = re.compile(r'/status/(\d+)')
+
+# How long a run waits for its links file to reach Telegram before moving on
+YAP_TELEGRAM_WAIT_SECONDS = 30
+
+# How long cleanup() waits for sends still in flight before closing the delivered index
+YAP_TELEGRAM_DRAIN_SECONDS = 120
+
+def build_yap_search_query() -> str:
+    """The YAP search query for the configured keywords and filters"""
+    query_parts = []
+    
+    # Add keywords (REQUIRED)
+    query_parts.append(YAP_SEARCH_KEYWORDS)
+    
+    # Add verification filter
+    if YAP_FILTER_VERIFIED:
+        query_parts.append("filter:blue_verified")
+    
+    # Add content type filters
+    if YAP_FILTER_NATIVE_RETWEETS:
+        query_parts.append("-filter:nativeretweets")
+    
+    if YAP_FILTER_RETWEETS:
+        query_parts.append("-filter:retweets")
+    
+    if YAP_FILTER_REPLIES:
+        query_parts.append("-filter:replies")
+    
+    # Add engagement filters
+    if YAP_MIN_REPLIES > 0:
+        query_parts.append(f"min_replies:{YAP_MIN_REPLIES}")
+    
+    if YAP_MIN_LIKES > 0:
+        query_parts.append(f"min_faves:{YAP_MIN_LIKES}")
+    
+    if YAP_MIN_RETWEETS > 0:
+        query_parts.append(f"min_retweets:{YAP_MIN_RETWEETS}")
+    
+    # Add language filter
+    if YAP_LANGUAGE:
+        query_parts.append(f"lang:{YAP_LANGUAGE}")
+    
+    # Add time window filter
+    if YAP_TIME_WINDOW > 0:
+        query_parts.append(f"within_time:{YAP_TIME_WINDOW}min")
+    
+    # Add additional filters
+    if YAP_FILTER_LINKS:
+        query_parts.append("filter:links")
+    
+    if YAP_FILTER_MEDIA:
+        query_parts.append("filter:media")
+    
+    if YAP_FILTER_IMAGES:
+        query_parts.append("filter:images")
+    
+    if YAP_FILTER_VIDEOS:
+        query_parts.append("filter:videos")
+    
+    # Join all parts with spaces
+    return " ".join(query_parts)
+
+
 class YapSearchScraper:
-    def __init__(self):
+    # Groups this scraper's WebDriver commands in the per-cycle trace summary
+    TRACE_OWNER = 'yap'
+    
+    def __init__(self, driver_pool=None, data_dir=None):
         self.driver = None
         self.project_dir = os.path.dirname(os.path.abspath(__file__))
+        # Where the delivered index and link files live (the fixture benchmark uses a temp dir)
+        self.data_dir = data_dir or self.project_dir
         
-        # Kill any existing Chrome processes for this project
-        self._kill_existing_chrome()
+        self.driver_pool = driver_pool
+        self.page_stats = PageLoadStats()
         
-        # Setup driver with unique profile
-        self.setup_driver()
-        self.output_file = 'yap_links.txt'
+        if self.driver_pool is None:
+            # Kill any existing Chrome processes for this project
+            self._kill_existing_chrome()
+            
+            # Setup driver with unique profile
+            self.setup_driver()
+        self.output_file = os.path.join(self.data_dir, 'yap_links.txt')
+        self.url_sink = UrlSink(self.output_file)
+        # Tweet ids earlier runs already delivered, so each run only sends new results
+        self.delivered = SqliteSeenStore(os.path.join(self.data_dir, YAP_DELIVERED_DB)) if YAP_DEDUP else None
+        # One future per send, resolved once its tweets are recorded; cleanup() waits for them
+        self._sends: List[Future] = []
+        self._delivered_lock = threading.Lock()
         
     def _kill_existing_chrome(self):
-        """Kill ALL Chrome processes to ensure clean environment"""
+        """Reap Chrome left behind by an earlier run of this project that crashed"""
         try:
-            logger.info("🔪 Killing ALL Chrome processes for clean environment...")
-            
-            killed_count = 0
-            
-            # Kill all Chrome and ChromeDriver processes
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    proc_name = proc.info['name']
-                    if proc_name and ('chrome' in proc_name.lower() or 'chromedriver' in proc_name.lower()):
-                        logger.info(f"Killing Chrome process: {proc.pid} ({proc_name})")
-                        proc.terminate()
-                        proc.wait(timeout=3)
-                        killed_count += 1
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.TimeoutExpired):
-                    try:
-                        # Force kill if terminate fails
-                        proc.kill()
-                        killed_count += 1
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        pass
-                except Exception as e:
-                    logger.warning(f"Error killing process {proc.pid}: {e}")
-            
-            # Also use system commands for extra cleanup
-            try:
-                import subprocess
-                # Kill Chrome processes using system commands
-                subprocess.run(['pkill', '-f', 'chrome'], capture_output=True, timeout=5)
-                subprocess.run(['pkill', '-f', 'chromedriver'], capture_output=True, timeout=5)
-                subprocess.run(['pkill', '-f', 'google-chrome'], capture_output=True, timeout=5)
-            except Exception as e:
-                logger.warning(f"Error using system commands to kill Chrome: {e}")
-            
-            # Wait for processes to fully terminate
-            time.sleep(3)
-            
-            logger.info(f"✅ Killed {killed_count} Chrome processes")
+            # Only browsers recorded by a dead owner are touched, never a sibling service's
+            reaped = get_registry().reap_orphans()
+            logger.info(f"✅ Reaped {reaped} orphaned Chrome processes")
                     
         except Exception as e:
             logger.warning(f"Error killing existing Chrome processes: {e}")
     
     def setup_driver(self):
         """Setup Chrome driver with unique YAP profile directory"""
+        self.driver = self.create_driver()
+    
+    @staticmethod
+    def create_driver(blocked_resources=BLOCKED_RESOURCES, performance_log=EXTRACTION_MODE == 'network'):
+        """Launch a Chrome driver on the logged-in YAP profile (or a clone of it)"""
         try:
-            import uuid
-            
-            # Create unique profile directory in /tmp for this instance
-            unique_profile = f"/tmp/chrome_profile_yap_{uuid.uuid4().hex[:8]}"
-            profile_dir = unique_profile
-            
-            # Ensure the directory exists
-            os.makedirs(profile_dir, exist_ok=True)
-            
-            chrome_options = webdriver.ChromeOptions()
-            chrome_options.binary_location = CHROME_BINARY_PATH
-            chrome_options.add_argument(f'--user-data-dir={profile_dir}')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-plugins')
-            chrome_options.add_argument('--disable-logging')
-            chrome_options.add_argument('--log-level=3')
-            chrome_options.add_argument('--silent')
-            chrome_options.add_argument('--disable-remote-fonts')
-            chrome_options.add_argument('--disable-web-security')
-            chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-            chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
+            # The YAP profile itself, or a clone of it when CHROME_PROFILE_CLONES is on
+            profile_dir = get_profile_manager().checkout('yap', CHROME_PROFILE_YAP)
+            
+            chrome_options = build_chrome_options(profile_dir, YAP_CHROME_PRESET)
+            
+            # Network extraction reads timeline responses from the DevTools performance log
+            if performance_log:
+                enable_performance_logging(chrome_options)
+            
+            # Skip the images, video, fonts and analytics a scraper never reads
+            apply_content_settings(chrome_options, blocked_resources)
             
             # Suppress verbose logging
             logging.getLogger('selenium').setLevel(logging.ERROR)
             logging.getLogger('urllib3').setLevel(logging.ERROR)
             logging.getLogger('httpx').setLevel(logging.ERROR)
             
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver = launch_chrome(chrome_options, YAP_CHROME_PRESET)
+            # Record the chromedriver/Chrome PID tree so teardown reaps only this browser
+            get_registry().register(driver, owner='yap')
+            get_profile_manager().attach(driver, profile_dir)
+            get_tracer().instrument(driver)
+            enable_resource_blocking(driver, blocked_resources)
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
-            logger.info(f"Chrome driver initialized successfully with unique profile: {profile_dir}")
+            logger.info(f"Chrome driver initialized successfully with profile: {profile_dir}")
+            
+            return driver
             
         except Exception as e:
             logger.error(f"Failed to setup Chrome driver: {e}")
             raise
     
-    def clear_output_file(self):
-        """Clear the output file contents"""
+    def _was_delivered(self, url: str) -> bool:
+        """Whether an earlier run already sent this tweet (keyed by tweet id)"""
+        delivered = self.delivered
+        if delivered is None:
+            return False
+        match = STATUS_ID_PATTERN.search(url)
+        return bool(match) and match.group(1) in delivered
+    
+    def _mark_delivered(self, urls):
+        """Record sent tweets and keep the index within its age and size bounds"""
+        # Called from the Telegram delivery thread; the lock keeps cleanup() from closing the index mid-write
+        with self._delivered_lock:
+            if self.delivered is None:
+                return
+            try:
+                for url in urls:
+                    match = STATUS_ID_PATTERN.search(url)
+                    if match:
+                        self.delivered.add(match.group(1))
+                self.delivered.flush()
+                self.delivered.prune(YAP_DELIVERED_RETENTION_DAYS)
+                self.delivered.trim(YAP_DELIVERED_MAX_ENTRIES)
+            except Exception as e:
+                logger.error(f"Error recording delivered YAP tweets: {e}")
+    
+    def _close_delivered(self):
+        """Let in-flight sends record their tweets, then close the delivered index"""
+        pending = [future for future in self._sends if not future.done()]
+        if pending:
+            logger.info(f"Waiting up to {YAP_TELEGRAM_DRAIN_SECONDS}s for {len(pending)} YAP links file(s) still queued for Telegram")
+            _, not_done = wait_futures(pending, timeout=YAP_TELEGRAM_DRAIN_SECONDS)
+            if not_done:
+                logger.warning(f"{len(not_done)} YAP links file(s) not sent before shutdown; their tweets will be sent again next run")
+        with self._delivered_lock:
+            if self.delivered is not None:
+                self.delivered.close()
+                self.delivered = None
+    
+    def start_output_run(self):
+        """Open a fresh run file that URLs are streamed to while scrolling"""
         try:
-            # Get absolute path for the output file
-            import os
-            project_dir = os.path.dirname(os.path.abspath(__file__))
-            output_path = os.path.join(project_dir, self.output_file)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write('')  # Clear file contents
-            logger.info(f"Cleared {output_path}")
+            run_path = self.url_sink.start_run()
+            logger.info(f"Streaming URLs to {run_path}")
         except Exception as e:
-            logger.error(f"Error clearing output file: {e}")
+            logger.error(f"Error starting output run: {e}")
     
     def save_tweet_urls(self, urls):
-        """Save tweet URLs to file"""
+        """Publish the streamed run as yap_links.txt and send it"""
         try:
-            project_dir = os.path.dirname(os.path.abspath(__file__))
-            output_file = os.path.join(project_dir, 'yap_links.txt')
+            # Already streamed while scrolling; this only catches URLs found some other way
+            self.url_sink.add(urls)
+            url_count = self.url_sink.publish()
+            output_file = self.url_sink.path
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                for url in urls:
-                    f.write(f"{url}\n")
+            logger.info(f"Saved {url_count} tweet URLs to {output_file}")
             
-            logger.info(f"Saved {len(urls)} tweet URLs to {output_file}")
-            
-            # Send file to Telegram
-            self.send_yap_links_to_telegram(output_file, len(urls))
+            # Send file to Telegram; only a delivered file keeps its tweets out of later runs
+            self.send_yap_links_to_telegram(output_file, url_count, urls)
             
         except Exception as e:
             logger.error(f"Error saving tweet URLs: {e}")
 
-    def send_yap_links_to_telegram(self, file_path, url_count):
-        """Send YAP links file to Telegram"""
+    def send_yap_links_to_telegram(self, file_path, url_count, urls=()):
+        """Send YAP links file to Telegram; returns whether it was delivered in time
+        
+        ``urls`` are recorded as delivered once Telegram accepts the file, even
+        if that happens after this call has stopped waiting.
+        """
         try:
             if not os.path.exists(file_path):
                 logger.warning(f"File {file_path} does not exist, skipping Telegram send")
-                return
+                return False
             
-            # Check if file has content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if not content:
-                    logger.warning("File is empty, skipping Telegram send")
-                    return
+            if not url_count:
+                logger.warning("No URLs in file, skipping Telegram send")
+                return False
             
             # Initialize Telegram notifier
-            notifier = RobustTelegramNotifier()
+            notifier = get_notifier()
             
             # Send file with caption
             caption = f"🔗 YAP Search Results\n\n📊 Found {url_count} tweet URLs\n📅 {time.strftime('%Y-%m-%d %H:%M:%S')}"
             
-            success = notifier.send_document(file_path, caption)
+            future = notifier.send_document_async(file_path, caption)
+            # Runs on the delivery worker, so a send still retrying when the wait below ends is recorded too
+            # A future of its own resolves only after the callback finished, which is what cleanup() must wait for
+            recorded = Future()
+            future.add_done_callback(lambda done: self._on_links_sent(done, url_count, urls, recorded))
+            self._sends = [send for send in self._sends if not send.done()] + [recorded]
             
-            if success:
-                logger.info(f"✅ Successfully sent YAP links file to Telegram ({url_count} URLs)")
-            else:
-                logger.error("❌ Failed to send YAP links file to Telegram")
+            try:
+                return future.result(timeout=YAP_TELEGRAM_WAIT_SECONDS)
+            except FutureTimeoutError:
+                logger.warning(f"YAP links file still queued for Telegram after {YAP_TELEGRAM_WAIT_SECONDS}s; it will be recorded once sent")
+                return False
                 
         except Exception as e:
             logger.error(f"Error sending YAP links to Telegram: {e}")
+            return False
+    
+    def _on_links_sent(self, future, url_count, urls, recorded: Future):
+        try:
+            if future.cancelled() or not future.result():
+                logger.error("❌ Failed to send YAP links file to Telegram")
+                return
+            logger.info(f"✅ Successfully sent YAP links file to Telegram ({url_count} URLs)")
+            self._mark_delivered(urls)
+        finally:
+            recorded.set_result(None)
     
     def get_yap_search_tweets(self):
         """Get tweets from YAP search query"""
         try:
-            # Build search query from config
-            search_query = self._build_yap_search_query()
-            
-            # Navigate to search page
-            base_url = "https://x.com/search"
-            query_params = {
-                'q': search_query,
-                'src': YAP_SEARCH_SOURCE
-            }
+            search_url = self._build_search_url()
             
-            from urllib.parse import urlencode
-            search_url = f"{base_url}?{urlencode(query_params)}"
+            capture = None
+            if EXTRACTION_MODE == 'network':
+                capture = TimelineCapture(self.driver, SEARCH_TIMELINE_OPERATIONS)
+                capture.drain()
             
             logger.info(f"Navigating to YAP search: {search_url}")
+            load_start = time.monotonic()
             self.driver.get(search_url)
             
             # Wait for tweets to load
             WebDriverWait(self.driver, 30).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="tweet"]'))
             )
-            
-            # Wait 10 seconds for initial content to load
-            logger.info("Waiting 10 seconds for initial content to load...")
-            time.sleep(10)
+            self.page_stats.record(self.driver, time.monotonic() - load_start)
+            self.page_stats.log_summary("Search page loads")
+            
+            # Wait for the initial render to settle (returns as soon as the DOM goes quiet)
+            scroll_engine = ScrollEngine(
+                self.driver,
+                min_timeout=YAP_SCROLL_MIN_WAIT_SECONDS,
+                max_timeout=YAP_SCROLL_MAX_WAIT_SECONDS
+            )
+            scroll_engine.start()
+            settle = scroll_engine.settle()
+            logger.info(f"Initial content settled in {settle.waited:.2f}s ({settle.reason})")
             
             # Start with initial extraction
             all_urls = []
             seen_urls = set()
-            scroll_count = 0
             max_scrolls = 15  # Increased scroll iterations
             no_new_urls_count = 0
+            delivered_only_count = 0
+            total_extract_time = 0.0
             
             logger.info(f"Starting extraction with up to {max_scrolls} scroll iterations...")
             
             for scroll_iteration in range(max_scrolls):
                 logger.info(f"Scroll iteration {scroll_iteration + 1}/{max_scrolls}")
                 
-                # Extract URLs from current page
-                current_urls = self._extract_urls_from_current_page()
+                # Extract URLs from captured SearchTimeline responses, else from the current page
+                extract_start = time.monotonic()
+                current_urls = self._extract_urls_from_network(capture) if capture is not None else []
+                if not current_urls:
+                    current_urls = self._extract_urls_from_current_page()
+                extract_time = time.monotonic() - extract_start
+                total_extract_time += extract_time
                 new_urls = []
                 
-                # Find new URLs
+                # Find new URLs, leaving out tweets an earlier run already delivered
+                repeats = 0
                 for url in current_urls:
                     if url not in seen_urls:
-                        new_urls.append(url)
                         seen_urls.add(url)
+                        if self._was_delivered(url):
+                            repeats += 1
+                        else:
+                            new_urls.append(url)
+                if repeats:
+                    YAP_REPEAT_URLS.inc(repeats)
+                
+                # Results are ranked, not chronological, so one repeat is no signal; scrolls of nothing but repeats are
+                if repeats and not new_urls:
+                    delivered_only_count += 1
+                    if delivered_only_count >= YAP_DELIVERED_STOP_ITERATIONS:
+                        logger.info(f"Only previously delivered tweets for {delivered_only_count} iterations, stopping")
+                        break
+                elif new_urls:
+                    delivered_only_count = 0
                 
                 if new_urls:
                     all_urls.extend(new_urls)
+                    self.url_sink.add(new_urls)
                     logger.info(f"Found {len(new_urls)} new URLs in iteration {scroll_iteration + 1}. Total: {len(all_urls)}")
                     no_new_urls_count = 0  # Reset counter
                 else:
@@ -279,13 +421,17 @@ class YapSearchScraper:
                 
                 # Scroll down for next iteration
                 if scroll_iteration < max_scrolls - 1:  # Don't scroll on last iteration
-                    logger.info("Scrolling down to load more tweets...")
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(5)  # Wait for new content to load
+                    result = scroll_engine.scroll_and_wait()
+                    logger.info(f"Iteration {scroll_iteration + 1}: extracted in {extract_time:.2f}s, "
+                                f"waited {result.waited:.2f}s for new content ({result.reason}, "
+                                f"next timeout {scroll_engine.timeout:.1f}s)")
                     
-                    # Wait for new content to appear
-                    self._wait_for_new_content()
+                    # Stop as soon as scrolling no longer renders new tweets
+                    if scroll_engine.plateaued:
+                        logger.info(f"Article count plateaued at {result.added}, stopping")
+                        break
             
+            logger.info(f"Scroll timing: {scroll_engine.total_wait:.2f}s waiting, {total_extract_time:.2f}s extracting")
             logger.info(f"Extraction completed. Total unique URLs found: {len(all_urls)}")
             return all_urls
                 
@@ -295,37 +441,54 @@ class YapSearchScraper:
 
     def _extract_urls_from_current_page(self):
         """Extract tweet URLs from the current page"""
+        if EXTRACTION_MODE in ('batch', 'network'):
+            urls = self._extract_urls_batch()
+            if urls is not None:
+                return urls
+        
+        return self._extract_urls_per_element()
+    
+    def _extract_urls_per_element(self):
+        """Extract tweet URLs element by element (several round trips per tweet)"""
         urls = []
         
         try:
-            # Find all tweet elements
-            tweet_elements = self._find_tweet_elements_enhanced()
+            # Find tweet elements not processed by an earlier scroll iteration
+            tweet_elements = self._find_tweet_elements_enhanced(unseen_only=True)
             
             if not tweet_elements:
-                logger.warning("No tweet elements found on page")
+                logger.info("No new tweet elements rendered since the last iteration")
                 return urls
             
-            logger.info(f"Found {len(tweet_elements)} tweet elements on page")
+            logger.info(f"Found {len(tweet_elements)} new tweet elements on page")
             
             # Extract URLs from each tweet
+            processed = []
             for i, tweet in enumerate(tweet_elements[:MAX_TWEETS_TO_SCRAPE]):
+                processed.append(tweet)
                 try:
                     url = self._extract_tweet_url(tweet)
                     if url and url not in urls:
                         urls.append(url)
-                        logger.info(f"Extracted URL {len(urls)}: {url}")
+                        logger.debug("Extracted URL %d: %s", len(urls), url)
                         
                         if len(urls) >= MAX_TWEETS_TO_SCRAPE:
                             logger.info(f"Reached target of {MAX_TWEETS_TO_SCRAPE} URLs")
                             break
                             
                 except StaleElementReferenceException:
-                    logger.warning(f"Tweet element {i} became stale, skipping")
+                    logger.debug("Tweet element %d became stale, skipping", i)
                     continue
                 except Exception as e:
-                    logger.warning(f"Error extracting URL from tweet {i}: {e}")
+                    logger.warning("Error extracting URL from tweet %d: %s", i, e)
                     continue
             
+            # Stamp processed articles so the next iteration only touches newly rendered ones
+            try:
+                mark_elements_seen(self.driver, processed)
+            except Exception as e:
+                logger.debug("Could not mark processed tweet elements: %s", e)
+            
             logger.info(f"Successfully extracted {len(urls)} unique URLs")
             return urls
             
@@ -333,66 +496,64 @@ class YapSearchScraper:
             logger.error(f"Error extracting URLs from current page: {e}")
             return urls
     
+    def _extract_urls_from_network(self, capture):
+        """Extract tweet URLs from SearchTimeline responses captured since the last call"""
+        try:
+            extract_start = time.monotonic()
+            urls = []
+            for payload in capture.collect():
+                for tweet in parse_timeline_tweets(payload):
+                    author = tweet['username'] or 'i'
+                    url = f"https://x.com/{author}/status/{tweet['id']}"
+                    if url not in urls:
+                        urls.append(url)
+            elapsed = time.monotonic() - extract_start
+            logger.info(f"Extracted {len(urls)} URLs from SearchTimeline responses in {elapsed:.2f}s (network mode)")
+            return urls
+        except Exception as e:
+            logger.warning(f"Network extraction failed, falling back to DOM extraction: {e}")
+            return []
+    
+    def _extract_urls_batch(self):
+        """Extract tweet URLs from newly rendered tweets with a single execute_script call
+        
+        Returns None when the per-element path should be tried instead.
+        """
+        try:
+            extract_start = time.monotonic()
+            records = extract_page_tweets(self.driver, MAX_TWEETS_TO_SCRAPE, incremental=True)
+            urls = []
+            for record in records:
+                url = record.get('url')
+                if url and url not in urls:
+                    urls.append(url)
+            elapsed = time.monotonic() - extract_start
+            logger.info(f"Extracted {len(urls)} unique URLs from {len(records)} newly rendered tweets in {elapsed:.2f}s (batch mode)")
+            if records and not urls:
+                return None
+            return urls
+        except Exception as e:
+            logger.warning(f"Batch extraction failed, falling back to per-element: {e}")
+            return None
+    
+    def _build_search_url(self) -> str:
+        """Search page URL for the configured YAP query"""
+        from urllib.parse import urlencode
+        query_params = {
+            'q': self._build_yap_search_query(),
+            'src': YAP_SEARCH_SOURCE
+        }
+        return f"https://x.com/search?{urlencode(query_params)}"
+    
     def _build_yap_search_query(self) -> str:
         """Build the YAP search query using configurable parameters"""
-        query_parts = []
-        
-        # Add keywords (REQUIRED)
-        query_parts.append(YAP_SEARCH_KEYWORDS)
-        
-        # Add verification filter
-        if YAP_FILTER_VERIFIED:
-            query_parts.append("filter:blue_verified")
-        
-        # Add content type filters
-        if YAP_FILTER_NATIVE_RETWEETS:
-            query_parts.append("-filter:nativeretweets")
-        
-        if YAP_FILTER_RETWEETS:
-            query_parts.append("-filter:retweets")
-        
-        if YAP_FILTER_REPLIES:
-            query_parts.append("-filter:replies")
-        
-        # Add engagement filters
-        if YAP_MIN_REPLIES > 0:
-            query_parts.append(f"min_replies:{YAP_MIN_REPLIES}")
-        
-        if YAP_MIN_LIKES > 0:
-            query_parts.append(f"min_faves:{YAP_MIN_LIKES}")
-        
-        if YAP_MIN_RETWEETS > 0:
-            query_parts.append(f"min_retweets:{YAP_MIN_RETWEETS}")
-        
-        # Add language filter
-        if YAP_LANGUAGE:
-            query_parts.append(f"lang:{YAP_LANGUAGE}")
-        
-        # Add time window filter
-        if YAP_TIME_WINDOW > 0:
-            query_parts.append(f"within_time:{YAP_TIME_WINDOW}min")
-        
-        # Add additional filters
-        if YAP_FILTER_LINKS:
-            query_parts.append("filter:links")
-        
-        if YAP_FILTER_MEDIA:
-            query_parts.append("filter:media")
-        
-        if YAP_FILTER_IMAGES:
-            query_parts.append("filter:images")
-        
-        if YAP_FILTER_VIDEOS:
-            query_parts.append("filter:videos")
-        
-        # Join all parts with spaces
-        final_query = " ".join(query_parts)
+        final_query = build_yap_search_query()
         
         logger.info(f"Built search query: {final_query}")
         return final_query
     
-    def _find_tweet_elements_enhanced(self):
-        """Find tweet elements using multiple selectors"""
+    def _find_tweet_elements_enhanced(self, unseen_only=False):
+        """Find tweet elements using multiple selectors, optionally skipping already processed ones"""
         selectors = [
             '[data-testid="tweet"]',
             'article[data-testid="tweet"]',
@@ -401,15 +562,15 @@ class YapSearchScraper:
             'div[role="article"]'
         ]
         
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    logger.info(f"Found {len(elements)} tweet elements using selector: {selector}")
-                    return elements
-            except Exception as e:
-                logger.warning(f"Selector {selector} failed: {e}")
-                continue
+        # Statistics are kept per base selector whether or not processed articles are excluded
+        suffix = f":not([{SEEN_ATTRIBUTE}])" if unseen_only else ''
+        selector, elements = get_selector_registry().find(
+            'yap.tweet_elements', selectors,
+            lambda selector: self.driver.find_elements(By.CSS_SELECTOR, selector + suffix)
+        )
+        if elements:
+            logger.info(f"Found {len(elements)} tweet elements using selector: {selector}{suffix}")
+            return elements
         
         logger.warning("No tweet elements found with any selector")
         return []
@@ -425,14 +586,13 @@ class YapSearchScraper:
                 'a[href*="twitter.com/status/"]'
             ]
             
-            for selector in link_selectors:
-                try:
-                    link = tweet_element.find_element(By.CSS_SELECTOR, selector)
-                    href = link.get_attribute('href')
-                    if href and '/status/' in href:
-                        return href
-                except:
-                    continue
+            def status_href(selector):
+                href = tweet_element.find_element(By.CSS_SELECTOR, selector).get_attribute('href')
+                return href if href and '/status/' in href else None
+            
+            _, href = get_selector_registry().find('yap.tweet_url', link_selectors, status_href)
+            if href:
+                return href
             
             # Fallback: try to construct URL from tweet ID
             try:
@@ -445,7 +605,7 @@ class YapSearchScraper:
             return None
             
         except Exception as e:
-            logger.warning(f"Error extracting tweet URL: {e}")
+            logger.warning("Error extracting tweet URL: %s", e)
             return None
     
     def run_yap_scraper(self):
@@ -453,30 +613,52 @@ class YapSearchScraper:
         try:
             logger.info("Starting YAP search scraper...")
             
-            # Clear output file
-            self.clear_output_file()
+            # Stream this run's URLs to a new run file; yap_links.txt keeps the last run until published
+            self.start_output_run()
             
             # Get tweet URLs
             urls = self.get_yap_search_tweets()
+            get_tracer().log_summary(self.TRACE_OWNER, "YAP search WebDriver commands")
+            get_selector_registry().save()
             
             if urls:
                 logger.info(f"Found {len(urls)} tweet URLs")
+                YAP_URLS.inc(len(urls))
                 self.save_tweet_urls(urls)
                 return True
             else:
-                logger.warning("No tweet URLs found")
+                logger.warning("No new tweet URLs found")
+                self.url_sink.publish()
                 return False
                 
         except Exception as e:
             logger.error(f"Error in YAP scraper: {e}")
             return False
     
+    def acquire_driver(self):
+        """Take a warm driver from the pool for the next check"""
+        if self.driver_pool is not None and self.driver is None:
+            self.driver = self.driver_pool.acquire()
+    
+    def release_driver(self, failed=False):
+        """Hand the driver back to the pool, discarding it if the check failed"""
+        if self.driver_pool is None or self.driver is None:
+            return
+        try:
+            if failed:
+                self.driver_pool.invalidate(self.driver)
+            else:
+                self.driver_pool.release(self.driver)
+        finally:
+            self.driver = None
+    
     def quit_chrome_after_task(self):
         """Quit Chrome after completing a task"""
         try:
             if self.driver:
                 logger.info("Quitting Chrome after task completion...")
                 self.driver.quit()
+                get_registry().reap(self.driver)
                 self.driver = None
                 logger.info("Chrome quit successfully")
         except Exception as e:
@@ -496,8 +678,15 @@ class YapSearchScraper:
     def cleanup(self):
         """Clean up resources"""
         try:
-            if self.driver:
+            get_selector_registry().save(force=True)
+            self.url_sink.close()
+            self._close_delivered()
+            
+            if self.driver and self.driver_pool is not None:
+                self.release_driver(failed=True)
+            elif self.driver:
                 self.driver.quit()
+                get_registry().reap(self.driver)
                 self.driver = None
                 logger.info("Chrome driver quit successfully")
             
@@ -508,66 +697,22 @@ class YapSearchScraper:
             logger.error(f"Error during cleanup: {e}")
     
     def _cleanup_tmp_profiles(self):
-        """Clean up Chrome profile directories in /tmp"""
+        """Remove the profile clones this process made for YAP browsers"""
         try:
-            import glob
-            import shutil
-            
-            # Find and remove Chrome profile directories in /tmp
-            tmp_profiles = glob.glob("/tmp/chrome_profile_*")
-            for profile in tmp_profiles:
-                try:
-                    if os.path.isdir(profile):
-                        shutil.rmtree(profile)
-                        logger.info(f"Cleaned up profile: {profile}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean up profile {profile}: {e}")
+            # Only our own clones; a sibling service's profiles are left alone
+            get_profile_manager().remove_all('yap')
                     
         except Exception as e:
-            logger.warning(f"Error cleaning up /tmp profiles: {e}")
+            logger.warning(f"Error cleaning up profile clones: {e}")
     
     def _force_kill_chrome(self):
-        """Force kill Chrome processes if normal cleanup fails"""
+        """Reap this scraper's Chrome process tree if normal cleanup fails"""
         try:
-            logger.info("Force killing Chrome processes...")
-            
-            # Kill Chrome processes on Windows
-            if os.name == 'nt':
-                subprocess.run(['taskkill', '/f', '/im', 'chrome.exe'], 
-                             capture_output=True, timeout=10)
-                subprocess.run(['taskkill', '/f', '/im', 'chromedriver.exe'], 
-                             capture_output=True, timeout=10)
-            else:
-                # Kill Chrome processes on Unix-like systems
-                subprocess.run(['pkill', '-f', 'chrome'], 
-                             capture_output=True, timeout=10)
-                subprocess.run(['pkill', '-f', 'chromedriver'], 
-                             capture_output=True, timeout=10)
+            if self.driver:
+                logger.info("Force killing Chrome processes...")
+                reaped = get_registry().reap(self.driver)
+                self.driver = None
+                logger.info(f"Reaped {reaped} Chrome processes")
                 
         except Exception as e:
-            logger.error(f"Error force killing Chrome: {e}") 
-
-    def _wait_for_new_content(self):
-        """Wait for new content to load after scrolling"""
-        try:
-            # Wait for loading indicators to disappear
-            loading_selectors = [
-                '[data-testid="loading"]',
-                '.loading',
-                '[aria-label*="Loading"]',
-                '[data-testid="spinner"]'
-            ]
-            
-            for selector in loading_selectors:
-                try:
-                    WebDriverWait(self.driver, 3).until_not(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                except TimeoutException:
-                    pass  # No loading indicator found
-            
-            # Wait a bit more for content to settle
-            time.sleep(2)
-            
-        except Exception as e:
-            logger.debug(f"Error waiting for new content: {e}") 
\ No newline at end of file
+            logger.error(f"Error force killing Chrome: {e}")
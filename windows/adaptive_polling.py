@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Adaptive per-user polling
+Estimates how often each monitored account posts from the seen-tweet store and
+polls busy accounts more often than quiet ones, within interval bounds and a
+global budget of profile page loads per hour
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from config import (
+    CHECK_INTERVAL_MINUTES,
+    USER_POLLING,
+    POLL_MIN_INTERVAL_MINUTES,
+    POLL_MAX_INTERVAL_MINUTES,
+    POLL_PAGE_BUDGET_PER_HOUR,
+    POLL_RATE_WINDOW_DAYS,
+    POLL_TARGET_POSTS_PER_CHECK
+)
+from metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+POLLING_FIXED = 'fixed'
+POLLING_ADAPTIVE = 'adaptive'
+
+# Tweets are only notified when newer than this, however often an account is polled
+MIN_RECENCY_WINDOW = 3600
+
+POLL_INTERVAL_SECONDS = get_metrics().gauge('xscraper_poll_interval_seconds', 'Current adaptive polling interval per monitored user', ['user'])
+
+
+def user_check_interval() -> float:
+    """Seconds between scheduled user-check ticks for the configured polling mode"""
+    if USER_POLLING == POLLING_ADAPTIVE:
+        return POLL_MIN_INTERVAL_MINUTES * 60
+    return CHECK_INTERVAL_MINUTES * 60
+
+
+class PollingPlanner:
+    """Decides which users are due on each tick
+    
+    Each user's interval is ``target_posts`` divided by their posting rate over
+    the last ``window`` seconds, clamped to [min_interval, max_interval].
+    When the intervals together would exceed ``hourly_budget`` page loads, they
+    are stretched evenly. Each tick is also capped by the page loads left in
+    the trailing hour, and the most overdue users go first.
+    """
+    
+    def __init__(self, min_interval: float = POLL_MIN_INTERVAL_MINUTES * 60,
+                 max_interval: float = POLL_MAX_INTERVAL_MINUTES * 60,
+                 hourly_budget: int = POLL_PAGE_BUDGET_PER_HOUR,
+                 window: float = POLL_RATE_WINDOW_DAYS * 86400,
+                 target_posts: float = POLL_TARGET_POSTS_PER_CHECK):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.hourly_budget = hourly_budget
+        self.window = window
+        self.target_posts = target_posts
+        self._lock = threading.Lock()
+        self._intervals: Dict[str, float] = {}
+        self._rates: Dict[str, float] = {}
+        self._last_checked: Dict[str, float] = {}
+        self._loads = deque()
+        logger.warning(f"Adaptive polling replaces CHECK_INTERVAL_MINUTES ({CHECK_INTERVAL_MINUTES:g}): users are checked "
+                       f"every {self.min_interval / 60:g}-{self.max_interval / 60:g} minutes, at most {hourly_budget or 'unlimited'} page loads/hour")
+    
+    def refresh(self, store, usernames: Iterable[str]):
+        """Recompute every user's interval from posts first seen within the window"""
+        usernames = list(usernames)
+        try:
+            counts = store.post_counts(time.time() - self.window)
+        except Exception as e:
+            logger.warning(f"Could not read posting rates from the seen store: {e}")
+            return
+        
+        hours = self.window / 3600
+        intervals = {}
+        rates = {}
+        for username in usernames:
+            rate = counts.get(username, 0) / hours
+            rates[username] = rate
+            interval = self.target_posts * 3600 / rate if rate else self.max_interval
+            intervals[username] = min(max(interval, self.min_interval), self.max_interval)
+        
+        # Stretch every interval evenly when they add up to more loads than the budget allows
+        loads_per_hour = sum(3600 / interval for interval in intervals.values())
+        if self.hourly_budget and loads_per_hour > self.hourly_budget:
+            scale = loads_per_hour / self.hourly_budget
+            intervals = {username: interval * scale for username, interval in intervals.items()}
+        
+        with self._lock:
+            self._intervals = intervals
+            self._rates = rates
+        for username, interval in intervals.items():
+            POLL_INTERVAL_SECONDS.set(interval, user=username)
+    
+    def interval(self, username: str) -> float:
+        with self._lock:
+            return self._intervals.get(username, self.min_interval)
+    
+    def due_users(self, usernames: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """Users whose interval has elapsed, most overdue first, within the hourly budget"""
+        now = time.time() if now is None else now
+        with self._lock:
+            while self._loads and self._loads[0] <= now - 3600:
+                self._loads.popleft()
+            overdue = []
+            for username in usernames:
+                last = self._last_checked.get(username)
+                if last is None:
+                    overdue.append((float('inf'), username))
+                    continue
+                late = (now - last) / self._intervals.get(username, self.min_interval)
+                # A little slack so a user due a few seconds after the tick is not pushed a whole tick later
+                if late >= 0.95:
+                    overdue.append((late, username))
+            overdue.sort(key=lambda item: item[0], reverse=True)
+            remaining = self.hourly_budget - len(self._loads) if self.hourly_budget else len(overdue)
+            return [username for _, username in overdue[:max(remaining, 0)]]
+    
+    def record_check(self, username: str, checked_at: Optional[float] = None):
+        checked_at = time.time() if checked_at is None else checked_at
+        with self._lock:
+            self._last_checked[username] = checked_at
+            self._loads.append(checked_at)
+    
+    def recency_window(self, username: str, now: Optional[float] = None) -> float:
+        """How old a tweet may be and still be new to us: at least the time since the last check"""
+        now = time.time() if now is None else now
+        with self._lock:
+            last = self._last_checked.get(username)
+        if last is None:
+            return MIN_RECENCY_WINDOW
+        return max(MIN_RECENCY_WINDOW, now - last + self.min_interval)
+    
+    def log_summary(self):
+        with self._lock:
+            if not self._intervals:
+                return
+            ranked = sorted(self._intervals.items(), key=lambda item: item[1])
+            loads_per_hour = sum(3600 / interval for interval in self._intervals.values())
+            rates = dict(self._rates)
+        hottest = ', '.join(f"@{username} {interval / 60:.0f}m ({rates.get(username, 0) * 24:.1f}/day)"
+                            for username, interval in ranked[:3])
+        logger.info(f"📅 Adaptive polling: {len(ranked)} users, ~{loads_per_hour:.0f} page loads/hour "
+                    f"(budget {self.hourly_budget}); most frequent: {hottest}")
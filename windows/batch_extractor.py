@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Batch DOM extraction
+Walks every rendered tweet article in a single execute_script call instead of
+issuing several WebDriver round trips per tweet
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from snowflake import resolve_created_at, resolve_many
+
+logger = logging.getLogger(__name__)
+
+# Attribute stamped on articles already returned by an incremental extraction
+SEEN_ATTRIBUTE = 'data-xs-seen'
+
+# Runs inside the page and returns one plain object per tweet article.
+# Mirrors the selectors used by the per-element extraction path. In incremental
+# mode each returned article is stamped with its tweet id, and articles already
+# stamped with the same id are skipped on later calls.
+BATCH_EXTRACT_JS = """
+const limit = arguments[0] || 0;
+const incremental = !!arguments[1];
+const articles = document.querySelectorAll('[data-testid="tweet"]');
+const results = [];
+const pickText = (article) => {
+    const main = article.querySelector('div[data-testid="tweetText"]');
+    if (main && main.innerText.trim().length > 10) {
+        return main.innerText.trim();
+    }
+    for (const el of article.querySelectorAll('div[lang], div[dir="ltr"], span[dir="ltr"]')) {
+        const text = el.innerText.trim();
+        if (text.length > 10) {
+            return text;
+        }
+    }
+    for (const line of article.innerText.split('\\n')) {
+        const text = line.trim();
+        if (text.length > 10 && !text.startsWith('@') && !text.startsWith('#')) {
+            return text;
+        }
+    }
+    return '';
+};
+for (const article of articles) {
+    const timeEl = article.querySelector('time');
+    let link = timeEl ? timeEl.closest('a[href*="/status/"]') : null;
+    if (!link) {
+        link = article.querySelector('a[href*="/status/"]');
+    }
+    const href = link ? link.href : '';
+    const match = href.match(/\\/status\\/(\\d+)/);
+    if (incremental) {
+        const stamp = match ? match[1] : 'none';
+        if (article.getAttribute('data-xs-seen') === stamp) {
+            continue;
+        }
+        article.setAttribute('data-xs-seen', stamp);
+    }
+    const social = article.querySelector('[data-testid="socialContext"]');
+    results.push({
+        id: match ? match[1] : null,
+        url: match ? href.split('?')[0] : null,
+        text: pickText(article),
+        datetime: timeEl ? timeEl.getAttribute('datetime') : null,
+        social_context: social ? social.innerText : '',
+        is_quote: !!article.querySelector('[data-testid="quote"]'),
+        pinned: social ? /pinned/i.test(social.innerText) : false
+    });
+    if (limit && results.length >= limit) {
+        break;
+    }
+}
+return results;
+"""
+
+
+def extract_page_tweets(driver, limit: int = 0, incremental: bool = False) -> List[Dict]:
+    """Return raw tweet records for rendered articles using one round trip
+
+    With ``incremental`` only articles not returned by an earlier call on the
+    same page are walked, so repeated calls while scrolling stay linear.
+    """
+    records = driver.execute_script(BATCH_EXTRACT_JS, limit, incremental)
+    return records or []
+
+
+def mark_elements_seen(driver, elements):
+    """Stamp articles processed by the per-element path so later passes skip them"""
+    if elements:
+        driver.execute_script(
+            f"for (const el of arguments[0]) {{ el.setAttribute('{SEEN_ATTRIBUTE}', 'element'); }}",
+            elements
+        )
+
+
+def classify_tweet(social_context: str, is_quote: bool) -> str:
+    """Determine if tweet is original, retweet, or quote from batch fields"""
+    context = (social_context or '').lower()
+    if 'retweeted' in context:
+        return 'retweet'
+    if 'quoted' in context or is_quote:
+        return 'quote'
+    return 'original'
+
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO-8601 datetime attribute as rendered by X"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def build_tweet_data(record: Dict, username: str, created_at: Optional[datetime] = None) -> Optional[Dict]:
+    """Convert a raw batch record into the dict shape extract_tweet_data returns
+
+    The creation time comes from the tweet id; the rendered datetime is only
+    used to validate it (or for ids that predate Snowflake).
+    """
+    if not record or not record.get('id'):
+        return None
+
+    if created_at is None:
+        created_at = resolve_created_at(record['id'], parse_datetime(record.get('datetime')))
+
+    return {
+        'id': record['id'],
+        'text': record.get('text') or "[Media tweet - text not available]",
+        'username': username,
+        'created_at': created_at,
+        'type': classify_tweet(record.get('social_context'), record.get('is_quote')),
+        'pinned': bool(record.get('pinned'))
+    }
+
+
+def build_page_tweets(records: List[Dict], username: str) -> List[Dict]:
+    """build_tweet_data for a whole page, decoding every id's timestamp in one pass"""
+    records = [record for record in records if record and record.get('id')]
+    created = resolve_many(
+        [record['id'] for record in records],
+        [parse_datetime(record.get('datetime')) for record in records]
+    )
+    return [build_tweet_data(record, username, created_at) for record, created_at in zip(records, created)]
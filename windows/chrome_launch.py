@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Chrome launch presets
+One place that builds Chrome options for every script, plus startup-time and
+peak-RSS bookkeeping per preset so the presets can be compared on the box
+they actually run on
+"""
+
+import logging
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+import psutil
+from selenium import webdriver
+
+from logging_setup import configure_logging
+from metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+DRIVER_LAUNCHES = get_metrics().counter('xscraper_driver_launches_total', 'Chrome browsers started', ['preset'])
+DRIVER_STARTUP_SECONDS = get_metrics().histogram('xscraper_driver_startup_seconds', 'Time to start Chrome and chromedriver', ['preset'])
+
+PRESET_STANDARD = 'standard'
+PRESET_PERSISTENT = 'persistent'
+PRESET_LOW_MEMORY = 'low_memory'
+
+# Flags every preset shares
+BASE_ARGUMENTS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-extensions',
+    '--disable-plugins',
+    '--disable-logging',
+    '--log-level=3',
+    '--silent',
+    '--disable-remote-fonts',
+    '--disable-web-security'
+]
+BASE_DISABLED_FEATURES = ['VizDisplayCompositor']
+
+PRESETS = {
+    # Headed browser, as the scrapers have always run
+    PRESET_STANDARD: {
+        'headless': False,
+        'arguments': [],
+        'disabled_features': [],
+        'detach': False
+    },
+    # Headed, tuned to keep a logged-in session alive across long runs
+    PRESET_PERSISTENT: {
+        'headless': False,
+        'arguments': [
+            '--disable-background-timer-throttling',
+            '--disable-backgrounding-occluded-windows',
+            '--disable-renderer-backgrounding',
+            '--disable-ipc-flooding-protection',
+            '--disable-session-crashed-bubble',
+            '--disable-infobars',
+            '--disable-notifications',
+            '--disable-popup-blocking'
+        ],
+        'disabled_features': ['TranslateUI'],
+        'detach': True
+    },
+    # headless=new for small servers: no GPU, few renderers, small viewport, no background traffic
+    PRESET_LOW_MEMORY: {
+        'headless': True,
+        'arguments': [
+            '--headless=new',
+            '--disable-gpu',
+            '--renderer-process-limit=2',
+            '--window-size=1280,800',
+            '--disable-background-networking',
+            '--disable-component-update',
+            '--disable-default-apps',
+            '--disable-sync',
+            '--disable-breakpad',
+            '--no-first-run',
+            '--no-default-browser-check',
+            '--metrics-recording-only',
+            '--mute-audio',
+            '--disable-notifications'
+        ],
+        'disabled_features': ['TranslateUI', 'OptimizationHints', 'MediaRouter', 'BackForwardCache'],
+        'detach': False
+    }
+}
+
+
+def build_chrome_options(profile_dir: Optional[str] = None, preset: str = PRESET_STANDARD,
+                         binary_location: Optional[str] = None) -> webdriver.ChromeOptions:
+    """Chrome options for ``preset``; callers add only what is specific to them"""
+    if preset not in PRESETS:
+        raise ValueError(f"Unknown Chrome launch preset: {preset}")
+    settings = PRESETS[preset]
+    
+    chrome_options = webdriver.ChromeOptions()
+    if binary_location:
+        chrome_options.binary_location = binary_location
+    if profile_dir:
+        chrome_options.add_argument(f'--user-data-dir={profile_dir}')
+    for argument in BASE_ARGUMENTS + settings['arguments']:
+        chrome_options.add_argument(argument)
+    # Chrome honours only the last --disable-features switch, so merge them into one
+    disabled = BASE_DISABLED_FEATURES + [name for name in settings['disabled_features'] if name not in BASE_DISABLED_FEATURES]
+    chrome_options.add_argument(f"--disable-features={','.join(disabled)}")
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    if settings['detach']:
+        chrome_options.add_experimental_option('detach', True)
+    return chrome_options
+
+
+def browser_rss_mb(driver) -> float:
+    """Resident memory of chromedriver and its Chrome process tree in MB"""
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        procs = [root] + root.children(recursive=True)
+    except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
+        return 0.0
+    total = 0
+    for proc in procs:
+        try:
+            total += proc.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total / (1024 * 1024)
+
+
+class LaunchStats:
+    """Startup time and peak RSS per preset"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._presets: Dict[str, Dict] = {}
+        self._drivers: Dict[int, str] = {}
+    
+    def record_launch(self, driver, preset: str, startup_seconds: float):
+        with self._lock:
+            stats = self._presets.setdefault(preset, {'launches': 0, 'total_startup': 0.0, 'max_startup': 0.0, 'peak_rss_mb': 0.0})
+            stats['launches'] += 1
+            stats['total_startup'] += startup_seconds
+            stats['max_startup'] = max(stats['max_startup'], startup_seconds)
+            self._drivers[id(driver)] = preset
+        self.observe(driver)
+    
+    def observe(self, driver, rss_mb: Optional[float] = None) -> float:
+        """Sample ``driver``'s process tree and keep the highest RSS seen for its preset"""
+        if rss_mb is None:
+            rss_mb = browser_rss_mb(driver)
+        preset = self._drivers.get(id(driver))
+        if preset is None:
+            return rss_mb
+        with self._lock:
+            stats = self._presets[preset]
+            stats['peak_rss_mb'] = max(stats['peak_rss_mb'], rss_mb)
+        return rss_mb
+    
+    def forget(self, driver):
+        with self._lock:
+            self._drivers.pop(id(driver), None)
+    
+    def summary(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                preset: {
+                    'launches': stats['launches'],
+                    'avg_startup': round(stats['total_startup'] / stats['launches'], 2),
+                    'max_startup': round(stats['max_startup'], 2),
+                    'peak_rss_mb': round(stats['peak_rss_mb'])
+                }
+                for preset, stats in self._presets.items()
+            }
+
+
+_shared_stats: Optional[LaunchStats] = None
+_shared_lock = threading.Lock()
+
+
+def get_launch_stats() -> LaunchStats:
+    """Process-wide launch statistics shared by every driver factory and pool"""
+    global _shared_stats
+    with _shared_lock:
+        if _shared_stats is None:
+            _shared_stats = LaunchStats()
+        return _shared_stats
+
+
+def launch_chrome(chrome_options: webdriver.ChromeOptions, preset: str = PRESET_STANDARD):
+    """Start Chrome with ``chrome_options`` and record how long it took"""
+    started = time.monotonic()
+    driver = webdriver.Chrome(options=chrome_options)
+    startup = time.monotonic() - started
+    if PRESETS.get(preset, {}).get('headless'):
+        # Headless Chrome announces itself in the user agent; present the regular one
+        try:
+            user_agent = driver.execute_script("return navigator.userAgent")
+            driver.execute_cdp_cmd('Network.setUserAgentOverride', {'userAgent': user_agent.replace('HeadlessChrome', 'Chrome')})
+        except Exception as e:
+            logger.debug(f"Could not override headless user agent: {e}")
+    get_launch_stats().record_launch(driver, preset, startup)
+    DRIVER_LAUNCHES.inc(preset=preset)
+    DRIVER_STARTUP_SECONDS.observe(startup, preset=preset)
+    logger.info(f"Chrome ({preset}) started in {startup:.2f}s")
+    return driver
+
+
+def benchmark_presets(url: str, presets: List[str], settle_seconds: float = 5.0) -> Dict[str, Dict]:
+    """Launch each preset on a throwaway profile, load ``url`` and sample RSS while it settles"""
+    import shutil
+    import tempfile
+    
+    stats = get_launch_stats()
+    for preset in presets:
+        profile_dir = tempfile.mkdtemp(prefix=f'chrome_bench_{preset}_')
+        driver = None
+        try:
+            driver = launch_chrome(build_chrome_options(profile_dir, preset), preset)
+            driver.get(url)
+            deadline = time.monotonic() + settle_seconds
+            while time.monotonic() < deadline:
+                stats.observe(driver)
+                time.sleep(0.5)
+        except Exception as e:
+            logger.error(f"Benchmark of preset {preset} failed: {e}")
+        finally:
+            if driver is not None:
+                stats.observe(driver)
+                driver.quit()
+            shutil.rmtree(profile_dir, ignore_errors=True)
+    return stats.summary()
+
+
+def main():
+    """Compare startup time and peak RSS of every launch preset"""
+    configure_logging('chrome_launch')
+    url = sys.argv[1] if len(sys.argv) > 1 else 'https://x.com'
+    presets = sys.argv[2].split(',') if len(sys.argv) > 2 else list(PRESETS)
+    print(f"🚀 Benchmarking Chrome presets ({', '.join(presets)}) on {url}...")
+    for preset, summary in benchmark_presets(url, presets).items():
+        print(f"  {preset:>10}: started in {summary['avg_startup']}s, peak RSS {summary['peak_rss_mb']}MB")
+
+
+if __name__ == "__main__":
+    main()
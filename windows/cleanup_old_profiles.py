@@ -8,17 +8,10 @@ import os
 import sys
 import psutil
 import logging
-from config import LOG_LEVEL, LOG_FILE
+from logging_setup import configure_logging
 
 # Setup logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 def kill_chrome_processes():
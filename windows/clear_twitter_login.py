@@ -8,17 +8,11 @@ import os
 import sys
 import shutil
 import logging
-from config import CHROME_PROFILE_USER, CHROME_PROFILE_YAP, LOG_LEVEL, LOG_FILE
+from config import CHROME_PROFILE_USER, CHROME_PROFILE_YAP
+from logging_setup import configure_logging
 
 # Setup logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 def clear_profile_data(profile_path, profile_name):
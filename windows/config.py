@@ -22,14 +22,84 @@ TWITTER_PASSWORD = os.getenv('TWITTER_PASSWORD', '')
 # Telegram Configuration
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', '')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID', '')
+NOTIFICATION_MODE = os.getenv('NOTIFICATION_MODE', 'digest').lower()  # 'digest' packs new tweets into 4096-char messages, 'single' sends one each
+TELEGRAM_MESSAGES_PER_MINUTE = int(os.getenv('TELEGRAM_MESSAGES_PER_MINUTE', '20'))  # Shared send rate (token bucket refill)
+TELEGRAM_BURST = int(os.getenv('TELEGRAM_BURST', '3'))  # Messages that may go out back to back
 
 # Monitoring intervals (in minutes)
 CHECK_INTERVAL_MINUTES = int(os.getenv('CHECK_INTERVAL_MINUTES', '15'))  # User monitoring interval
 YAP_CHECK_INTERVAL_MINUTES = int(os.getenv('YAP_CHECK_INTERVAL_MINUTES', '1080'))  # YAP links interval (18 hours = 1080 minutes)
 
+# Scheduling
+SCHEDULE_MODE = os.getenv('SCHEDULE_MODE', 'fixed_rate').lower()  # 'fixed_rate' (fixed grid, no drift) or 'fixed_delay' (interval after each check)
+SCHEDULE_JITTER_SECONDS = float(os.getenv('SCHEDULE_JITTER_SECONDS', '0'))  # Random extra delay added to each wait
+SCHEDULE_MISSED_RUNS = os.getenv('SCHEDULE_MISSED_RUNS', 'coalesce').lower()  # 'coalesce', 'skip' or 'catch_up' when a check overruns its slot
+COUNTDOWN_DISPLAY_SECONDS = float(os.getenv('COUNTDOWN_DISPLAY_SECONDS', '60'))  # Countdown refresh cadence (0 = log the next run time only)
+
+# Supervisor (main_supervisor.py)
+SUPERVISOR_JOBS = [
+    job.strip() for job in os.getenv('SUPERVISOR_JOBS', 'user,yap').split(',')
+    if job.strip()
+]  # Jobs to run in one process
+SUPERVISOR_SHARED_POOL = os.getenv('SUPERVISOR_SHARED_POOL', 'false').lower() == 'true'  # Off: user and YAP jobs are logged in on separate Chrome profiles
+
 # Maximum tweets to scrape
 MAX_TWEETS_TO_SCRAPE = int(os.getenv('MAX_TWEETS_TO_SCRAPE', '50'))
 
+# Incremental Profile Checks
+USER_INCREMENTAL = os.getenv('USER_INCREMENTAL', 'true').lower() == 'true'  # Stop reading a profile at a run of already-seen tweets
+USER_SEEN_RUN_TO_STOP = int(os.getenv('USER_SEEN_RUN_TO_STOP', '3'))  # Consecutive seen (or too old) tweets that end a check; pinned tweets don't count
+USER_MAX_SCROLLS = int(os.getenv('USER_MAX_SCROLLS', '3'))  # Scrolls allowed while every visible tweet is new
+
+# URL Output
+URL_SINK_RUNS_DIR = os.getenv('URL_SINK_RUNS_DIR', 'runs')  # Per-run link files, streamed while scraping
+URL_SINK_KEEP_RUNS = int(os.getenv('URL_SINK_KEEP_RUNS', '48'))  # Newest run files to keep per output (0 = all)
+URL_SINK_CUMULATIVE = os.getenv('URL_SINK_CUMULATIVE', 'true').lower() == 'true'  # Also merge links into a deduplicated *.all.txt
+
+# Resource blocking
+BLOCKED_RESOURCES = [
+    category.strip().lower() for category in os.getenv('BLOCKED_RESOURCES', 'images,media,fonts,analytics').split(',')
+    if category.strip()
+]  # Page resources scraping browsers never download (empty = load everything)
+
+# Driver pool - keep Chrome warm across checks
+DRIVER_MAX_CHECKS = int(os.getenv('DRIVER_MAX_CHECKS', '20'))  # Recycle the browser after this many checks
+DRIVER_MAX_RSS_MB = int(os.getenv('DRIVER_MAX_RSS_MB', '1500'))  # Recycle the browser above this memory ceiling
+
+# Concurrent user checks
+USER_CHECK_CONCURRENCY = int(os.getenv('USER_CHECK_CONCURRENCY', '1'))  # Browsers checking users in parallel (above 1 needs CHROME_PROFILE_CLONES=true)
+PER_HOST_CONCURRENCY = int(os.getenv('PER_HOST_CONCURRENCY', '2'))  # Max simultaneous page loads against x.com
+
+# Tweet extraction mode
+EXTRACTION_MODE = os.getenv('EXTRACTION_MODE', 'batch').lower()  # 'network' (timeline JSON), 'batch' (one injected script per page) or 'element'
+
+# WebDriver command instrumentation
+DRIVER_TRACE = os.getenv('DRIVER_TRACE', 'true').lower() == 'true'  # Log WebDriver round trips per calling method after each cycle
+DRIVER_TRACE_FILE = os.getenv('DRIVER_TRACE_FILE', '')  # Append every command to this JSON-lines file (empty = off)
+
+# Selector Strategies
+SELECTOR_STATS_FILE = os.getenv('SELECTOR_STATS_FILE', 'selector_stats.json')  # Per-selector hit rates kept across runs (empty = not kept)
+SELECTOR_REPROBE_EVERY = int(os.getenv('SELECTOR_REPROBE_EVERY', '500'))  # Try the original selector order every N lookups
+SELECTOR_PRUNE_AFTER = int(os.getenv('SELECTOR_PRUNE_AFTER', '25'))  # Skip a fallback selector after this many attempts without a hit
+
+# Prometheus metrics endpoint
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')  # Interface the /metrics endpoint listens on
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))  # User monitor and supervisor /metrics port (0 = off)
+YAP_METRICS_PORT = int(os.getenv('YAP_METRICS_PORT', '0'))  # YAP scraper /metrics port (0 = off)
+
+# Seen-tweet store
+SEEN_STORE_BACKEND = os.getenv('SEEN_STORE_BACKEND', 'sqlite').lower()  # 'sqlite' (WAL, batched appends) or 'json' (legacy)
+SEEN_STORE_DB = os.getenv('SEEN_STORE_DB', 'seen_tweets.db')  # SQLite database path
+SEEN_RETENTION_DAYS = int(os.getenv('SEEN_RETENTION_DAYS', '30'))  # Forget seen tweets after this many days (0 = keep forever)
+
+# User polling
+USER_POLLING = os.getenv('USER_POLLING', 'fixed').lower()  # 'fixed' (every user every CHECK_INTERVAL_MINUTES) or 'adaptive' (per-user rate from posting history)
+POLL_MIN_INTERVAL_MINUTES = float(os.getenv('POLL_MIN_INTERVAL_MINUTES', '5'))  # Adaptive: busiest accounts are checked this often (also the tick)
+POLL_MAX_INTERVAL_MINUTES = float(os.getenv('POLL_MAX_INTERVAL_MINUTES', '60'))  # Adaptive: quiet accounts are still checked this often
+POLL_PAGE_BUDGET_PER_HOUR = int(os.getenv('POLL_PAGE_BUDGET_PER_HOUR', '120'))  # Adaptive: max profile page loads per hour (0 = unlimited)
+POLL_RATE_WINDOW_DAYS = float(os.getenv('POLL_RATE_WINDOW_DAYS', '7'))  # Adaptive: posting history used to estimate each user's rate
+POLL_TARGET_POSTS_PER_CHECK = float(os.getenv('POLL_TARGET_POSTS_PER_CHECK', '0.5'))  # Adaptive: expected new tweets per check
+
 # Users to monitor (comma-separated list)
 USERS_TO_MONITOR = [
     user.strip() for user in os.getenv('USERS_TO_MONITOR', 'phashcooks,JoeParys,curtislepore,cryptojack,greg_miller05,CryptoWendyO,MasonVersluis,Sheldon_Sniper,blockchainchick,cryptorecruitr,EleanorTerrett,SadafJadran,LadyofCrypto1,MacnBTC,CryptoWizardd,eliz883,ariusCrypt0,KoroushAK').split(',')
@@ -38,14 +108,25 @@ USERS_TO_MONITOR = [
 
 # Logging Configuration
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-LOG_FILE = os.getenv('LOG_FILE', 'tweet_monitor.log')
+LOG_FILE = os.getenv('LOG_FILE', 'tweet_monitor.log')  # Each service writes its own file: tweet_monitor.user.log, tweet_monitor.yap.log...
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()  # 'text' or 'json' (one JSON object per line)
+LOG_ROTATION = os.getenv('LOG_ROTATION', 'size').lower()  # 'size', 'time' or 'none'
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))  # Rotate above this size
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))  # Rotated files to keep
+LOG_ROTATE_WHEN = os.getenv('LOG_ROTATE_WHEN', 'midnight')  # When to rotate with LOG_ROTATION=time
 
 # YAP Search Query Configuration
 # These parameters control the YAP search query for finding relevant tweets
 
+# Chrome launch presets (chrome_launch.py)
+USER_CHROME_PRESET = os.getenv('USER_CHROME_PRESET', 'standard')  # 'standard' (headed), 'persistent' (headed, session-keeping flags) or 'low_memory' (headless=new)
+YAP_CHROME_PRESET = os.getenv('YAP_CHROME_PRESET', 'persistent')  # Same choices for the YAP scraper's browser
+
 # Individual Chrome profiles
 CHROME_PROFILE_USER = os.path.join(BASE_DIR, "chrome_profile_user")
 CHROME_PROFILE_YAP = os.path.join(BASE_DIR, "chrome_profile_yap")
+CHROME_PROFILE_CLONES = os.getenv('CHROME_PROFILE_CLONES', 'false').lower() == 'true'  # Run each browser on a copy of its profile, so several pooled browsers can share one login
+CHROME_PROFILE_CLONE_DIR = os.getenv('CHROME_PROFILE_CLONE_DIR', os.path.join(BASE_DIR, 'profile_clones'))  # Where profile copies are made
 
 # Search Keywords (REQUIRED)
 YAP_SEARCH_KEYWORDS = os.getenv('YAP_SEARCH_KEYWORDS', '("cysic" OR @cysic_xyz)')
@@ -76,6 +157,17 @@ YAP_FILTER_VIDEOS = os.getenv('YAP_FILTER_VIDEOS', 'false').lower() == 'true'  #
 # Search Source
 YAP_SEARCH_SOURCE = os.getenv('YAP_SEARCH_SOURCE', 'recent_search_click')  # Search source parameter
 
+# Scroll Waits (seconds)
+YAP_SCROLL_MIN_WAIT_SECONDS = float(os.getenv('YAP_SCROLL_MIN_WAIT_SECONDS', '1.5'))  # Lower bound for the adaptive wait after a scroll
+YAP_SCROLL_MAX_WAIT_SECONDS = float(os.getenv('YAP_SCROLL_MAX_WAIT_SECONDS', '8'))  # Upper bound for the adaptive wait after a scroll
+
+# YAP Cross-Run Dedup
+YAP_DEDUP = os.getenv('YAP_DEDUP', 'true').lower() == 'true'  # Only send tweets no earlier run delivered
+YAP_DELIVERED_DB = os.getenv('YAP_DELIVERED_DB', 'yap_delivered.db')  # SQLite index of delivered tweet ids
+YAP_DELIVERED_MAX_ENTRIES = int(os.getenv('YAP_DELIVERED_MAX_ENTRIES', '100000'))  # Oldest ids are dropped beyond this (0 = unbounded)
+YAP_DELIVERED_RETENTION_DAYS = int(os.getenv('YAP_DELIVERED_RETENTION_DAYS', '30'))  # Forget delivered ids after this many days (0 = keep)
+YAP_DELIVERED_STOP_ITERATIONS = int(os.getenv('YAP_DELIVERED_STOP_ITERATIONS', '2'))  # Stop after this many scrolls finding only delivered tweets
+
 # Validate required settings
 def validate_config():
     """Validate that required configuration is present"""
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+WebDriver command instrumentation
+Counts and times every command a scraper's driver sends (get, find_elements,
+get_attribute, execute_script...) and attributes it to the scraper method that
+issued it, so a slow cycle shows where its round trips went
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config import DRIVER_TRACE, DRIVER_TRACE_FILE
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules whose frames are plumbing, not callers worth reporting
+_SKIPPED_FILES = {os.path.abspath(__file__)}
+
+
+def _command_name(command: str, params: Optional[Dict]) -> str:
+    # Selenium runs get_attribute/is_displayed as injected atoms tagged "/* getAttribute */"
+    if command in ('executeScript', 'executeAsyncScript', 'w3cExecuteScript') and params:
+        script = params.get('script', '')
+        if script.startswith('/* '):
+            return script[3:script.find(' */', 3)]
+    return command
+
+
+def _attribute() -> Tuple[str, str]:
+    """(owner, caller) for the command being sent
+    
+    The caller is the nearest project frame outside this module, as
+    Class.method; the owner is the TRACE_OWNER of the first scraper further up
+    the stack, so a driver shared between services is still split correctly.
+    """
+    caller = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(PROJECT_DIR) and filename not in _SKIPPED_FILES:
+            instance = frame.f_locals.get('self')
+            if caller is None:
+                name = frame.f_code.co_name
+                caller = f"{type(instance).__name__}.{name}" if instance is not None else name
+            owner = getattr(instance, 'TRACE_OWNER', None)
+            if owner:
+                return owner, caller
+        frame = frame.f_back
+    return '', caller or '<unknown>'
+
+
+class CommandStats:
+    """Count and timing of one (caller, command) pair"""
+    
+    __slots__ = ('count', 'total', 'max')
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+
+class DriverTracer:
+    """Wraps drivers' execute() to record every WebDriver round trip
+    
+    Commands are grouped per owner (the TRACE_OWNER of the scraper that
+    issued them) so the user monitor and YAP scraper report separately even
+    when they share a process or a driver pool. With ``trace_file`` set, every command is also appended to
+    it as one JSON line.
+    """
+    
+    def __init__(self, enabled: bool = DRIVER_TRACE, trace_file: Optional[str] = DRIVER_TRACE_FILE):
+        self.enabled = enabled
+        self.trace_file = trace_file or None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[Tuple[str, str], CommandStats]] = {}
+        self._trace = None
+    
+    def instrument(self, driver):
+        """Start recording ``driver``'s commands; returns the driver"""
+        tracers = driver.__dict__.setdefault('_command_tracers', [])
+        if not self.enabled or self in tracers:
+            return driver
+        tracers.append(self)
+        execute = driver.execute
+        
+        def traced_execute(driver_command, params=None):
+            started = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self._record(_command_name(driver_command, params), time.perf_counter() - started)
+        
+        # WebElement commands go through their parent driver's execute() as well
+        driver.execute = traced_execute
+        return driver
+    
+    def _record(self, command: str, seconds: float):
+        owner, caller = _attribute()
+        with self._lock:
+            stats = self._stats.setdefault(owner, {})
+            key = (caller, command)
+            if key not in stats:
+                stats[key] = CommandStats()
+            stats[key].add(seconds)
+            if self.trace_file:
+                self._write_trace({
+                    'ts': round(time.time(), 6),
+                    'owner': owner,
+                    'thread': threading.current_thread().name,
+                    'caller': caller,
+                    'command': command,
+                    'ms': round(seconds * 1000, 3)
+                })
+    
+    def _write_trace(self, event: Dict):
+        try:
+            if self._trace is None:
+                self._trace = open(self.trace_file, 'a', encoding='utf-8')
+            self._trace.write(json.dumps(event) + '\n')
+        except Exception as e:
+            logger.warning(f"Disabling WebDriver trace file {self.trace_file}: {e}")
+            self.trace_file = None
+    
+    def command_count(self, owner: Optional[str] = None) -> int:
+        """Commands recorded since the last reset, for one owner or all of them"""
+        with self._lock:
+            owners = [self._stats.get(owner, {})] if owner is not None else list(self._stats.values())
+            return sum(stats.count for per_owner in owners for stats in per_owner.values())
+    
+    def summary(self, owner: str = '', top: int = 10) -> List[Dict]:
+        """Callers and commands sorted by total time spent"""
+        with self._lock:
+            items = list(self._stats.get(owner, {}).items())
+        items.sort(key=lambda item: item[1].total, reverse=True)
+        return [
+            {
+                'caller': caller,
+                'command': command,
+                'count': stats.count,
+                'total_ms': round(stats.total * 1000, 1),
+                'avg_ms': round(stats.total / stats.count * 1000, 2),
+                'max_ms': round(stats.max * 1000, 1)
+            }
+            for (caller, command), stats in items[:top]
+        ]
+    
+    def log_summary(self, owner: str = '', label: str = "WebDriver commands", top: int = 10):
+        """Log totals and the costliest caller/command pairs, then start a new cycle"""
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stats.get(owner, {})
+            count = sum(item.count for item in stats.values())
+            total = sum(item.total for item in stats.values())
+        if count:
+            logger.info(f"🔌 {label}: {count} round trips, {total:.1f}s in WebDriver")
+            for row in self.summary(owner, top):
+                logger.info(f"   {row['caller']} → {row['command']}: {row['count']}x, "
+                            f"{row['total_ms']:.0f}ms total, avg {row['avg_ms']:.1f}ms, max {row['max_ms']:.0f}ms")
+        self.reset(owner)
+    
+    def reset(self, owner: Optional[str] = None):
+        with self._lock:
+            if owner is None:
+                self._stats.clear()
+            else:
+                self._stats.pop(owner, None)
+    
+    def close(self):
+        with self._lock:
+            if self._trace is not None:
+                self._trace.close()
+                self._trace = None
+
+
+_shared_tracer: Optional[DriverTracer] = None
+_shared_lock = threading.Lock()
+
+
+def get_tracer() -> DriverTracer:
+    """Process-wide tracer shared by every driver factory"""
+    global _shared_tracer
+    with _shared_lock:
+        if _shared_tracer is None:
+            _shared_tracer = DriverTracer()
+        return _shared_tracer
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Warm Chrome driver pool
+Keeps WebDriver sessions alive across checks instead of quitting and relaunching Chrome every cycle
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+
+from chrome_launch import browser_rss_mb, get_launch_stats
+from metrics import get_metrics
+from process_registry import get_registry
+from profile_manager import get_profile_manager
+
+logger = logging.getLogger(__name__)
+
+CHROME_RSS_MB = get_metrics().gauge('xscraper_chrome_rss_megabytes', 'Chrome process tree RSS when a driver was last returned to its pool', ['pool'])
+
+
+class PooledDriver:
+    """A pooled WebDriver session plus its bookkeeping"""
+
+    def __init__(self, driver, started_at: float, startup_seconds: float):
+        self.driver = driver
+        self.started_at = started_at
+        self.startup_seconds = startup_seconds
+        self.checks = 0
+
+    def rss_mb(self) -> float:
+        """Resident memory of chromedriver and its Chrome process tree in MB"""
+        return browser_rss_mb(self.driver)
+
+
+class DriverPool:
+    """Long-lived pool of warm Chrome sessions
+
+    Sessions are created lazily through ``factory`` and handed out with
+    ``acquire()``. ``release()`` returns a session to the pool and recycles the
+    browser once it has served ``max_checks`` checks or its process tree grows
+    past ``max_rss_mb``.
+    """
+
+    def __init__(self, name: str, factory: Callable, size: int = 1,
+                 max_checks: int = 20, max_rss_mb: int = 1500):
+        self.name = name
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_checks = max(1, max_checks)
+        self.max_rss_mb = max_rss_mb
+        # Idle sessions (newest last), checked-out sessions and the launch count share one lock;
+        # waiters are woken both when a session comes back and when a discard frees a launch slot
+        self._idle: List[PooledDriver] = []
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._created = 0
+        self.cold_starts = 0
+        self.warm_starts = 0
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Hand out a healthy driver, launching Chrome only when no warm session is available"""
+        start = time.monotonic()
+        deadline = start + timeout if timeout is not None else None
+        while True:
+            with self._available:
+                while not self._idle and self._created >= self.size:
+                    remaining = deadline - time.monotonic() if deadline is not None else None
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No {self.name} driver became available within {timeout}s")
+                    self._available.wait(remaining)
+                if self._idle:
+                    session = self._idle.pop()
+                else:
+                    self._created += 1
+                    session = None
+
+            if session is None:
+                return self._launch(start)
+
+            if self._is_healthy(session):
+                with self._lock:
+                    session.checks += 1
+                    self.warm_starts += 1
+                    self._sessions[id(session.driver)] = session
+                logger.info(f"♻️ Warm {self.name} driver ready in {time.monotonic() - start:.2f}s "
+                            f"(check {session.checks}/{self.max_checks})")
+                return session.driver
+
+            logger.warning(f"Pooled {self.name} driver failed health check, replacing it")
+            self._discard(session)
+
+    def release(self, driver):
+        """Return a driver to the pool, recycling it when it is worn out"""
+        if driver is None:
+            return
+        with self._lock:
+            session = self._sessions.pop(id(driver), None)
+        if session is None:
+            logger.warning(f"Released a {self.name} driver that the pool does not own")
+            return
+
+        if session.checks >= self.max_checks:
+            logger.info(f"Recycling {self.name} driver after {session.checks} checks")
+            self._discard(session)
+            return
+
+        get_registry().refresh(driver)
+        rss = get_launch_stats().observe(driver, session.rss_mb())
+        CHROME_RSS_MB.set(rss, pool=self.name)
+        if self.max_rss_mb and rss > self.max_rss_mb:
+            logger.info(f"Recycling {self.name} driver: RSS {rss:.0f}MB exceeds {self.max_rss_mb}MB")
+            self._discard(session)
+            return
+
+        logger.debug(f"{self.name} driver returned to pool (RSS {rss:.0f}MB)")
+        with self._available:
+            self._idle.append(session)
+            self._available.notify()
+
+    def invalidate(self, driver):
+        """Drop a driver that errored mid-check instead of returning it to the pool"""
+        with self._lock:
+            session = self._sessions.pop(id(driver), None)
+        if session is not None:
+            self._discard(session)
+
+    def close(self):
+        """Quit every pooled browser"""
+        with self._lock:
+            sessions = list(self._sessions.values()) + self._idle
+            self._sessions.clear()
+            self._idle = []
+        for session in sessions:
+            self._discard(session)
+        logger.info(f"{self.name} driver pool closed ({self.cold_starts} cold / {self.warm_starts} warm starts)")
+
+    def _launch(self, start: float):
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+        startup = time.monotonic() - start
+        session = PooledDriver(driver, time.time(), startup)
+        session.checks = 1
+        with self._lock:
+            self.cold_starts += 1
+            self._sessions[id(driver)] = session
+        logger.info(f"🚀 Cold {self.name} driver started in {startup:.2f}s")
+        return driver
+
+    def _is_healthy(self, session: PooledDriver) -> bool:
+        """Cheap liveness probe: one round trip to the renderer"""
+        try:
+            return session.driver.execute_script("return 1") == 1
+        except Exception as e:
+            logger.debug(f"{self.name} driver health check failed: {e}")
+            return False
+
+    def _discard(self, session: PooledDriver):
+        try:
+            session.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting pooled {self.name} driver: {e}")
+        # Sweep whatever quit() left behind in this browser's process tree
+        get_registry().reap(session.driver)
+        get_profile_manager().release(session.driver)
+        get_launch_stats().forget(session.driver)
+        with self._available:
+            self._created = max(0, self._created - 1)
+            # The freed slot lets a waiting acquire() launch a replacement
+            self._available.notify()
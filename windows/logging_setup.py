@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Central logging setup
+Every logger writes to an in-memory queue and one QueueListener thread does the
+file and console I/O, so a slow disk never stalls the scrape loop. Each service
+gets its own log file, rotated by size or time, as text or JSON lines
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+from config import LOG_LEVEL, LOG_FILE, LOG_FORMAT, LOG_ROTATION, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_ROTATE_WHEN
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Third-party loggers that are only worth hearing from on errors
+QUIET_LOGGERS = ('httpx', 'urllib3', 'selenium')
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, thread, service, message (plus exc_info/stack_info)"""
+    
+    def __init__(self, service: Optional[str] = None):
+        super().__init__()
+        self.service = service
+    
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        if self.service:
+            event['service'] = self.service
+        if record.exc_info:
+            event['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            event['exc_info'] = record.exc_text
+        if record.stack_info:
+            event['stack_info'] = self.formatStack(record.stack_info)
+        return json.dumps(event, ensure_ascii=False)
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps tracebacks apart from the message
+    
+    The stock handler formats the traceback into ``msg``, so a JSON log would
+    carry it inside ``message``. Here it is rendered to ``exc_text`` and each
+    formatter on the listener side decides where it goes.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def service_log_file(service: Optional[str], log_file: str = LOG_FILE) -> str:
+    """tweet_monitor.log -> tweet_monitor.user.log; services must not rotate each other's file"""
+    if not service:
+        return log_file
+    root, extension = os.path.splitext(log_file)
+    return f"{root}.{service}{extension or '.log'}"
+
+
+def _file_handler(path: str, rotation: str) -> logging.Handler:
+    if rotation == 'size':
+        return logging.handlers.RotatingFileHandler(
+            path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8', delay=True
+        )
+    if rotation == 'time':
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding='utf-8', delay=True
+        )
+    return logging.FileHandler(path, encoding='utf-8', delay=True)
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_lock = threading.Lock()
+
+
+def configure_logging(service: Optional[str] = None, level: str = LOG_LEVEL, log_file: Optional[str] = LOG_FILE,
+                      log_format: str = LOG_FORMAT, rotation: str = LOG_ROTATION) -> Optional[str]:
+    """Route every logger through a queue to the (rotating) log file and stdout
+    
+    Only the first call in a process takes effect. Returns the log file path.
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return None
+        
+        handlers = []
+        path = None
+        if log_file:
+            path = service_log_file(service, log_file)
+            file_handler = _file_handler(path, rotation)
+            file_handler.setFormatter(JsonFormatter(service) if log_format == 'json' else logging.Formatter(TEXT_FORMAT))
+            handlers.append(file_handler)
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(console)
+        
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(RecordQueueHandler(log_queue))
+        root.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+        for name in QUIET_LOGGERS:
+            logging.getLogger(name).setLevel(logging.ERROR)
+        
+        atexit.register(stop_logging)
+        return path
+
+
+def stop_logging():
+    """Write out queued records and stop the listener thread"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
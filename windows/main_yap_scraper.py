@@ -10,39 +10,47 @@ import sys
 import signal
 from datetime import datetime
 from config import (
-    LOG_LEVEL, 
-    LOG_FILE, 
-    YAP_CHECK_INTERVAL_MINUTES
+    YAP_CHECK_INTERVAL_MINUTES,
+    DRIVER_MAX_CHECKS,
+    DRIVER_MAX_RSS_MB,
+    SCHEDULE_MODE,
+    SCHEDULE_JITTER_SECONDS,
+    SCHEDULE_MISSED_RUNS,
+    COUNTDOWN_DISPLAY_SECONDS,
+    YAP_METRICS_PORT
 )
 from yap_scraper import YapSearchScraper
-from countdown_timer import show_countdown
-
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-
-# Suppress verbose logging
-logging.getLogger('httpx').setLevel(logging.ERROR)
-logging.getLogger('urllib3').setLevel(logging.ERROR)
-logging.getLogger('selenium').setLevel(logging.ERROR)
+from driver_pool import DriverPool
+from logging_setup import configure_logging
+from scheduler import Scheduler
+from metrics import start_metrics_server
 
 logger = logging.getLogger(__name__)
 
 class YapScraperService:
-    def __init__(self):
+    def __init__(self, driver_pool=None):
         self.yap_scraper = None
+        # The supervisor passes in the pool it shares with the user job
+        self.driver_pool = driver_pool or DriverPool(
+            'yap',
+            YapSearchScraper.create_driver,
+            max_checks=DRIVER_MAX_CHECKS,
+            max_rss_mb=DRIVER_MAX_RSS_MB
+        )
+        self.scheduler = Scheduler(
+            YAP_CHECK_INTERVAL_MINUTES * 60,
+            mode=SCHEDULE_MODE,
+            jitter=SCHEDULE_JITTER_SECONDS,
+            missed_policy=SCHEDULE_MISSED_RUNS,
+            progress_interval=COUNTDOWN_DISPLAY_SECONDS,
+            name="YAP scraping"
+        )
         logger.info("YAP scraper service initialized")
     
     def initialize_scraper(self):
         """Initialize the YAP scraper"""
         if self.yap_scraper is None:
-            self.yap_scraper = YapSearchScraper()
+            self.yap_scraper = YapSearchScraper(driver_pool=self.driver_pool)
             logger.info("YAP scraper initialized")
     
     def run_yap_scraping(self):
@@ -51,6 +59,9 @@ class YapScraperService:
             # Initialize scraper if needed
             self.initialize_scraper()
             
+            # Take a warm browser from the pool (launches Chrome only on a cold start)
+            self.yap_scraper.acquire_driver()
+            
             logger.info("Starting YAP links scraping...")
             success = self.yap_scraper.run_yap_scraper()
             
@@ -59,16 +70,23 @@ class YapScraperService:
             else:
                 logger.warning("YAP scraping completed with issues")
             
-            # Quit Chrome after task completion
-            self.yap_scraper.quit_chrome_after_task()
-            self.yap_scraper = None  # Reset for next check
+            # Return Chrome to the pool so the next run starts warm
+            self.yap_scraper.release_driver()
                 
         except Exception as e:
             logger.error(f"Error during YAP scraping: {e}")
-            # Ensure Chrome is quit even on error
+            # Discard the browser on error so the next run gets a fresh one
+            if self.yap_scraper:
+                self.yap_scraper.release_driver(failed=True)
+    
+    def cleanup(self):
+        """Release the scraper and quit every pooled browser"""
+        try:
             if self.yap_scraper:
-                self.yap_scraper.quit_chrome_after_task()
-                self.yap_scraper = None
+                self.yap_scraper.cleanup()
+            self.driver_pool.close()
+        except Exception as e:
+            logger.error(f"Error during cleanup: {e}")
     
     def run_continuous(self):
         """Run the YAP scraper continuously"""
@@ -76,31 +94,24 @@ class YapScraperService:
         
         def signal_handler(sig, frame):
             logger.info("Shutdown signal received, cleaning up...")
-            if self.yap_scraper:
-                self.yap_scraper.cleanup()
+            self.cleanup()
             sys.exit(0)
         
         signal.signal(signal.SIGTERM, signal_handler)
         signal.signal(signal.SIGINT, signal_handler)
+        start_metrics_server(YAP_METRICS_PORT)
         
-        while True:
-            try:
-                # Run the scraping
-                self.run_yap_scraping()
-                
-                # Show countdown for next check
-                logger.info(f"Next YAP scraping in {YAP_CHECK_INTERVAL_MINUTES} minutes...")
-                show_countdown(YAP_CHECK_INTERVAL_MINUTES * 60)
-                
-            except KeyboardInterrupt:
-                logger.info("Interrupted by user")
-                break
-            except Exception as e:
-                logger.error(f"Unexpected error in continuous loop: {e}")
-                time.sleep(60)  # Wait a minute before retrying
+        # First run starts immediately, then every YAP_CHECK_INTERVAL_MINUTES on a fixed schedule
+        try:
+            self.scheduler.run(self.run_yap_scraping)
+        except KeyboardInterrupt:
+            logger.info("Interrupted by user")
+        finally:
+            self.cleanup()
 
 def main():
     """Main function"""
+    configure_logging('yap')
     logger.info("Starting YAP Links Scraper Service")
     
     try:
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Resource blocking for scraping sessions
+Stops Chrome from downloading images, video, web fonts and analytics scripts
+(CDP Network.setBlockedURLs plus content-settings prefs) and records how many
+bytes each page transferred and how long it took to become ready
+"""
+
+import logging
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List
+
+from config import BLOCKED_RESOURCES
+from logging_setup import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# URL patterns per category; '*' matches any run of characters (Network.setBlockedURLs syntax)
+RESOURCE_PATTERNS = {
+    'images': [
+        '*pbs.twimg.com/media/*',
+        '*pbs.twimg.com/profile_images/*',
+        '*pbs.twimg.com/profile_banners/*',
+        '*pbs.twimg.com/card_img/*',
+        '*pbs.twimg.com/ext_tw_video_thumb/*',
+        '*pbs.twimg.com/amplify_video_thumb/*',
+        '*pbs.twimg.com/tweet_video_thumb/*',
+        '*pbs.twimg.com/semantic_core_img/*',
+        '*abs.twimg.com/emoji/*',
+        '*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*'
+    ],
+    'media': [
+        '*video.twimg.com/*',
+        '*.mp4*', '*.m4s*', '*.m3u8*', '*.webm*'
+    ],
+    'fonts': [
+        '*.woff2*', '*.woff*', '*.ttf*', '*.otf*',
+        '*fonts.gstatic.com/*', '*fonts.googleapis.com/*'
+    ],
+    'analytics': [
+        '*/i/jot/*', '*/1.1/jot/*',
+        '*ads-twitter.com/*', '*ads-api.x.com/*', '*analytics.twitter.com/*',
+        '*google-analytics.com/*', '*googletagmanager.com/*', '*doubleclick.net/*'
+    ]
+}
+
+# Sum of what the current document and its subresources pulled over the network.
+# transferSize is 0 for cache hits and for cross-origin responses without
+# Timing-Allow-Origin, so those are counted by their body size instead.
+PAGE_METRICS_SCRIPT = """
+const entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+let bytes = 0;
+for (const entry of entries) {
+    bytes += entry.transferSize || entry.encodedBodySize || 0;
+}
+return {bytes: bytes, requests: entries.length};
+"""
+
+# The default Resource Timing buffer holds 250 entries; a scrolled timeline needs more
+RESOURCE_BUFFER_SCRIPT = "performance.setResourceTimingBufferSize(5000);"
+
+
+def blocked_url_patterns(categories: Iterable[str] = BLOCKED_RESOURCES) -> List[str]:
+    """URL patterns for the given categories, in a stable order"""
+    patterns = []
+    for category in categories:
+        if category not in RESOURCE_PATTERNS:
+            logger.warning(f"Unknown resource category to block: {category}")
+            continue
+        patterns.extend(pattern for pattern in RESOURCE_PATTERNS[category] if pattern not in patterns)
+    return patterns
+
+
+def apply_content_settings(chrome_options, categories: Iterable[str] = BLOCKED_RESOURCES):
+    """Set the Chrome content settings that go with the blocked categories
+    
+    The image setting is always written, allow or block, because chromedriver
+    stores prefs in the profile and a block would otherwise outlive the mode.
+    """
+    categories = set(categories)
+    prefs = dict(chrome_options.experimental_options.get('prefs', {}))
+    prefs['profile.managed_default_content_settings.images'] = 2 if 'images' in categories else 1
+    chrome_options.add_experimental_option('prefs', prefs)
+    if 'media' in categories:
+        chrome_options.add_argument('--autoplay-policy=user-gesture-required')
+        chrome_options.add_argument('--mute-audio')
+    return chrome_options
+
+
+def enable_resource_blocking(driver, categories: Iterable[str] = BLOCKED_RESOURCES) -> bool:
+    """Block the categories' URLs for every page this driver loads from now on"""
+    patterns = blocked_url_patterns(categories)
+    try:
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': RESOURCE_BUFFER_SCRIPT})
+        if not patterns:
+            return False
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        logger.info(f"Blocking {', '.join(categories)} ({len(patterns)} URL patterns)")
+        return True
+    except Exception as e:
+        logger.warning(f"Could not enable resource blocking: {e}")
+        return False
+
+
+def measure_page(driver) -> Dict:
+    """Bytes transferred and request count for the page currently loaded"""
+    try:
+        metrics = driver.execute_script(PAGE_METRICS_SCRIPT) or {}
+        return {'bytes': int(metrics.get('bytes', 0)), 'requests': int(metrics.get('requests', 0))}
+    except Exception as e:
+        logger.debug(f"Could not read page metrics: {e}")
+        return {'bytes': 0, 'requests': 0}
+
+
+class PageLoadStats:
+    """Page-ready time and bytes transferred for each page a scraper loads"""
+    
+    def __init__(self, blocking: bool = bool(BLOCKED_RESOURCES)):
+        self.blocking = blocking
+        self._lock = threading.Lock()
+        self.reset()
+    
+    @property
+    def mode(self) -> str:
+        return 'blocking' if self.blocking else 'unblocked'
+    
+    def reset(self):
+        with self._lock:
+            self.pages = 0
+            self.total_bytes = 0
+            self.total_ready = 0.0
+            self.max_ready = 0.0
+    
+    def record(self, driver, ready_seconds: float) -> Dict:
+        """Measure the page ``driver`` just loaded; ``ready_seconds`` runs from get() to the first tweet"""
+        metrics = measure_page(driver)
+        metrics['ready_seconds'] = ready_seconds
+        with self._lock:
+            self.pages += 1
+            self.total_bytes += metrics['bytes']
+            self.total_ready += ready_seconds
+            self.max_ready = max(self.max_ready, ready_seconds)
+        logger.debug(f"Page ready in {ready_seconds:.2f}s, {metrics['bytes'] / 1024:.0f}KB over {metrics['requests']} requests ({self.mode})")
+        return metrics
+    
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'pages': self.pages,
+                'avg_kb': round(self.total_bytes / self.pages / 1024, 1) if self.pages else 0.0,
+                'total_mb': round(self.total_bytes / (1024 * 1024), 2),
+                'avg_ready': round(self.total_ready / self.pages, 2) if self.pages else 0.0,
+                'max_ready': round(self.max_ready, 2)
+            }
+    
+    def log_summary(self, label: str = "Page loads"):
+        summary = self.summary()
+        if not summary['pages']:
+            return
+        logger.info(
+            f"📦 {label} ({summary['mode']}): {summary['pages']} pages, avg {summary['avg_kb']}KB "
+            f"and {summary['avg_ready']}s to ready (max {summary['max_ready']}s), {summary['total_mb']}MB total"
+        )
+
+
+def compare(url: str, runs: int = 3) -> Dict[str, Dict]:
+    """Load ``url`` with and without blocking on fresh browsers and return both summaries"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    from scraper_monitor import TwitterScraperMonitor
+    from process_registry import get_registry
+    from profile_manager import get_profile_manager
+    
+    results = {}
+    for categories in ([], BLOCKED_RESOURCES or list(RESOURCE_PATTERNS)):
+        stats = PageLoadStats(blocking=bool(categories))
+        driver = TwitterScraperMonitor.create_driver(blocked_resources=categories)
+        try:
+            for _ in range(runs):
+                # Start every run cold so cached responses do not flatter the second mode
+                driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+                started = time.monotonic()
+                driver.get(url)
+                WebDriverWait(driver, 30).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="tweet"]'))
+                )
+                stats.record(driver, time.monotonic() - started)
+        finally:
+            driver.quit()
+            get_registry().reap(driver)
+            get_profile_manager().release(driver)
+        results[stats.mode] = stats.summary()
+    return results
+
+
+def main():
+    """Compare one page load with and without resource blocking"""
+    configure_logging('resource_blocking')
+    url = sys.argv[1] if len(sys.argv) > 1 else 'https://x.com/x'
+    print(f"📦 Loading {url} with and without resource blocking...")
+    results = compare(url)
+    for mode, summary in results.items():
+        print(f"  {mode:>9}: avg {summary['avg_kb']}KB, {summary['avg_ready']}s to ready (max {summary['max_ready']}s)")
+    unblocked, blocking = results.get('unblocked'), results.get('blocking')
+    if unblocked and blocking and unblocked['avg_kb']:
+        saved = 100 * (1 - blocking['avg_kb'] / unblocked['avg_kb'])
+        print(f"  Blocking saved {saved:.0f}% of bytes transferred")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,111 +1,322 @@
 #!/usr/bin/env python3
 """
 Robust Telegram notification system with connection pooling and retry logic
+
+One long-lived background event loop owns a single pooled Bot and consumes an
+in-process queue, so callers never spin up a thread or event loop per message.
+Sends are paced by a token bucket that every message shares, and bursts of
+tweets can be packed into digests that fill Telegram's message limit.
 """
 
+import atexit
 import logging
 import asyncio
 import threading
 import time
-import httpx
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
 from telegram import Bot
 from telegram.error import TelegramError, NetworkError, RetryAfter
-from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+from telegram.request import HTTPXRequest
+from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_MESSAGES_PER_MINUTE, TELEGRAM_BURST
+from metrics import get_metrics
 
 logger = logging.getLogger(__name__)
 
+TELEGRAM_MESSAGE_LIMIT = 4096
+DIGEST_SEPARATOR = "\n\n➖➖➖➖➖\n\n"
+
+_STOP = object()
+
+# A send gives up once Telegram's RetryAfter waits for it add up to this, so one flood wait can't hold the worker forever
+MAX_RETRY_AFTER_SECONDS = 300
+
+TELEGRAM_SENDS = get_metrics().counter('xscraper_telegram_sends_total', 'Telegram messages and documents by outcome', ['kind', 'result'])
+TELEGRAM_SEND_SECONDS = get_metrics().histogram('xscraper_telegram_send_seconds', 'Telegram enqueue-to-delivered latency', ['kind'])
+TELEGRAM_QUEUE_DEPTH = get_metrics().gauge('xscraper_telegram_queue_depth', 'Telegram sends waiting for the delivery worker')
+
+
+class TokenBucket:
+    """Async token bucket shared by every send
+    
+    ``pause()`` blocks all senders until Telegram's RetryAfter has elapsed,
+    instead of only the request that was rejected.
+    """
+    
+    def __init__(self, rate_per_second: float, capacity: int):
+        self.rate = max(rate_per_second, 0.001)
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                await asyncio.sleep(self._blocked_until - now)
+                continue
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+    
+    def pause(self, seconds) -> float:
+        """Block every sender for ``seconds``; returns the pause in seconds"""
+        # Newer python-telegram-bot releases report RetryAfter as a timedelta
+        if hasattr(seconds, 'total_seconds'):
+            seconds = seconds.total_seconds()
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = 0.0
+        self._blocked_until = max(self._blocked_until, now + seconds)
+        return seconds
+
+
+def pack_messages(payloads: List[str], limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[Tuple[str, List[int]]]:
+    """Pack payloads into as few messages as fit under ``limit`` characters
+    
+    Returns (message, payload indices) pairs so callers can tell which items
+    each message carries. Payloads are never split; one that is already over
+    the limit is sent on its own.
+    """
+    messages = []
+    current, indices, length = [], [], 0
+    for index, payload in enumerate(payloads):
+        added = len(payload) + (len(DIGEST_SEPARATOR) if current else 0)
+        if current and length + added > limit:
+            messages.append((DIGEST_SEPARATOR.join(current), indices))
+            current, indices, length = [], [], 0
+            added = len(payload)
+        if added > limit:
+            logger.warning(f"Notification is {len(payload)} chars, over Telegram's {limit} limit")
+        current.append(payload)
+        indices.append(index)
+        length += added
+    if current:
+        messages.append((DIGEST_SEPARATOR.join(current), indices))
+    return messages
+
+
 class RobustTelegramNotifier:
-    def __init__(self):
-        self.bot = Bot(token=TELEGRAM_BOT_TOKEN)
+    def __init__(self, messages_per_minute=TELEGRAM_MESSAGES_PER_MINUTE, burst=TELEGRAM_BURST, pool_size=8):
+        self.bot = Bot(
+            token=TELEGRAM_BOT_TOKEN,
+            request=HTTPXRequest(connection_pool_size=pool_size)
+        )
         self.chat_id = TELEGRAM_CHAT_ID
-        self._notification_lock = threading.Lock()
-        self._last_notification_time = 0
-        self._connection_pool = None
+        self.rate_limiter = TokenBucket(messages_per_minute / 60.0, burst)
+        self.bot_name = None
+        self._loop = None
+        self._queue = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._start_lock = threading.Lock()
+        self._stopped = False
+        self._atexit_registered = False
+        self.sent_count = 0
+        self.failed_count = 0
+        self.last_latency = 0.0
+        self._total_latency = 0.0
+        TELEGRAM_QUEUE_DEPTH.set_function(lambda: self.queue_depth)
+    
+    def start(self):
+        """Start the delivery worker (idempotent) and validate the bot identity once"""
+        with self._start_lock:
+            # A stopped notifier stays stopped; only a crashed worker is restarted
+            if self._stopped or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, name='telegram-delivery', daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+        if not self._ready.wait(timeout=20):
+            logger.warning("Telegram delivery worker is slow to start")
+    
+    def stop(self, timeout=30):
+        """Drain queued messages and stop the worker; later sends resolve to False"""
+        with self._start_lock:
+            self._stopped = True
+        if self._thread is None or not self._thread.is_alive() or self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, _STOP)
+        self._thread.join(timeout=timeout)
+    
+    @property
+    def queue_depth(self) -> int:
+        """Messages waiting to be delivered"""
+        return self._queue.qsize() if self._queue is not None else 0
+    
+    def stats(self) -> Dict:
+        """Delivery counters and latency (enqueue to delivered) in seconds"""
+        delivered = self.sent_count + self.failed_count
+        return {
+            'queue_depth': self.queue_depth,
+            'sent': self.sent_count,
+            'failed': self.failed_count,
+            'last_latency': round(self.last_latency, 3),
+            'avg_latency': round(self._total_latency / delivered, 3) if delivered else 0.0
+        }
+    
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._serve())
+        except Exception as e:
+            logger.error(f"Telegram delivery worker crashed: {e}")
+        finally:
+            self._loop.close()
+            self._ready.set()
+    
+    async def _serve(self):
+        self._queue = asyncio.Queue()
+        try:
+            # initialize() calls getMe once and caches the bot identity
+            await self.bot.initialize()
+            self.bot_name = self.bot.first_name
+            logger.info(f"Bot connection validated: {self.bot_name}")
+        except Exception as e:
+            logger.error(f"Bot identity check failed, sends will keep retrying: {e}")
+        self._ready.set()
         
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            kind, args, future, enqueued_at = item
+            if future.cancelled():
+                continue
+            
+            try:
+                if kind == 'message':
+                    success = await self.send_notification_with_retry(*args)
+                else:
+                    success = await self.send_document_with_retry(*args)
+            except Exception as e:
+                logger.error(f"Error delivering Telegram {kind}: {e}")
+                success = False
+            
+            self.last_latency = time.monotonic() - enqueued_at
+            self._total_latency += self.last_latency
+            if success:
+                self.sent_count += 1
+            else:
+                self.failed_count += 1
+            TELEGRAM_SEND_SECONDS.observe(self.last_latency, kind=kind)
+            TELEGRAM_SENDS.inc(kind=kind, result='sent' if success else 'failed')
+            future.set_result(success)
+        
+        try:
+            await self.bot.shutdown()
+        except Exception as e:
+            logger.debug(f"Error shutting down bot: {e}")
+    
+    def _submit(self, kind, *args) -> Future:
+        self.start()
+        future = Future()
+        if self._stopped or self._loop is None or self._loop.is_closed():
+            if self._stopped:
+                logger.warning(f"Telegram notifier is stopped, dropping {kind}")
+            future.set_result(False)
+            return future
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (kind, args, future, time.monotonic()))
+        return future
+    
+    def send_notification(self, message) -> Future:
+        """Queue a message; the returned future resolves to True once delivered"""
+        return self._submit('message', message)
+    
+    def send_document_async(self, file_path, caption="") -> Future:
+        """Queue a document; the returned future resolves to True once delivered"""
+        return self._submit('document', file_path, caption)
+    
+    def send_digest(self, payloads: List[str]) -> List[Tuple[Future, List[int]]]:
+        """Queue payloads packed into as few messages as possible
+        
+        Returns (future, payload indices) pairs, one per message sent.
+        """
+        return [(self.send_notification(message), indices) for message, indices in pack_messages(payloads)]
+    
     async def send_notification_with_retry(self, message, max_retries=3):
-        """Send notification with retry logic"""
-        for attempt in range(max_retries):
+        """Send notification with retry logic
+        
+        RetryAfter waits don't use up an attempt; only real failures do, and
+        the send gives up once they total MAX_RETRY_AFTER_SECONDS.
+        """
+        attempt = 0
+        rate_limited = 0.0
+        while attempt < max_retries:
             try:
-                # Test the bot connection first
-                bot_info = await self.bot.get_me()
-                logger.info(f"Bot connection test successful: {bot_info.first_name}")
-                
-                # Send the message
+                await self.rate_limiter.acquire()
                 await self.bot.send_message(
                     chat_id=self.chat_id,
                     text=message,
                     parse_mode='HTML'
                 )
                 return True  # Success
-                
+            
             except RetryAfter as e:
                 wait_time = e.retry_after
-                logger.warning(f"Rate limited, waiting {wait_time} seconds")
-                await asyncio.sleep(wait_time)
+                logger.warning(f"Rate limited, pausing all sends for {wait_time} seconds")
+                rate_limited += self.rate_limiter.pause(wait_time)
+                if rate_limited > MAX_RETRY_AFTER_SECONDS:
+                    logger.error(f"Giving up on notification after {rate_limited:.0f}s of rate limiting")
+                    return False
                 continue
-                
+            
             except NetworkError as e:
                 logger.warning(f"Network error (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                attempt += 1
+                if attempt < max_retries:
+                    await asyncio.sleep(2 ** (attempt - 1))  # Exponential backoff
                     continue
                 else:
                     logger.error(f"Failed to send notification after {max_retries} attempts")
                     return False
-                    
+            
             except Exception as e:
                 logger.error(f"Unexpected error sending notification: {e}")
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(2 ** attempt)
+                attempt += 1
+                if attempt < max_retries:
+                    await asyncio.sleep(2 ** (attempt - 1))
                     continue
                 return False
         
         return False
     
-    def send_notification_sync(self, message):
-        """Synchronous wrapper with robust error handling"""
+    def send_notification_sync(self, message, timeout=20):
+        """Queue a message and wait for delivery"""
         try:
-            # Rate limiting
-            current_time = time.time()
-            with self._notification_lock:
-                if current_time - self._last_notification_time < 2:
-                    time.sleep(2)
-                self._last_notification_time = current_time
-            
-            # Use threading with better error handling
-            def send_in_thread():
-                try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        success = loop.run_until_complete(self.send_notification_with_retry(message))
-                        if success:
-                            logger.info("Notification sent successfully")
-                        else:
-                            logger.error("Failed to send notification")
-                    finally:
-                        loop.close()
-                except Exception as e:
-                    logger.error(f"Error in thread notification: {e}")
-            
-            # Run in separate thread
-            thread = threading.Thread(target=send_in_thread)
-            thread.daemon = True
-            thread.start()
-            thread.join(timeout=20)  # Longer timeout
-            
+            success = self.send_notification(message).result(timeout=timeout)
+            if success:
+                logger.info("Notification sent successfully")
+            else:
+                logger.error("Failed to send notification")
+            return success
         except Exception as e:
             logger.error(f"Error in sync notification: {e}")
+            return False
     
     async def send_document_with_retry(self, file_path, caption="", max_retries=3):
-        """Send document with retry logic"""
-        for attempt in range(max_retries):
+        """Send document with retry logic
+        
+        RetryAfter waits don't use up an attempt; only real failures do, and
+        the send gives up once they total MAX_RETRY_AFTER_SECONDS.
+        """
+        attempt = 0
+        rate_limited = 0.0
+        while attempt < max_retries:
             try:
-                # Test the bot connection first
-                bot_info = await self.bot.get_me()
-                logger.info(f"Bot connection test successful: {bot_info.first_name}")
-                
-                # Send the document
+                await self.rate_limiter.acquire()
                 with open(file_path, 'rb') as file:
                     await self.bot.send_document(
                         chat_id=self.chat_id,
@@ -114,69 +325,49 @@ class RobustTelegramNotifier:
                         parse_mode='HTML'
                     )
                 return True  # Success
-                
+            
             except RetryAfter as e:
                 wait_time = e.retry_after
-                logger.warning(f"Rate limited, waiting {wait_time} seconds")
-                await asyncio.sleep(wait_time)
+                logger.warning(f"Rate limited, pausing all sends for {wait_time} seconds")
+                rate_limited += self.rate_limiter.pause(wait_time)
+                if rate_limited > MAX_RETRY_AFTER_SECONDS:
+                    logger.error(f"Giving up on document after {rate_limited:.0f}s of rate limiting")
+                    return False
                 continue
-                
+            
             except NetworkError as e:
                 logger.warning(f"Network error (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                attempt += 1
+                if attempt < max_retries:
+                    await asyncio.sleep(2 ** (attempt - 1))  # Exponential backoff
                     continue
                 else:
                     logger.error(f"Failed to send document after {max_retries} attempts")
                     return False
-                    
+            
             except Exception as e:
                 logger.error(f"Unexpected error sending document: {e}")
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(2 ** attempt)
+                attempt += 1
+                if attempt < max_retries:
+                    await asyncio.sleep(2 ** (attempt - 1))
                     continue
                 return False
         
         return False
     
-    def send_document(self, file_path, caption=""):
-        """Synchronous wrapper for sending documents with robust error handling"""
+    def send_document(self, file_path, caption="", timeout=30):
+        """Queue a document and wait for delivery"""
         try:
-            # Rate limiting
-            current_time = time.time()
-            with self._notification_lock:
-                if current_time - self._last_notification_time < 2:
-                    time.sleep(2)
-                self._last_notification_time = current_time
-            
-            # Use threading with better error handling
-            def send_in_thread():
-                try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        success = loop.run_until_complete(self.send_document_with_retry(file_path, caption))
-                        if success:
-                            logger.info("Document sent successfully")
-                        else:
-                            logger.error("Failed to send document")
-                    finally:
-                        loop.close()
-                except Exception as e:
-                    logger.error(f"Error in thread document send: {e}")
-            
-            # Run in separate thread
-            thread = threading.Thread(target=send_in_thread)
-            thread.daemon = True
-            thread.start()
-            thread.join(timeout=30)  # Longer timeout for file uploads
-            
-            return True  # Assume success if no exception
-            
+            success = self.send_document_async(file_path, caption).result(timeout=timeout)
+            if success:
+                logger.info("Document sent successfully")
+            else:
+                logger.error("Failed to send document")
+            return success
         except Exception as e:
             logger.error(f"Error in sync document send: {e}")
             return False
-
+    
     def format_tweet_message(self, username, tweet_text, tweet_url, created_at, tweet_type="original"):
         """Format tweet information for Telegram message"""
         type_emoji = '📝'
@@ -193,4 +384,17 @@ class RobustTelegramNotifier:
 
 #TwitterMonitor
         """.strip()
-        return message 
\ No newline at end of file
+        return message
+
+
+_shared_notifier: Optional[RobustTelegramNotifier] = None
+_shared_lock = threading.Lock()
+
+
+def get_notifier() -> RobustTelegramNotifier:
+    """Process-wide notifier so every caller shares one bot, connection pool and queue"""
+    global _shared_notifier
+    with _shared_lock:
+        if _shared_notifier is None:
+            _shared_notifier = RobustTelegramNotifier()
+        return _shared_notifier
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Drift-free job scheduler
+Times runs on the monotonic clock and sleeps once per wait, instead of
+counting down one second at a time after each check has finished.
+JobScheduler runs several jobs, each with its own interval, from one thread.
+"""
+
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from countdown_timer import format_time_remaining
+from metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+CYCLE_SECONDS = get_metrics().histogram('xscraper_cycle_duration_seconds', 'Wall time of one scheduled job run', ['job'])
+CYCLE_FAILURES = get_metrics().counter('xscraper_cycle_failures_total', 'Scheduled job runs that raised', ['job'])
+
+FIXED_RATE = 'fixed_rate'
+FIXED_DELAY = 'fixed_delay'
+
+# What to do when a run overruns one or more scheduled slots
+MISSED_SKIP = 'skip'          # wait for the next slot on the grid
+MISSED_COALESCE = 'coalesce'  # run once right away, then continue on the grid
+MISSED_CATCH_UP = 'catch_up'  # run every missed slot back to back
+
+
+class Scheduler:
+    """Runs a job every ``interval`` seconds
+
+    ``fixed_rate`` starts runs on a fixed grid (start, start + interval, ...)
+    so the period does not grow by the time each run takes; ``fixed_delay``
+    waits ``interval`` seconds after each run finishes. ``jitter`` adds up to
+    that many random seconds to each wait without shifting the grid.
+    ``progress_interval`` > 0 prints the time remaining at that cadence;
+    0 sleeps through the whole wait in one call.
+    """
+
+    def __init__(self, interval: float, mode: str = FIXED_RATE, jitter: float = 0.0,
+                 missed_policy: str = MISSED_COALESCE, progress_interval: float = 0.0,
+                 name: str = "check", stop_event: Optional[threading.Event] = None):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if mode not in (FIXED_RATE, FIXED_DELAY):
+            raise ValueError(f"Unknown schedule mode: {mode}")
+        if missed_policy not in (MISSED_SKIP, MISSED_COALESCE, MISSED_CATCH_UP):
+            raise ValueError(f"Unknown missed-run policy: {missed_policy}")
+        self.interval = interval
+        self.mode = mode
+        self.jitter = max(0.0, jitter)
+        self.missed_policy = missed_policy
+        self.progress_interval = max(0.0, progress_interval)
+        self.name = name
+        self.runs = 0
+        self.missed = 0
+        self.failures = 0
+        self.last_lag = 0.0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+        self.total_duration = 0.0
+        self._next_due = None
+        self._stop = stop_event or threading.Event()
+
+    def stop(self):
+        """Interrupt the current wait and end run()"""
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def seconds_until_due(self) -> float:
+        if self._next_due is None:
+            return 0.0
+        return max(0.0, self._next_due - time.monotonic())
+
+    def metrics(self) -> Dict:
+        """Run counts and timings in seconds"""
+        return {
+            'runs': self.runs,
+            'failures': self.failures,
+            'missed': self.missed,
+            'last_duration': round(self.last_duration, 2),
+            'avg_duration': round(self.total_duration / self.runs, 2) if self.runs else 0.0,
+            'max_duration': round(self.max_duration, 2),
+            'last_lag': round(self.last_lag, 2),
+            'next_run_in': round(self.seconds_until_due(), 1)
+        }
+
+    def run(self, job, run_immediately: bool = True):
+        """Call ``job`` on schedule until stop() is called"""
+        self._stop.clear()
+        self.start(run_immediately)
+
+        while not self._stop.is_set():
+            if not self.wait():
+                break
+            self._run_job(job)
+            self._schedule_next()
+
+    def start(self, run_immediately: bool = True):
+        """Set the first slot"""
+        self._next_due = time.monotonic() if run_immediately else time.monotonic() + self.interval
+
+    def wait(self) -> bool:
+        """Sleep until the next run is due; False if stopped while waiting"""
+        deadline = self._next_due + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return not self._stop.is_set()
+
+        due_at = datetime.now() + timedelta(seconds=remaining)
+        if not self.progress_interval:
+            logger.info(f"Next {self.name} at {due_at.strftime('%H:%M:%S')} (in {format_time_remaining(int(remaining))})")
+            return not self._stop.wait(remaining)
+
+        print(f"\nNext {self.name}: {due_at.strftime('%H:%M:%S')}")
+        while remaining > 0:
+            print(f"\r⏰ Countdown: {format_time_remaining(int(remaining + 0.5))} remaining...   ", end="", flush=True)
+            if self._stop.wait(min(self.progress_interval, remaining)):
+                print()
+                return False
+            remaining = deadline - time.monotonic()
+        print()
+        return True
+
+    def _run_job(self, job):
+        started = time.monotonic()
+        self.last_lag = started - self._next_due
+        try:
+            job()
+        except Exception as e:
+            self.failures += 1
+            CYCLE_FAILURES.inc(job=self.name)
+            logger.error(f"Scheduled job failed: {e}")
+        self.last_duration = time.monotonic() - started
+        CYCLE_SECONDS.observe(self.last_duration, job=self.name)
+        self.max_duration = max(self.max_duration, self.last_duration)
+        self.total_duration += self.last_duration
+        self.runs += 1
+        logger.info(f"Run #{self.runs} took {self.last_duration:.1f}s (started {self.last_lag:.1f}s after its slot)")
+
+    def _schedule_next(self):
+        now = time.monotonic()
+        if self.mode == FIXED_DELAY:
+            self._next_due = now + self.interval
+            return
+
+        next_due = self._next_due + self.interval
+        if next_due >= now:
+            self._next_due = next_due
+            return
+
+        if self.missed_policy == MISSED_CATCH_UP:
+            # Late slots still run, back to back, until the schedule catches up
+            self._next_due = next_due
+            return
+
+        # The run overran at least one slot
+        missed = int((now - next_due) // self.interval) + 1
+        self.missed += missed
+        if self.missed_policy == MISSED_COALESCE:
+            # One run now stands in for every missed slot; the grid continues after it
+            self._next_due = next_due + (missed - 1) * self.interval
+        else:
+            self._next_due = next_due + missed * self.interval
+        logger.warning(f"Run overran {missed} scheduled slot(s); policy '{self.missed_policy}'")
+
+
+class JobScheduler:
+    """Runs several jobs from one thread, each on its own Scheduler timing
+
+    Jobs never overlap: the loop sleeps until the earliest due job, runs it,
+    then reschedules it. A job that overruns delays the others, and each
+    job's missed-run policy decides how it recovers.
+    """
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._jobs: List[Tuple[Scheduler, Callable]] = []
+
+    def add_job(self, name: str, job: Callable, interval: float, **options) -> Scheduler:
+        """Schedule ``job`` every ``interval`` seconds; options are passed to Scheduler"""
+        schedule = Scheduler(interval, name=name, stop_event=self._stop, **options)
+        self._jobs.append((schedule, job))
+        return schedule
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, run_immediately: bool = True):
+        """Run every job on schedule until stop() is called"""
+        if not self._jobs:
+            raise ValueError("No jobs scheduled")
+        self._stop.clear()
+        for schedule, _ in self._jobs:
+            schedule.start(run_immediately)
+
+        while not self._stop.is_set():
+            schedule, job = min(self._jobs, key=lambda item: item[0]._next_due)
+            if not schedule.wait():
+                break
+            schedule._run_job(job)
+            schedule._schedule_next()
+            metrics = schedule.metrics()
+            logger.info(
+                f"Job '{schedule.name}': run #{metrics['runs']} took {metrics['last_duration']}s "
+                f"(avg {metrics['avg_duration']}s, max {metrics['max_duration']}s, failures {metrics['failures']})"
+            )
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Per-job metrics keyed by job name"""
+        return {schedule.name: schedule.metrics() for schedule, _ in self._jobs}
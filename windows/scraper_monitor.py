@@ -9,6 +9,8 @@ import json
 import os
 import time
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Set, Optional
 from selenium import webdriver
@@ -22,170 +24,355 @@ from selenium.common.exceptions import (
     WebDriverException,
     StaleElementReferenceException
 )
-from config import USERS_TO_MONITOR, LOG_FILE, MAX_TWEETS_TO_SCRAPE, CHROME_PROFILE_USER
+from config import (
+    USERS_TO_MONITOR,
+    LOG_FILE,
+    MAX_TWEETS_TO_SCRAPE,
+    EXTRACTION_MODE,
+    BLOCKED_RESOURCES,
+    USER_CHROME_PRESET,
+    SEEN_STORE_BACKEND,
+    SEEN_STORE_DB,
+    SEEN_RETENTION_DAYS,
+    USER_CHECK_CONCURRENCY,
+    PER_HOST_CONCURRENCY,
+    CHROME_PROFILE_USER,
+    USER_POLLING,
+    USER_INCREMENTAL,
+    USER_SEEN_RUN_TO_STOP,
+    USER_MAX_SCROLLS
+)
 import psutil
 import subprocess
-from robust_notifier import RobustTelegramNotifier
+from robust_notifier import get_notifier
+from profile_manager import get_profile_manager
+from chrome_launch import build_chrome_options, launch_chrome
+from resource_blocking import PageLoadStats, apply_content_settings, enable_resource_blocking
+from process_registry import get_registry
+from driver_instrumentation import get_tracer
+from metrics import get_metrics
+from batch_extractor import extract_page_tweets, build_page_tweets
+from snowflake import id_to_datetime
+from selector_strategy import get_selector_registry
+from url_sink import UrlSink
+from seen_store import SeenStore, open_seen_store
+from host_limiter import HostLimiter
+from adaptive_polling import PollingPlanner, POLLING_ADAPTIVE
+from scroll_engine import ScrollEngine
+from network_capture import TimelineCapture, USER_TIMELINE_OPERATIONS, enable_performance_logging, parse_timeline_tweets
 
 logger = logging.getLogger(__name__)
 
+TWEETS_SCRAPED = get_metrics().counter('xscraper_tweets_scraped_total', 'Tweets extracted from a monitored profile', ['user'])
+NEW_TWEETS = get_metrics().counter('xscraper_new_tweets_total', 'Tweets not seen before, queued for notification', ['user'])
+USER_CHECK_SECONDS = get_metrics().histogram('xscraper_user_check_seconds', 'Time to load and extract one monitored profile', ['user'])
+SEEN_TWEETS = get_metrics().gauge('xscraper_seen_tweets', 'Tweet IDs held in the seen-tweet store')
+
+_concurrency_warned = False
+
+def user_check_concurrency() -> int:
+    """Browsers that may check users at once: USER_CHECK_CONCURRENCY, or 1 without profile clones
+    
+    Without clones every pooled browser gets the same --user-data-dir, and a
+    second Chrome cannot start on a profile that is already in use.
+    """
+    global _concurrency_warned
+    if USER_CHECK_CONCURRENCY > 1 and not get_profile_manager().enabled:
+        if not _concurrency_warned:
+            _concurrency_warned = True
+            logger.warning(f"USER_CHECK_CONCURRENCY={USER_CHECK_CONCURRENCY} needs CHROME_PROFILE_CLONES=true "
+                           f"(browsers cannot share one profile); checking users one at a time")
+        return 1
+    return max(1, USER_CHECK_CONCURRENCY)
+
 class TwitterScraperMonitor:
-    def __init__(self):
-        self.seen_tweets_file = 'seen_tweets_scraper.json'
+    # Groups this scraper's WebDriver commands in the per-cycle trace summary
+    TRACE_OWNER = 'user'
+    
+    def __init__(self, driver_pool=None, data_dir=None):
+        # data_dir relocates the seen-tweet store and link files (the fixture benchmark uses a temp dir)
+        self.data_dir = data_dir
+        self.seen_tweets_file = self._data_path('seen_tweets_scraper.json')
         self.seen_tweet_ids = self.load_seen_tweets()
+        self._last_prune = 0
+        self._local = threading.local()
         self.driver = None
         self.project_dir = os.path.dirname(os.path.abspath(__file__))
         
-        # Kill any existing Chrome processes for this project
-        self._kill_existing_chrome()
+        self.driver_pool = driver_pool
+        self.page_stats = PageLoadStats()
+        self.concurrency = min(user_check_concurrency(), driver_pool.size) if driver_pool is not None else 1
+        self.host_limiter = HostLimiter(PER_HOST_CONCURRENCY)
+        # Adaptive mode checks only the users whose posting rate makes them due this tick
+        self.polling = PollingPlanner() if USER_POLLING == POLLING_ADAPTIVE else None
         
-        # Setup driver with unique profile
-        self.setup_driver()
-        self.user_links_file = 'users_tweetlinks.txt'
+        if self.driver_pool is None:
+            # Kill any existing Chrome processes for this project
+            self._kill_existing_chrome()
+            
+            # Setup driver with unique profile
+            self.setup_driver()
+        self.user_links_file = self._data_path('users_tweetlinks.txt')
+        self.url_sink = UrlSink(self.user_links_file)
         
+    @property
+    def driver(self):
+        """The driver for the current thread (a worker's borrowed driver in concurrent mode)"""
+        return getattr(self._local, 'driver', None) or self._driver
+    
+    @driver.setter
+    def driver(self, value):
+        self._driver = value
+    
     def _kill_existing_chrome(self):
-        """Kill only Chrome processes using the user profile directory"""
+        """Reap Chrome left behind by an earlier run of this project that crashed"""
         try:
-            import platform
-            is_windows = platform.system().lower() == 'windows'
-            
-            # Only kill Chrome processes that are using our specific profile
-            chrome_processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    proc_name = proc.info['name']
-                    if proc_name and 'chrome' in proc_name.lower():
-                        cmdline = proc.info.get('cmdline', [])
-                        # Only kill processes using our specific user profile
-                        if any(CHROME_PROFILE_USER in arg for arg in cmdline):
-                            chrome_processes.append(proc)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            if chrome_processes:
-                logger.info(f"Found {len(chrome_processes)} Chrome processes using user profile, killing them...")
-                for proc in chrome_processes:
-                    try:
-                        logger.info(f"Killing Chrome process using user profile: {proc.pid}")
-                        proc.terminate()
-                        proc.wait(timeout=5)
-                    except psutil.TimeoutExpired:
-                        proc.kill()
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        pass
-            else:
-                logger.info("No Chrome processes found using user profile")
+            # Only browsers recorded by a dead owner are touched, never a sibling service's
+            reaped = get_registry().reap_orphans()
+            logger.info(f"✅ Reaped {reaped} orphaned Chrome processes")
                     
         except Exception as e:
             logger.warning(f"Error killing existing Chrome processes: {e}")
     
     def setup_driver(self):
         """Setup Chrome driver with individual user profile directory"""
+        self.driver = self.create_driver()
+    
+    @staticmethod
+    def create_driver(blocked_resources=BLOCKED_RESOURCES, performance_log=EXTRACTION_MODE == 'network'):
+        """Launch a Chrome driver with individual user profile directory"""
         try:
-            # Use individual user profile directory
-            profile_dir = CHROME_PROFILE_USER
-            
-            # Ensure the directory exists
-            os.makedirs(profile_dir, exist_ok=True)
-            
-            chrome_options = webdriver.ChromeOptions()
-            chrome_options.add_argument(f'--user-data-dir={profile_dir}')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-plugins')
-            chrome_options.add_argument('--disable-logging')
-            chrome_options.add_argument('--log-level=3')
-            chrome_options.add_argument('--silent')
-            chrome_options.add_argument('--disable-remote-fonts')
-            chrome_options.add_argument('--disable-web-security')
-            chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-            chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
+            # The user profile itself, or a clone of it when CHROME_PROFILE_CLONES is on
+            profile_dir = get_profile_manager().checkout('user', CHROME_PROFILE_USER)
+            
+            chrome_options = build_chrome_options(profile_dir, USER_CHROME_PRESET)
+            
+            # Network extraction reads timeline responses from the DevTools performance log
+            if performance_log:
+                enable_performance_logging(chrome_options)
+            
+            # Skip the images, video, fonts and analytics a scraper never reads
+            apply_content_settings(chrome_options, blocked_resources)
             
             # Suppress verbose logging
             logging.getLogger('selenium').setLevel(logging.ERROR)
             logging.getLogger('urllib3').setLevel(logging.ERROR)
             logging.getLogger('httpx').setLevel(logging.ERROR)
             
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver = launch_chrome(chrome_options, USER_CHROME_PRESET)
+            # Record the chromedriver/Chrome PID tree so teardown reaps only this browser
+            get_registry().register(driver, owner='user')
+            get_profile_manager().attach(driver, profile_dir)
+            get_tracer().instrument(driver)
+            enable_resource_blocking(driver, blocked_resources)
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
             logger.info("Chrome driver initialized successfully with user profile")
             
+            return driver
+            
         except Exception as e:
             logger.error(f"Failed to setup Chrome driver: {e}")
             raise
     
-    def load_seen_tweets(self) -> Set[str]:
-        """Load previously seen tweet IDs from file"""
-        try:
-            if os.path.exists(self.seen_tweets_file):
-                with open(self.seen_tweets_file, 'r') as f:
-                    data = json.load(f)
-                    return set(data.get('seen_tweets', []))
-            return set()
-        except Exception as e:
-            logger.error(f"Error loading seen tweets: {e}")
-            return set()
+    def _data_path(self, name: str) -> str:
+        return os.path.join(self.data_dir, name) if self.data_dir else name
+    
+    def load_seen_tweets(self) -> SeenStore:
+        """Open the seen-tweet store (imports the legacy JSON file into SQLite once)"""
+        return open_seen_store(SEEN_STORE_BACKEND, self._data_path(SEEN_STORE_DB), self.seen_tweets_file)
     
     def save_seen_tweets(self):
-        """Save seen tweet IDs to file"""
+        """Persist tweet IDs seen during this check in one batch"""
         try:
-            data = {
-                'seen_tweets': list(self.seen_tweet_ids),
-                'last_updated': datetime.now().isoformat()
-            }
-            with open(self.seen_tweets_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            self.seen_tweet_ids.flush()
+            SEEN_TWEETS.set(len(self.seen_tweet_ids))
         except Exception as e:
             logger.error(f"Error saving seen tweets: {e}")
     
+    def _prune_seen_tweets(self):
+        """Apply seen-tweet retention at most once an hour"""
+        if time.time() - self._last_prune < 3600:
+            return
+        try:
+            self.seen_tweet_ids.prune(SEEN_RETENTION_DAYS)
+            self._last_prune = time.time()
+        except Exception as e:
+            logger.error(f"Error pruning seen tweets: {e}")
+    
     def get_user_tweets(self, username: str) -> List[Dict]:
         """Get tweets from a specific user"""
         try:
             # Navigate to user's profile
             profile_url = f"https://twitter.com/{username}"
-            self.driver.get(profile_url)
+            capture = None
+            if EXTRACTION_MODE == 'network':
+                capture = TimelineCapture(self.driver, USER_TIMELINE_OPERATIONS)
+                capture.drain()
+            load_start = time.monotonic()
+            with self.host_limiter.slot(profile_url):
+                self.driver.get(profile_url)
             
             # Wait for page to load
             WebDriverWait(self.driver, 20).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="tweet"]'))
             )
+            self.page_stats.record(self.driver, time.monotonic() - load_start)
             
             # Handle any popups that might appear
             self._handle_popups()
             
+            # Network mode: parse the UserTweets payload the page already fetched (no scrolling needed)
+            if capture is not None:
+                extract_start = time.monotonic()
+                tweets = self._extract_tweets_network(capture, username)
+                if tweets:
+                    elapsed = time.monotonic() - extract_start
+                    logger.info(f"Successfully extracted {len(tweets)} tweets for @{username} in {elapsed:.2f}s (network mode)")
+                    return tweets
+            
+            # Incremental mode: read top-down and stop once we reach tweets already seen
+            if USER_INCREMENTAL:
+                extract_start = time.monotonic()
+                tweets, mode, scrolls = self._extract_tweets_incremental(username)
+                elapsed = time.monotonic() - extract_start
+                logger.info(f"Successfully extracted {len(tweets)} tweets for @{username} in {elapsed:.2f}s "
+                            f"({mode} mode, incremental, {scrolls} scrolls)")
+                return tweets
+            
             # Scroll to load more tweets
             self._scroll_to_load_tweets()
             
-            # Find tweet elements
-            tweet_elements = self.driver.find_elements(By.CSS_SELECTOR, '[data-testid="tweet"]')
+            extract_start = time.monotonic()
             
-            if not tweet_elements:
-                logger.warning(f"No tweet elements found for @{username}")
-                return []
+            # Batch mode: one injected script for the whole page
+            tweets = []
+            mode = 'batch'
+            if EXTRACTION_MODE in ('batch', 'network'):
+                tweets = self._extract_tweets_batch(username)
             
-            logger.info(f"Found {len(tweet_elements)} tweet elements for @{username}")
+            # Per-element fallback
+            if not tweets:
+                mode = 'element'
+                tweets = self._extract_tweets_per_element(username)
             
-            # Extract tweet data
-            tweets = []
-            for tweet_element in tweet_elements[:MAX_TWEETS_TO_SCRAPE]:
+            elapsed = time.monotonic() - extract_start
+            logger.info(f"Successfully extracted {len(tweets)} tweets for @{username} in {elapsed:.2f}s ({mode} mode)")
+            return tweets
+            
+        except Exception as e:
+            logger.error(f"Error getting tweets for @{username}: {e}")
+            return []
+    
+    def _extract_tweets_network(self, capture, username: str, timeout: float = 5) -> List[Dict]:
+        """Parse tweets from captured UserTweets responses, waiting briefly for the body to finish"""
+        try:
+            deadline = time.monotonic() + timeout
+            while True:
+                tweets = []
+                for payload in capture.collect():
+                    tweets.extend(parse_timeline_tweets(payload, username))
+                if tweets or time.monotonic() >= deadline:
+                    break
+                time.sleep(0.25)
+            
+            if not tweets:
+                logger.warning(f"No UserTweets payload captured for @{username}, falling back to DOM extraction")
+            return tweets[:MAX_TWEETS_TO_SCRAPE]
+        except Exception as e:
+            logger.warning(f"Network extraction failed for @{username}, falling back to DOM extraction: {e}")
+            return []
+    
+    def _extract_tweets_batch(self, username: str) -> List[Dict]:
+        """Extract every rendered tweet with a single execute_script call"""
+        try:
+            records = extract_page_tweets(self.driver, MAX_TWEETS_TO_SCRAPE)
+            tweets = build_page_tweets(records, username)
+            logger.debug("Batch extraction returned %d articles for @%s", len(records), username)
+            return tweets
+        except Exception as e:
+            logger.warning(f"Batch extraction failed for @{username}, falling back to per-element: {e}")
+            return []
+    
+    def _extract_tweets_incremental(self, username: str):
+        """Extract tweets top-down until a run of already-seen ones; returns (tweets, mode, scrolls)
+        
+        A tweet counts as known when its id is in the seen store or it is too old
+        to be notified. Pinned tweets are kept but never extend or break the run,
+        so an old pinned tweet cannot end the check early. The timeline is only
+        scrolled while no run has been reached, at most USER_MAX_SCROLLS times.
+        """
+        scroll_engine = ScrollEngine(self.driver)
+        scroll_engine.start()
+        scroll_engine.settle()
+        
+        mode = 'batch' if EXTRACTION_MODE in ('batch', 'network') else 'element'
+        tweets = []
+        tweet_ids = set()
+        known_run = 0
+        scrolls = 0
+        while True:
+            visible = []
+            if mode == 'batch':
                 try:
-                    tweet_data = self.extract_tweet_data(tweet_element, username)
-                    if tweet_data:
-                        tweets.append(tweet_data)
+                    # Only articles rendered since the previous pass are walked
+                    records = extract_page_tweets(self.driver, 0, incremental=True)
+                    visible = build_page_tweets(records, username)
                 except Exception as e:
-                    logger.error(f"Error extracting tweet data: {e}")
+                    logger.warning(f"Batch extraction failed for @{username}, falling back to per-element: {e}")
+                if not visible and not tweets:
+                    mode = 'element'
+            if mode == 'element':
+                visible = self._extract_tweets_per_element(username)
+            
+            for tweet in visible:
+                tweet_id = tweet['id']
+                if tweet_id in tweet_ids:
+                    continue
+                tweet_ids.add(tweet_id)
+                tweets.append(tweet)
+                if tweet.get('pinned'):
                     continue
+                if tweet_id in self.seen_tweet_ids or not self._is_tweet_recent(tweet):
+                    known_run += 1
+                    if known_run >= USER_SEEN_RUN_TO_STOP:
+                        logger.debug("Reached %d known tweets in a row for @%s", known_run, username)
+                        return tweets[:MAX_TWEETS_TO_SCRAPE], mode, scrolls
+                else:
+                    known_run = 0
             
-            logger.info(f"Successfully extracted {len(tweets)} tweets for @{username}")
-            return tweets
+            if scrolls >= USER_MAX_SCROLLS or len(tweets) >= MAX_TWEETS_TO_SCRAPE:
+                break
             
-        except Exception as e:
-            logger.error(f"Error getting tweets for @{username}: {e}")
+            # Everything read so far is new; older new tweets may be further down
+            result = scroll_engine.scroll_and_wait()
+            scrolls += 1
+            if not result.grew:
+                break
+        
+        return tweets[:MAX_TWEETS_TO_SCRAPE], mode, scrolls
+    
+    def _extract_tweets_per_element(self, username: str) -> List[Dict]:
+        """Extract tweets element by element (one round trip per lookup)"""
+        tweet_elements = self.driver.find_elements(By.CSS_SELECTOR, '[data-testid="tweet"]')
+        
+        if not tweet_elements:
+            logger.warning(f"No tweet elements found for @{username}")
             return []
+        
+        logger.info(f"Found {len(tweet_elements)} tweet elements for @{username}")
+        
+        tweets = []
+        for tweet_element in tweet_elements[:MAX_TWEETS_TO_SCRAPE]:
+            try:
+                tweet_data = self.extract_tweet_data(tweet_element, username)
+                if tweet_data:
+                    tweets.append(tweet_data)
+            except Exception as e:
+                logger.error("Error extracting tweet data: %s", e)
+                continue
+        
+        return tweets
     
     def _handle_popups(self):
         """Handle various popups and dialogs"""
@@ -205,7 +392,7 @@ class TwitterScraperMonitor:
                     time.sleep(1)
                     break
             except Exception as e:
-                logger.debug(f"Could not close popup with selector {selector}: {e}")
+                logger.debug("Could not close popup with selector %s: %s", selector, e)
     
     def _wait_for_tweets_alternative(self) -> bool:
         """Try alternative selectors if main selector fails"""
@@ -223,7 +410,7 @@ class TwitterScraperMonitor:
                 if elements:
                     return True
             except Exception as e:
-                logger.debug(f"Alternative selector {selector} failed: {e}")
+                logger.debug("Alternative selector %s failed: %s", selector, e)
         
         return False
     
@@ -251,15 +438,12 @@ class TwitterScraperMonitor:
             'div[data-testid="tweet"]'
         ]
         
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    return elements
-            except Exception as e:
-                logger.debug(f"Selector {selector} failed: {e}")
-        
-        return []
+        _, elements = get_selector_registry().find(
+            'user.tweet_elements', selectors,
+            lambda selector: self.driver.find_elements(By.CSS_SELECTOR, selector),
+            ranked=True
+        )
+        return elements or []
     
     def _process_tweets(self, tweets: List[Dict], username: str) -> List[Dict]:
         """Process tweets and filter for new ones"""
@@ -274,17 +458,14 @@ class TwitterScraperMonitor:
                     if tweet_id not in self.seen_tweet_ids:
                         # Check if tweet is within the last hour
                         if self._is_tweet_recent(tweet):
+                            tweet['detected_at'] = time.time()
                             new_tweets.append(tweet)
-                            self.seen_tweet_ids.add(tweet_id)
-                            logger.info(f"New tweet found: {tweet_id} for @{username}")
+                            self.seen_tweet_ids.add(tweet_id, username)
+                            logger.debug("New tweet found: %s for @%s", tweet_id, username)
                         else:
-                            logger.debug(f"Tweet {tweet_id} is too old for @{username}")
+                            logger.debug("Tweet %s is too old for @%s", tweet_id, username)
                     else:
-                        logger.debug(f"Tweet {tweet_id} already seen for @{username}")
-            
-            # Save updated seen tweets
-            if new_tweets:
-                self.save_seen_tweets()
+                        logger.debug("Tweet %s already seen for @%s", tweet_id, username)
             
             return new_tweets
             
@@ -293,19 +474,22 @@ class TwitterScraperMonitor:
             return []
     
     def _is_tweet_recent(self, tweet: Dict) -> bool:
-        """Check if tweet is within the last hour"""
+        """Check if tweet is within the last hour (or since the user's last check when polled less often)"""
         try:
             if 'created_at' not in tweet:
                 return True  # Assume recent if we can't determine time
             
             tweet_time = tweet['created_at']
+            if tweet_time is None:
+                return False  # Neither the id nor the page gave a time; never notify an undated tweet
             current_time = datetime.now(timezone.utc)
             
             # Calculate time difference
             time_diff = current_time - tweet_time
             
-            # Check if tweet is within the last hour
-            return time_diff.total_seconds() <= 3600  # 1 hour = 3600 seconds
+            # Check if tweet is within the last hour, widened to cover the gap since an adaptive user's last check
+            window = self.polling.recency_window(tweet.get('username', '')) if self.polling is not None else 3600
+            return time_diff.total_seconds() <= window
             
         except Exception as e:
             logger.error(f"Error checking tweet recency: {e}")
@@ -319,14 +503,14 @@ class TwitterScraperMonitor:
                 return self.extract_tweet_data(tweet_element, username)
             except StaleElementReferenceException:
                 if attempt < max_retries - 1:
-                    logger.debug(f"Tweet element stale, retrying... (attempt {attempt + 1})")
+                    logger.debug("Tweet element stale, retrying... (attempt %d)", attempt + 1)
                     time.sleep(0.5)
                     continue
                 else:
                     logger.warning("Tweet element became stale after retries")
                     return None
             except Exception as e:
-                logger.error(f"Error extracting tweet data (attempt {attempt + 1}): {e}")
+                logger.error("Error extracting tweet data (attempt %d): %s", attempt + 1, e)
                 if attempt < max_retries - 1:
                     time.sleep(0.5)
                     continue
@@ -342,14 +526,14 @@ class TwitterScraperMonitor:
                 return self.is_original_tweet(tweet_element)
             except StaleElementReferenceException:
                 if attempt < max_retries - 1:
-                    logger.debug(f"Tweet element stale during type check, retrying... (attempt {attempt + 1})")
+                    logger.debug("Tweet element stale during type check, retrying... (attempt %d)", attempt + 1)
                     time.sleep(0.5)
                     continue
                 else:
                     logger.warning("Tweet element became stale during type check")
                     return True  # Assume original if we can't determine
             except Exception as e:
-                logger.error(f"Error checking tweet type (attempt {attempt + 1}): {e}")
+                logger.error("Error checking tweet type (attempt %d): %s", attempt + 1, e)
                 if attempt < max_retries - 1:
                     time.sleep(0.5)
                     continue
@@ -372,19 +556,15 @@ class TwitterScraperMonitor:
                 'article span[dir="ltr"]'
             ]
             
-            tweet_text = ""
-            for selector in text_selectors:
-                try:
-                    text_elements = tweet_element.find_elements(By.CSS_SELECTOR, selector)
-                    for element in text_elements:
-                        text = element.text.strip()
-                        if text and len(text) > 10:  # Minimum meaningful text length
-                            tweet_text = text
-                            break
-                    if tweet_text:
-                        break
-                except Exception:
-                    continue
+            def first_text(selector):
+                for element in tweet_element.find_elements(By.CSS_SELECTOR, selector):
+                    text = element.text.strip()
+                    if text and len(text) > 10:  # Minimum meaningful text length
+                        return text
+                return None
+            
+            _, tweet_text = get_selector_registry().find('user.tweet_text', text_selectors, first_text)
+            tweet_text = tweet_text or ""
             
             # If still no text, try a broader approach for media tweets
             if not tweet_text:
@@ -417,13 +597,13 @@ class TwitterScraperMonitor:
             # If we still don't have text, create a placeholder
             if not tweet_text:
                 tweet_text = "[Media tweet - text not available]"
-                logger.warning(f"Could not extract tweet text for @{username}")
+                logger.debug("Could not extract tweet text for @%s", username)
             
             # Extract tweet ID from URL or data attribute
             tweet_id = self.extract_tweet_id(tweet_element)
             
-            # Extract timestamp
-            timestamp = self.extract_timestamp(tweet_element)
+            # Creation time is encoded in the id; the DOM is only read for pre-Snowflake ids
+            timestamp = id_to_datetime(tweet_id) or self.extract_timestamp(tweet_element)
             
             # Determine tweet type
             tweet_type = self.determine_tweet_type(tweet_element)
@@ -437,7 +617,7 @@ class TwitterScraperMonitor:
             }
             
         except Exception as e:
-            logger.error(f"Error extracting tweet data: {e}")
+            logger.error("Error extracting tweet data: %s", e)
             return None
     
     def is_original_tweet(self, tweet_element) -> bool:
@@ -456,7 +636,7 @@ class TwitterScraperMonitor:
             return True
             
         except Exception as e:
-            logger.debug(f"Error checking tweet type: {e}")
+            logger.debug("Error checking tweet type: %s", e)
             return True  # Assume original if we can't determine
     
     def check_new_tweets(self):
@@ -464,32 +644,57 @@ class TwitterScraperMonitor:
         try:
             all_tweet_urls = []
             new_tweets = []
-            
-            for username in USERS_TO_MONITOR:
+            cycle_start = time.monotonic()
+            checked_at = time.time()
+            
+            usernames = USERS_TO_MONITOR
+            if self.polling is not None:
+                self.polling.refresh(self.seen_tweet_ids, USERS_TO_MONITOR)
+                usernames = self.polling.due_users(USERS_TO_MONITOR, checked_at)
+                logger.info(f"{len(usernames)} of {len(USERS_TO_MONITOR)} users due this tick")
+                if not usernames:
+                    return []
+            
+            if self.concurrency > 1 and self.driver_pool is not None:
+                user_results = self._fetch_users_concurrently(usernames)
+            else:
+                user_results = self._fetch_users_sequentially(usernames)
+            
+            # Merge in USERS_TO_MONITOR order so results are deterministic however fetches finished
+            latencies = {}
+            for username, user_tweets, latency in user_results:
+                latencies[username] = latency
+                USER_CHECK_SECONDS.observe(latency, user=username)
+                TWEETS_SCRAPED.inc(len(user_tweets or []), user=username)
                 try:
-                    logger.info(f"Checking tweets for @{username}...")
-                    user_tweets = self.get_user_tweets(username)
-                    
                     if user_tweets:
                         processed_tweets = self._process_tweets(user_tweets, username)
                         new_tweets.extend(processed_tweets)
+                        NEW_TWEETS.inc(len(processed_tweets), user=username)
                         
-                        # Collect tweet URLs
-                        for tweet in user_tweets:
-                            if 'id' in tweet:
-                                tweet_url = self.format_tweet_url(username, tweet['id'])
-                                all_tweet_urls.append(tweet_url)
-                    
-                    # Small delay between users
-                    time.sleep(2)
-                    
+                        # Collect tweet URLs, streaming each user's to the run file as it is merged
+                        user_urls = [self.format_tweet_url(username, tweet['id']) for tweet in user_tweets if 'id' in tweet]
+                        all_tweet_urls.extend(user_urls)
+                        self.url_sink.add(user_urls)
                 except Exception as e:
-                    logger.error(f"Error checking tweets for @{username}: {e}")
-                    continue
+                    logger.error(f"Error processing tweets for @{username}: {e}")
+                if self.polling is not None:
+                    self.polling.record_check(username, checked_at)
             
-            # Save all collected tweet URLs
-            if all_tweet_urls:
-                self.save_user_tweet_urls(all_tweet_urls)
+            self._log_cycle_latency(latencies, time.monotonic() - cycle_start)
+            if self.polling is not None:
+                self.polling.log_summary()
+            self.page_stats.log_summary("Profile page loads")
+            self.page_stats.reset()
+            get_tracer().log_summary(self.TRACE_OWNER, "User check WebDriver commands")
+            
+            # Persist newly seen tweets in one batch and drop entries past retention
+            self.save_seen_tweets()
+            self._prune_seen_tweets()
+            get_selector_registry().save()
+            
+            # Publish the collected tweet URLs
+            self.save_user_tweet_urls(all_tweet_urls)
             
             return new_tweets
             
@@ -497,12 +702,95 @@ class TwitterScraperMonitor:
             logger.error(f"Error in check_new_tweets: {e}")
             return []
     
+    def _fetch_users_sequentially(self, usernames) -> List:
+        """Fetch each user's tweets one after another on the current driver"""
+        results = []
+        for index, username in enumerate(usernames):
+            user_start = time.monotonic()
+            try:
+                logger.info(f"Checking tweets for @{username}...")
+                user_tweets = self.get_user_tweets(username)
+            except Exception as e:
+                logger.error(f"Error checking tweets for @{username}: {e}")
+                user_tweets = []
+            results.append((username, user_tweets, time.monotonic() - user_start))
+            
+            # Small delay between users
+            if index < len(usernames) - 1:
+                time.sleep(2)
+        return results
+    
+    def _fetch_users_concurrently(self, usernames) -> List:
+        """Spread users across pooled drivers; page loads are capped per host"""
+        logger.info(f"Checking {len(usernames)} users across {self.concurrency} browsers...")
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='user-check') as executor:
+            futures = {executor.submit(self._fetch_user_with_pooled_driver, username): username
+                       for username in usernames}
+            for future in as_completed(futures):
+                username = futures[future]
+                results[username] = future.result()
+        return [(username,) + results[username] for username in usernames]
+    
+    def _fetch_user_with_pooled_driver(self, username: str):
+        """Worker: borrow a driver for this thread, fetch one user, hand the driver back"""
+        user_start = time.monotonic()
+        driver = None
+        failed = False
+        try:
+            driver = self.driver_pool.acquire()
+            self._local.driver = driver
+            logger.info(f"Checking tweets for @{username}...")
+            user_tweets = self.get_user_tweets(username)
+        except Exception as e:
+            logger.error(f"Error checking tweets for @{username}: {e}")
+            user_tweets = []
+            failed = True
+        finally:
+            self._local.driver = None
+            if driver is not None:
+                if failed:
+                    self.driver_pool.invalidate(driver)
+                else:
+                    self.driver_pool.release(driver)
+        return user_tweets, time.monotonic() - user_start
+    
+    def _log_cycle_latency(self, latencies: Dict[str, float], total: float):
+        """Log per-user and overall latency for the cycle"""
+        if not latencies:
+            return
+        slowest = sorted(latencies.items(), key=lambda item: item[1], reverse=True)
+        per_user = ', '.join(f"@{username} {seconds:.1f}s" for username, seconds in slowest)
+        logger.info(f"⏱️ Cycle checked {len(latencies)} users in {total:.1f}s "
+                    f"(avg {sum(latencies.values()) / len(latencies):.1f}s/user, concurrency {self.concurrency})")
+        logger.info(f"Per-user latency: {per_user}")
+    
+    def acquire_driver(self):
+        """Take a warm driver from the pool for the next check"""
+        if self.concurrency > 1:
+            return  # Worker threads borrow their own drivers from the pool
+        if self.driver_pool is not None and self.driver is None:
+            self.driver = self.driver_pool.acquire()
+    
+    def release_driver(self, failed=False):
+        """Hand the driver back to the pool, discarding it if the check failed"""
+        if self.driver_pool is None or self.driver is None:
+            return
+        try:
+            if failed:
+                self.driver_pool.invalidate(self.driver)
+            else:
+                self.driver_pool.release(self.driver)
+        finally:
+            self.driver = None
+    
     def quit_chrome_after_task(self):
         """Quit Chrome after completing a task"""
         try:
             if self.driver:
                 logger.info("Quitting Chrome after task completion...")
                 self.driver.quit()
+                get_registry().reap(self.driver)
                 self.driver = None
                 logger.info("Chrome quit successfully")
         except Exception as e:
@@ -520,23 +808,20 @@ class TwitterScraperMonitor:
             raise
     
     def save_user_tweet_urls(self, all_tweet_urls):
-        """Save user tweet URLs to file and send to Telegram"""
+        """Publish the streamed run as users_tweetlinks.txt and send it to Telegram"""
         try:
-            if not all_tweet_urls:
+            # Already streamed per user; this only catches URLs collected some other way
+            self.url_sink.add(all_tweet_urls)
+            url_count = self.url_sink.publish()
+            if not url_count:
                 logger.info("No user tweet URLs to save")
                 return
             
-            project_dir = os.path.dirname(os.path.abspath(__file__))
-            output_file = os.path.join(project_dir, 'users_tweetlinks.txt')
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
-                for url in all_tweet_urls:
-                    f.write(f"{url}\n")
-            
-            logger.info(f"Saved {len(all_tweet_urls)} user tweet URLs to {output_file}")
+            output_file = self.url_sink.path
+            logger.info(f"Saved {url_count} user tweet URLs to {output_file}")
             
             # Send file to Telegram
-            self.send_user_links_to_telegram(output_file, len(all_tweet_urls))
+            self.send_user_links_to_telegram(output_file, url_count)
             
         except Exception as e:
             logger.error(f"Error saving user tweet URLs: {e}")
@@ -548,15 +833,12 @@ class TwitterScraperMonitor:
                 logger.warning(f"File {file_path} does not exist, skipping Telegram send")
                 return
             
-            # Check if file has content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if not content:
-                    logger.warning("File is empty, skipping Telegram send")
-                    return
+            if not url_count:
+                logger.warning("No URLs in file, skipping Telegram send")
+                return
             
             # Initialize Telegram notifier
-            notifier = RobustTelegramNotifier()
+            notifier = get_notifier()
             
             # Send file with caption
             caption = f"👥 User Tweet Monitoring Results\n\n📊 Found {url_count} tweet URLs\n📅 {time.strftime('%Y-%m-%d %H:%M:%S')}"
@@ -584,9 +866,16 @@ class TwitterScraperMonitor:
     def cleanup(self):
         """Cleanup resources"""
         try:
-            if self.driver:
+            self.save_seen_tweets()
+            get_selector_registry().save(force=True)
+            self.url_sink.close()
+            
+            if self.driver and self.driver_pool is not None:
+                self.release_driver(failed=True)
+            elif self.driver:
                 logger.info("Closing Chrome driver...")
                 self.driver.quit()
+                get_registry().reap(self.driver)
                 self.driver = None
                 
             # Clean up old profile directories (keep only the latest 3)
@@ -597,42 +886,22 @@ class TwitterScraperMonitor:
             self._force_kill_chrome()
     
     def _cleanup_old_profiles(self):
-        """Clean up old Chrome profile directories - now just ensures main profile is clean"""
+        """Remove the profile clones this process made for user browsers"""
         try:
-            # Only clean up if there are any unique profile directories from previous runs
-            import glob
-            profile_pattern = os.path.join(self.project_dir, 'chrome_profile_*')
-            profile_dirs = glob.glob(profile_pattern)
-            
-            # Remove any leftover unique profile directories
-            for old_profile in profile_dirs:
-                try:
-                    import shutil
-                    shutil.rmtree(old_profile)
-                    logger.info(f"Cleaned up old unique profile: {old_profile}")
-                except Exception as e:
-                    logger.warning(f"Could not clean up profile {old_profile}: {e}")
+            # The logged-in user profile itself is never touched
+            get_profile_manager().remove_all('user')
                     
         except Exception as e:
             logger.warning(f"Error cleaning up old profiles: {e}")
     
     def _force_kill_chrome(self):
-        """Force kill Chrome processes if normal cleanup fails"""
+        """Reap this scraper's Chrome process tree if normal cleanup fails"""
         try:
-            logger.info("Force killing Chrome processes...")
-            
-            # Kill Chrome processes on Windows
-            if os.name == 'nt':
-                subprocess.run(['taskkill', '/f', '/im', 'chrome.exe'], 
-                             capture_output=True, timeout=10)
-                subprocess.run(['taskkill', '/f', '/im', 'chromedriver.exe'], 
-                             capture_output=True, timeout=10)
-            else:
-                # Kill Chrome processes on Unix-like systems
-                subprocess.run(['pkill', '-f', 'chrome'], 
-                             capture_output=True, timeout=10)
-                subprocess.run(['pkill', '-f', 'chromedriver'], 
-                             capture_output=True, timeout=10)
+            if self.driver:
+                logger.info("Force killing Chrome processes...")
+                reaped = get_registry().reap(self.driver)
+                self.driver = None
+                logger.info(f"Reaped {reaped} Chrome processes")
                 
         except Exception as e:
             logger.error(f"Error force killing Chrome: {e}") 
@@ -647,30 +916,30 @@ class TwitterScraperMonitor:
                 'a'
             ]
             
-            for selector in link_selectors:
-                try:
-                    link_elements = tweet_element.find_elements(By.CSS_SELECTOR, selector)
-                    for link in link_elements:
-                        href = link.get_attribute('href')
-                        if href and '/status/' in href:
-                            tweet_id = href.split('/status/')[-1].split('?')[0]
-                            if tweet_id and tweet_id.isdigit():
-                                return tweet_id
-                except Exception:
-                    continue
+            def status_id(selector):
+                for link in tweet_element.find_elements(By.CSS_SELECTOR, selector):
+                    href = link.get_attribute('href')
+                    if href and '/status/' in href:
+                        tweet_id = href.split('/status/')[-1].split('?')[0]
+                        if tweet_id and tweet_id.isdigit():
+                            return tweet_id
+                return None
+            
+            _, tweet_id = get_selector_registry().find('user.tweet_id', link_selectors, status_id)
+            if tweet_id:
+                return tweet_id
             
             # Fallback: generate a timestamp-based ID
             return str(int(time.time()))
             
         except Exception as e:
-            logger.error(f"Error extracting tweet ID: {e}")
+            logger.error("Error extracting tweet ID: %s", e)
             return str(int(time.time()))
     
-    def extract_timestamp(self, tweet_element) -> datetime:
-        """Extract timestamp from tweet element"""
+    def extract_timestamp(self, tweet_element) -> Optional[datetime]:
+        """Extract timestamp from tweet element (None when the page shows none)"""
         try:
-            # Default to current time
-            created_at = datetime.now(timezone.utc)
+            created_at = None
             
             time_selectors = [
                 'time',
@@ -711,8 +980,8 @@ class TwitterScraperMonitor:
             return created_at
             
         except Exception as e:
-            logger.error(f"Error extracting timestamp: {e}")
-            return datetime.now(timezone.utc)
+            logger.error("Error extracting timestamp: %s", e)
+            return None
     
     def determine_tweet_type(self, tweet_element) -> str:
         """Determine if tweet is original, retweet, or quote"""
@@ -724,17 +993,16 @@ class TwitterScraperMonitor:
                 'div[data-testid="socialContext"]'
             ]
             
-            for selector in retweet_selectors:
-                try:
-                    elements = tweet_element.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        text = elements[0].text.lower()
-                        if 'retweeted' in text:
-                            return 'retweet'
-                        elif 'quoted' in text:
-                            return 'quote'
-                except Exception:
-                    continue
+            def context_text(selector):
+                elements = tweet_element.find_elements(By.CSS_SELECTOR, selector)
+                return elements[0].text.lower() if elements else None
+            
+            registry = get_selector_registry()
+            _, text = registry.find('user.social_context', retweet_selectors, context_text, accept=lambda text: True, ranked=True)
+            if text and 'retweeted' in text:
+                return 'retweet'
+            elif text and 'quoted' in text:
+                return 'quote'
             
             # Check for quote tweet indicators
             quote_selectors = [
@@ -742,16 +1010,16 @@ class TwitterScraperMonitor:
                 'div[data-testid="quote"]'
             ]
             
-            for selector in quote_selectors:
-                try:
-                    elements = tweet_element.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        return 'quote'
-                except Exception:
-                    continue
+            _, elements = registry.find(
+                'user.quote', quote_selectors,
+                lambda selector: tweet_element.find_elements(By.CSS_SELECTOR, selector),
+                ranked=True
+            )
+            if elements:
+                return 'quote'
             
             return 'original'
             
         except Exception as e:
-            logger.error(f"Error determining tweet type: {e}")
+            logger.error("Error determining tweet type: %s", e)
             return 'original' 
\ No newline at end of file
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Snowflake tweet ids
+Tweet ids carry their creation time (milliseconds since the Twitter epoch in the
+bits above the low 22), so a tweet's timestamp can be read from its id without
+touching the DOM. Rendered or API timestamps are only compared against it
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Sequence
+
+from metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# 2010-11-04T01:42:54.657Z, the zero point of every Snowflake timestamp
+TWITTER_EPOCH_MS = 1288834974657
+TIMESTAMP_SHIFT = 22
+
+# Ids below this were issued sequentially before Snowflake and encode no time
+FIRST_SNOWFLAKE_ID = 29700859247
+
+# Rendered <time> values and API created_at strings only have second precision
+MAX_TIMESTAMP_DRIFT_SECONDS = 60
+
+TIMESTAMP_MISMATCHES = get_metrics().counter('xscraper_timestamp_mismatches_total', 'Reported tweet timestamps that disagree with the tweet id', ['source'])
+
+
+def parse_id(tweet_id) -> Optional[int]:
+    """The id as an int when it is a Snowflake id, else None"""
+    try:
+        value = int(tweet_id)
+    except (TypeError, ValueError):
+        return None
+    return value if value >= FIRST_SNOWFLAKE_ID else None
+
+
+def id_to_millis(tweet_id) -> Optional[int]:
+    """Unix time in milliseconds the tweet was created"""
+    value = parse_id(tweet_id)
+    if value is None:
+        return None
+    return (value >> TIMESTAMP_SHIFT) + TWITTER_EPOCH_MS
+
+
+def id_to_datetime(tweet_id) -> Optional[datetime]:
+    """UTC creation time of the tweet, or None for ids that are not Snowflake ids"""
+    millis = id_to_millis(tweet_id)
+    if millis is None:
+        return None
+    return datetime.fromtimestamp(millis / 1000, timezone.utc)
+
+
+def datetime_to_id(moment: datetime) -> int:
+    """Smallest id a tweet created at ``moment`` can have; usable as a since_id bound"""
+    millis = int(moment.timestamp() * 1000)
+    return max(millis - TWITTER_EPOCH_MS, 0) << TIMESTAMP_SHIFT
+
+
+def ids_to_datetimes(tweet_ids: Iterable) -> List[Optional[datetime]]:
+    """Decode a whole page of ids in one pass; None where an id is not a Snowflake id"""
+    epoch, shift, first = TWITTER_EPOCH_MS, TIMESTAMP_SHIFT, FIRST_SNOWFLAKE_ID
+    from_millis = datetime.fromtimestamp
+    utc = timezone.utc
+    decoded = []
+    for tweet_id in tweet_ids:
+        try:
+            value = int(tweet_id)
+        except (TypeError, ValueError):
+            decoded.append(None)
+            continue
+        decoded.append(from_millis(((value >> shift) + epoch) / 1000, utc) if value >= first else None)
+    return decoded
+
+
+def resolve_created_at(tweet_id, reported: Optional[datetime] = None, source: str = 'dom') -> Optional[datetime]:
+    """Creation time from the id; ``reported`` is only checked against it
+    
+    Falls back to ``reported`` for pre-Snowflake ids. A reported time further
+    than MAX_TIMESTAMP_DRIFT_SECONDS from the id is counted as a mismatch,
+    which usually means the extractor paired an id with another tweet's time.
+    """
+    return resolve_many([tweet_id], [reported], source)[0]
+
+
+def resolve_many(tweet_ids: Sequence, reported: Sequence[Optional[datetime]], source: str = 'dom') -> List[Optional[datetime]]:
+    """resolve_created_at for a page of tweets at once"""
+    resolved = []
+    mismatches = 0
+    for tweet_id, decoded, shown in zip(tweet_ids, ids_to_datetimes(tweet_ids), reported):
+        if decoded is None:
+            resolved.append(shown)
+            continue
+        if shown is not None and abs((shown - decoded).total_seconds()) > MAX_TIMESTAMP_DRIFT_SECONDS:
+            mismatches += 1
+            logger.debug("Tweet %s: %s time %s differs from id time %s", tweet_id, source, shown.isoformat(), decoded.isoformat())
+        resolved.append(decoded)
+    if mismatches:
+        TIMESTAMP_MISMATCHES.inc(mismatches, source=source)
+    return resolved